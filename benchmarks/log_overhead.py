@@ -0,0 +1,126 @@
+#!/usr/bin/env python3.11
+
+import time
+import click
+import atexit
+import logging
+import logging.handlers
+import tempfile
+import statistics
+import threading
+
+from pathlib import Path
+
+from components.loggers import logger_configurer
+
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+
+def _configure(mode: str, level: str, log_path: Path) -> logging.handlers.QueueListener | None:
+    """Configures root logger as SFR does (`queue`) or with the same handlers attached straight to the root logger (`direct`).
+    """
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    listener = logger_configurer('CRITICAL', level, True, log_path=log_path)
+
+    if mode == 'direct':
+        listener.stop()
+        atexit.unregister(listener.stop)
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in listener.handlers:
+            root.addHandler(handler)
+        return None
+
+    return listener
+
+
+def _emit(logger: logging.Logger, reports: int, latencies: list[int]) -> None:
+    """Logs the same lines as the request and processing of a report, latency of every call is recorded in nanoseconds.
+    """
+
+    lines = ((logging.INFO, '%s -> Sending request, timeout: %s s', ('Report', 900)),
+             (logging.DEBUG, 'Sending asynchronous report request with params: %s', ('https://sfdc/00O?export=csv',)),
+             (logging.INFO, '%s -> Request successful, retrieving content', ('Report',)),
+             (logging.DEBUG, 'Sending the content to the queue for processing, items in the queue: %s', (3,)),
+             (logging.DEBUG, 'Saving %s to %s', ('Report', '/reports/report.csv')),
+             (logging.INFO, '%s saved to %s', ('Report', '/reports/report.csv')))
+
+    for _ in range(reports):
+        for level, msg, args in lines:
+            t0 = time.perf_counter_ns()
+            logger.log(level, msg, *args)
+            latencies.append(time.perf_counter_ns() - t0)
+
+
+def _run(mode: str, level: str, threads: int, reports: int) -> dict[str, float]:
+    """Logs from `threads` threads at once, returns latency of calls and wall time until all records are written.
+    """
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp, 'sfr.log')
+        listener = _configure(mode, level, log_path)
+        logger = logging.getLogger('benchmark')
+        latencies = [[] for _ in range(threads)]
+
+        workers = [threading.Thread(target=_emit, args=(logger, reports, latencies[num]))
+                   for num in range(threads)]
+
+        t0 = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        caller_time = time.perf_counter() - t0
+
+        if listener:
+            listener.stop()
+            atexit.unregister(listener.stop)
+        total_time = time.perf_counter() - t0
+
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        for handler in listener.handlers if listener else ():
+            handler.close()
+
+        written = sum(path.stat().st_size for path in Path(tmp).glob('sfr.log*'))
+
+    calls = sorted(latency for thread in latencies for latency in thread)
+
+    return {'caller_s': caller_time,
+            'total_s': total_time,
+            'mean_us': statistics.fmean(calls) / 1000,
+            'p99_us': calls[int(len(calls) * 0.99)] / 1000,
+            'max_us': calls[-1] / 1000,
+            'written_mb': written / 1024 / 1024}
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.option('--reports', '-r', type=click.INT, default=5_000, show_default=True, help='Number of simulated reports per thread, 6 log calls each')
+@click.option('--threads', '-t', type=click.INT, default=4, show_default=True, help='Number of threads logging at once')
+@click.option('--levels', '-l', type=click.STRING, default='INFO,DEBUG', show_default=True, help='Comma separated file log levels')
+def main(reports, threads, levels):
+    """
+    Compares logging through the queue and background listener with handlers attached straight to the root logger.
+    Latency of log calls is the time the caller (event loop, worker) is blocked, total time includes draining the queue.
+    """
+
+    print(f'{"level":>6} | {"mode":>6} | {"caller_s":>8} | {"total_s":>7} | {"mean_us":>7} | '
+          f'{"p99_us":>7} | {"max_us":>9} | {"written_mb":>10}')
+
+    for level in levels.upper().split(','):
+        for mode in ('direct', 'queue'):
+            result = _run(mode, level, threads, reports)
+            print(f'{level:>6} | {mode:>6} | {result["caller_s"]:>8.2f} | {result["total_s"]:>7.2f} | '
+                  f'{result["mean_us"]:>7.1f} | {result["p99_us"]:>7.1f} | {result["max_us"]:>9.1f} | '
+                  f'{result["written_mb"]:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3.11
+
+import random
+import asyncio
+import click
+
+from aiohttp import web
+from functools import lru_cache
+
+from benchmarks.synthetic import synthetic_export
+
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+
+@lru_cache(maxsize=32)
+def _export(size: int) -> bytes:
+    """Returns cached synthetic export of given size in bytes.
+    """
+    return synthetic_export(size)
+
+
+class MockSfdcServer():
+    """Concrete class representing local stand-in for SFDC export endpoint. Serves synthetic CSV exports
+    with 5 lines footer, simulates latency, server errors and broken streams.
+    """
+
+    def __init__(self,
+                 *,
+                 size: int = 1024 * 1024,
+                 latency: float = 0.0,
+                 latency_jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 disconnect_rate: float = 0.0,
+                 chunk_size: int = 65_536,
+                 expire_after: int = 0,
+                 seed: int | None = None):
+        """Constructor method for MockSfdcServer.
+
+        :param size: Default size of the export in bytes, can be overridden per request with `size` query parameter. Defaults to 1 Mb.
+        :type size: int
+        :param latency: Delay in seconds before response headers are sent. Defaults to 0.0.
+        :type latency: float
+        :param latency_jitter: Random delay in seconds added to `latency`. Defaults to 0.0.
+        :type latency_jitter: float
+        :param error_rate: Fraction of export requests answered with status 500. Defaults to 0.0.
+        :type error_rate: float
+        :param disconnect_rate: Fraction of export responses broken in the middle of the body. Defaults to 0.0.
+        :type disconnect_rate: float
+        :param chunk_size: Size of a single chunk of the body in bytes. Defaults to 65_536.
+        :type chunk_size: int
+        :param expire_after: Number of exports after which SID in use expires, requests with expired SID are redirected
+        to the login page. 0 means SID never expires. Defaults to 0.
+        :type expire_after: int
+        :param seed: Seed for random generator of errors and latency. Defaults to None.
+        :type seed: int | None
+        """
+
+        self.size: int = size
+        self.latency: float = latency
+        self.latency_jitter: float = latency_jitter
+        self.error_rate: float = error_rate
+        self.disconnect_rate: float = disconnect_rate
+        self.chunk_size: int = chunk_size
+        self.expire_after: int = expire_after
+        self.stats: dict[str, int] = {'requests': 0, 'exports': 0, 'errors': 0,
+                                      'disconnects': 0, 'bytes_sent': 0, 'expired': 0}
+        self._expired_sids: set[str] = set()
+        self._sid_exports: dict[str, int] = {}
+        self._random: random.Random = random.Random(seed)
+
+    def create_app(self) -> web.Application:
+        """Creates aiohttp application with landing page, stats and export routes.
+
+        :return: Application.
+        :rtype: web.Application
+        """
+
+        app = web.Application()
+        app.add_routes([web.get('/', self.landing_page),
+                        web.get('/_stats', self.get_stats),
+                        web.get('/{report_id}', self.export)])
+
+        return app
+
+    async def landing_page(self, request: web.Request) -> web.Response:
+        """Answers connection check of the connector, valid SID is marked with private cache control.
+        """
+
+        self.stats['requests'] += 1
+
+        if request.cookies.get('sid', '') in self._expired_sids:
+            return web.Response(text='SFR mock login', headers={'Cache-Control': 'no-cache'})
+
+        return web.Response(text='SFR mock', headers={'Cache-Control': 'private'})
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        """Returns counters of the server.
+        """
+        return web.json_response(self.stats)
+
+    def _is_expired(self, sid: str) -> bool:
+        """Counts exports served with the SID, SID expires once `expire_after` exports are served.
+        """
+
+        if not self.expire_after or sid in self._expired_sids:
+            return bool(self.expire_after)
+
+        self._sid_exports[sid] = self._sid_exports.get(sid, 0) + 1
+
+        if self._sid_exports[sid] > self.expire_after:
+            self._expired_sids.add(sid)
+            return True
+
+        return False
+
+    async def export(self, request: web.Request) -> web.StreamResponse:
+        """Streams synthetic export in chunks, randomly answers with status 500 or breaks the stream in the middle of the body.
+        Requests with expired SID are redirected to the login page.
+        """
+
+        self.stats['requests'] += 1
+
+        if self._is_expired(request.cookies.get('sid', '')):
+            self.stats['expired'] += 1
+            raise web.HTTPFound(f'/?ec=302&startURL=/{request.match_info["report_id"]}')
+
+        await asyncio.sleep(self.latency + self._random.uniform(0, self.latency_jitter))
+
+        if self._random.random() < self.error_rate:
+            self.stats['errors'] += 1
+            return web.Response(status=500, reason='Internal Server Error')
+
+        body = _export(int(request.query.get('size', self.size)))
+        disconnect_at = len(body) // 2 if self._random.random() < self.disconnect_rate else None
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/csv; charset=UTF-8'})
+        response.content_length = len(body)
+        await response.prepare(request)
+
+        for start in range(0, len(body), self.chunk_size):
+            if disconnect_at is not None and start >= disconnect_at:
+                self.stats['disconnects'] += 1
+                request.transport.close()
+                return response
+
+            chunk = body[start:start + self.chunk_size]
+            await response.write(chunk)
+            self.stats['bytes_sent'] += len(chunk)
+
+        await response.write_eof()
+        self.stats['exports'] += 1
+
+        return response
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.option('--host', type=click.STRING, default='127.0.0.1', show_default=True, help='Host to listen on')
+@click.option('--port', type=click.INT, default=8765, show_default=True, help='Port to listen on')
+@click.option('--size', '-s', type=click.FLOAT, default=1.0, show_default=True, help='Default size of the export in Mb')
+@click.option('--latency', '-l', type=click.FLOAT, default=0.0, show_default=True, help='Delay in seconds before response headers')
+@click.option('--latency-jitter', '-lj', type=click.FLOAT, default=0.0, show_default=True, help='Random delay in seconds added to latency')
+@click.option('--error-rate', '-e', type=click.FloatRange(0, 1), default=0.0, show_default=True, help='Fraction of requests answered with status 500')
+@click.option('--disconnect-rate', '-d', type=click.FloatRange(0, 1), default=0.0, show_default=True,
+              help='Fraction of responses broken in the middle of the body')
+@click.option('--expire-after', type=click.INT, default=0, show_default=True,
+              help='Number of exports after which SID expires, 0 means never')
+@click.option('--seed', type=click.INT, default=None, help='Seed for random generator of errors and latency')
+def main(host, port, size, latency, latency_jitter, error_rate, disconnect_rate, expire_after, seed):
+    """
+    Local stand-in for SFDC export endpoint. Every `/<report_id>` request is answered with synthetic CSV export
+    with 5 lines footer, `size` query parameter (bytes) overrides default size. Counters are available under `/_stats`.
+    """
+
+    server = MockSfdcServer(size=int(size * 1024 * 1024), latency=latency, latency_jitter=latency_jitter,
+                            error_rate=error_rate, disconnect_rate=disconnect_rate, expire_after=expire_after, seed=seed)
+
+    web.run_app(server.create_app(), host=host, port=port, print=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3.11
+
+import os
+import time
+import click
+import tempfile
+import pandas as pd
+
+from pathlib import Path
+
+from benchmarks.synthetic import write_synthetic_export
+from components.processors import passthrough_content, read_content, save_content
+
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+
+def _best_of(repeat: int, func, *args) -> float:
+    """Returns the best wall time in seconds out of `repeat` calls.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - t0)
+
+    return min(timings)
+
+
+def _pandas_roundtrip(spool_path: os.PathLike, file_path: os.PathLike) -> None:
+    save_content(read_content(spool_path), file_path)
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.option('--sizes', '-s', type=click.STRING, default='10,100,500', show_default=True, help='Comma separated sizes of synthetic exports in Mb')
+@click.option('--repeat', '-r', type=click.INT, default=3, show_default=True, help='Number of runs per size, the best one is reported')
+def main(sizes, repeat):
+    """
+    Compares Pandas parse-and-reserialize roundtrip with byte level passthrough on synthetic SFDC exports.
+    """
+
+    print(f'{"size_mb":>8} | {"pandas_s":>9} | {"passthrough_s":>13} | {"speedup":>7} | {"same_content":>12}')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(size) for size in sizes.split(',')):
+            spool_path = Path(tmp, f'export_{size}.csv')
+            write_synthetic_export(spool_path, size * 1024 * 1024)
+
+            pandas_time = _best_of(repeat, _pandas_roundtrip,
+                                   spool_path, Path(tmp, 'pandas.csv'))
+            passthrough_time = _best_of(repeat, passthrough_content,
+                                        spool_path, Path(tmp, 'passthrough.csv'))
+
+            same = pd.read_csv(Path(tmp, 'pandas.csv'), dtype='string').equals(
+                pd.read_csv(Path(tmp, 'passthrough.csv'), dtype='string'))
+
+            print(f'{size:>8} | {pandas_time:>9.2f} | {passthrough_time:>13.2f} | '
+                  f'{pandas_time / passthrough_time:>6.1f}x | {str(same):>12}')
+
+
+if __name__ == '__main__':
+    main()
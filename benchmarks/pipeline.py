@@ -0,0 +1,194 @@
+#!/usr/bin/env python3.11
+
+import os
+import sys
+import csv
+import json
+import time
+import click
+import socket
+import tempfile
+import subprocess
+import pandas as pd
+
+from pathlib import Path
+from urllib.error import URLError
+from urllib.request import urlopen
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'], ignore_unknown_options=True)
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    """Returns free local port.
+    """
+
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_server(url: str, timeout: float = 15.0) -> None:
+    """Waits until mock server answers.
+    """
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urlopen(url).close()
+            return None
+        except (URLError, ConnectionError):
+            time.sleep(0.1)
+
+    raise TimeoutError(f'Mock server not ready after {timeout} s')
+
+
+def _write_reports_list(path: Path, reports: int, sizes: list[float], output_path: Path) -> None:
+    """Writes input reports file, sizes of exports are taken in turns from `sizes`.
+    """
+
+    with open(path, 'w', encoding='UTF8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['report_type', 'report_file_name', 'report_id', 'report_path',
+                         'optional_export_params', 'optional_output_format'])
+
+        for num in range(reports):
+            size = int(sizes[num % len(sizes)] * 1024 * 1024)
+            writer.writerow(['SFDC', f'report_{num}', f'00O{num:012d}', output_path,
+                             f'?export=csv&enc=UTF-8&isdtp=p1&size={size}', ''])
+
+    return None
+
+
+def _peak_rss_mb() -> float | None:
+    """Returns peak RSS in Mb of terminated child processes, None if not supported on the platform.
+    """
+
+    if resource is None:
+        return None
+
+    return round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+
+
+def _stage_percentiles(profile: dict) -> dict[str, dict[str, float]]:
+    """Takes percentiles of stage latencies in seconds from run profile.
+    """
+
+    return {stage: {key: round(values[key], 3) for key in ('p50', 'p90', 'p99', 'max')}
+            for stage, values in profile['stages'].items() if values['count']}
+
+
+def _compare(results: dict, baseline: dict) -> None:
+    """Prints relative change of main metrics against the baseline.
+    """
+
+    print('\nChange against baseline:')
+    for metric in ('reports_per_sec', 'mb_per_sec', 'peak_rss_mb'):
+        if results.get(metric) and baseline.get(metric):
+            change = (results[metric] - baseline[metric]) / baseline[metric] * 100
+            print(f'  {metric:>16}: {baseline[metric]:>9} -> {results[metric]:>9} ({change:+.1f}%)')
+
+    return None
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.option('--reports', '-n', type=click.INT, default=50, show_default=True, help='Number of reports in the run')
+@click.option('--sizes', '-s', type=click.STRING, default='0.5,2,8', show_default=True,
+              help='Comma separated sizes of exports in Mb, assigned to reports in turns')
+@click.option('--latency', '-l', type=click.FLOAT, default=0.05, show_default=True, help='Delay in seconds before response headers')
+@click.option('--latency-jitter', '-lj', type=click.FLOAT, default=0.05, show_default=True, help='Random delay in seconds added to latency')
+@click.option('--error-rate', '-e', type=click.FloatRange(0, 1), default=0.0, show_default=True, help='Fraction of requests answered with status 500')
+@click.option('--disconnect-rate', '-d', type=click.FloatRange(0, 1), default=0.0, show_default=True,
+              help='Fraction of responses broken in the middle of the body')
+@click.option('--seed', type=click.INT, default=0, show_default=True, help='Seed for random generator of mock server')
+@click.option('--output', '-o', type=click.Path(), default=None, help='Save results as JSON')
+@click.option('--baseline', '-bl', type=click.Path(exists=True), default=None, help='Compare results with JSON saved by previous run')
+@click.argument('sfr_args', nargs=-1, type=click.UNPROCESSED)
+def main(reports, sizes, latency, latency_jitter, error_rate, disconnect_rate, seed, output, baseline, sfr_args):
+    """
+    Runs entire SFR pipeline (main.py) against local mock SFDC server and reports throughput, peak memory
+    and stage latencies taken from the run profile. Arguments after `--` are passed to main.py, e.g. `-- -s -b process`.
+    """
+
+    port = _free_port()
+    domain = f'http://127.0.0.1:{port}/'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = Path(tmp, 'output')
+        output_path.mkdir()
+        reports_list_path = Path(tmp, 'reports.csv')
+        summary_path = Path(tmp, 'summary.csv')
+
+        _write_reports_list(reports_list_path, reports,
+                            [float(size) for size in sizes.split(',')], output_path)
+
+        server = subprocess.Popen([sys.executable, '-m', 'benchmarks.mock_server', '--port', str(port),
+                                   '--latency', str(latency), '--latency-jitter', str(latency_jitter),
+                                   '--error-rate', str(error_rate), '--disconnect-rate', str(disconnect_rate),
+                                   '--seed', str(seed)], cwd=ROOT_PATH)
+        try:
+            _wait_for_server(f'{domain}_stats')
+
+            env = dict(os.environ, SFDC_DOMAIN=domain, SFDC_SID='benchmark',
+                       SUMMARY_REPORTS_PATH=str(summary_path))
+
+            t0 = time.perf_counter()
+            sfr = subprocess.run([sys.executable, str(ROOT_PATH / 'main.py'), str(reports_list_path),
+                                  '-ls', 'ERROR', *sfr_args],
+                                 cwd=ROOT_PATH, env=env, capture_output=True, text=True)
+            wall_time = time.perf_counter() - t0
+            peak_rss = _peak_rss_mb()
+
+            with urlopen(f'{domain}_stats') as r:
+                server_stats = json.load(r)
+        finally:
+            server.terminate()
+            server.wait()
+
+        if sfr.returncode:
+            raise click.ClickException(f'main.py failed:\n{sfr.stderr}')
+
+        summary = pd.read_csv(summary_path)
+
+        with open(summary_path.with_name(f'{summary_path.stem}_profile.json'), encoding='UTF8') as f:
+            profile = json.load(f)
+
+        valid = int(summary['valid'].sum())
+
+        results = {'reports': reports,
+                   'valid_reports': valid,
+                   'wall_time_s': round(wall_time, 3),
+                   'reports_per_sec': round(valid / wall_time, 2),
+                   'mb_per_sec': round(server_stats['bytes_sent'] / 1024 / 1024 / wall_time, 2),
+                   'peak_rss_mb': peak_rss,
+                   'attempts': int(summary['attempt_count'].sum()),
+                   'server': server_stats,
+                   'stages_s': _stage_percentiles(profile),
+                   'sfr_args': list(sfr_args)}
+
+    print(f'reports: {valid}/{reports} valid, attempts: {results["attempts"]}, '
+          f'errors: {server_stats["errors"]}, disconnects: {server_stats["disconnects"]}')
+    print(f'wall time: {results["wall_time_s"]} s, {results["reports_per_sec"]} reports/s, '
+          f'{results["mb_per_sec"]} MB/s, peak RSS: {peak_rss} Mb')
+    print(f'\n{"stage":>12} | {"p50_s":>8} | {"p90_s":>8} | {"p99_s":>8} | {"max_s":>8}')
+    for stage, values in results['stages_s'].items():
+        print(f'{stage:>12} | {values["p50"]:>8} | {values["p90"]:>8} | {values["p99"]:>8} | {values["max"]:>8}')
+
+    if baseline:
+        with open(baseline, encoding='UTF8') as f:
+            _compare(results, json.load(f))
+
+    if output:
+        with open(output, 'w', encoding='UTF8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
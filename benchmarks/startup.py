@@ -0,0 +1,114 @@
+#!/usr/bin/env python3.11
+
+import os
+import sys
+import json
+import time
+import click
+import tempfile
+import statistics
+import subprocess
+
+from pathlib import Path
+
+from benchmarks.pipeline import ROOT_PATH, _write_reports_list
+
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+IMPORT_TARGETS = {'cli': 'main',
+                  'connectors': 'components.connectors',
+                  'handlers': 'components.handlers'}
+
+
+def _wall_time(args: list[str], env: dict[str, str], repeat: int) -> float:
+    """Returns median wall time in seconds of the command run `repeat` times.
+    """
+
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(args, cwd=ROOT_PATH, env=env, check=True, capture_output=True)
+        times.append(time.perf_counter() - t0)
+
+    return round(statistics.median(times), 3)
+
+
+def _import_times(module: str, env: dict[str, str]) -> list[tuple[str, int, int]]:
+    """Imports the module in fresh interpreter with `-X importtime`, imports of interpreter startup are skipped.
+
+    :return: Collection of the module and modules imported by it -> name, self and cumulative import time in microseconds.
+    :rtype: list[tuple[str, int, int]]
+    """
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT_PATH, env=env, check=True, capture_output=True, text=True)
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        times.append((name, int(self_us), int(cumulative_us)))
+
+    end = max(num for num, (name, _, _) in enumerate(times) if name.strip() == module)
+    start = end
+    while start > 0 and times[start - 1][0][1:].startswith(' '):
+        start -= 1
+
+    return [(name.strip(), self_us, cumulative_us) for name, self_us, cumulative_us in times[start:end + 1]]
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.option('--repeat', '-n', type=click.INT, default=5, show_default=True, help='Number of runs of every command, median is taken')
+@click.option('--reports', '-r', type=click.INT, default=100, show_default=True, help='Number of reports listed in dry run')
+@click.option('--top', type=click.INT, default=10, show_default=True, help='Number of the slowest imports shown per target')
+@click.option('--output', '-o', type=click.Path(), default=None, help='Save results as JSON')
+@click.option('--baseline', '-bl', type=click.Path(exists=True), default=None, help='Compare results with JSON saved by previous run')
+def main(repeat, reports, top, output, baseline):
+    """
+    Measures startup of SFR -> wall time of `--help` and `--cli_dry_run` and import time of entry point,
+    connectors (network) and handlers (Pandas) in fresh interpreters.
+    """
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reports_list_path = Path(tmp, 'reports.csv')
+        _write_reports_list(reports_list_path, reports, [1.0], Path(tmp))
+
+        env = dict(os.environ, SFDC_DOMAIN='http://127.0.0.1:9/', SFDC_SID='benchmark',
+                   SUMMARY_REPORTS_PATH=str(Path(tmp, 'summary.csv')))
+        main_path = str(ROOT_PATH / 'main.py')
+
+        results = {'help_s': _wall_time([sys.executable, main_path, '--help'], env, repeat),
+                   'dry_run_s': _wall_time([sys.executable, main_path, str(reports_list_path), '-dr'], env, repeat),
+                   'imports_ms': {}}
+
+        print(f'--help: {results["help_s"]} s, --cli_dry_run ({reports} reports): {results["dry_run_s"]} s')
+
+        for target, module in IMPORT_TARGETS.items():
+            times = _import_times(module, env)
+            results['imports_ms'][target] = round(times[-1][2] / 1000, 1)
+
+            print(f'\nimport {module}: {results["imports_ms"][target]} ms, slowest imports (cumulative):')
+            for name, _, cumulative in sorted(times, key=lambda item: item[2], reverse=True)[1:top + 1]:
+                print(f'  {name:<48} {cumulative / 1000:>8.1f} ms')
+
+    if baseline:
+        with open(baseline, encoding='UTF8') as f:
+            previous = json.load(f)
+
+        print('\nChange against baseline:')
+        for metric, value, old in [('help_s', results['help_s'], previous.get('help_s')),
+                                   ('dry_run_s', results['dry_run_s'], previous.get('dry_run_s')),
+                                   *[(f'import {target} ms', value, previous.get('imports_ms', {}).get(target))
+                                     for target, value in results['imports_ms'].items()]]:
+            if value and old:
+                print(f'  {metric:>20}: {old:>9} -> {value:>9} ({(value - old) / old * 100:+.1f}%)')
+
+    if output:
+        with open(output, 'w', encoding='UTF8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
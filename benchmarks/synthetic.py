@@ -0,0 +1,85 @@
+import os
+import random
+
+from typing import Generator
+
+
+HEADER = '"Id","Account Name","Owner","Stage","Amount","Close Date","Description"\n'
+
+FOOTER = ('\n"Synthetic Report"\n'
+          '"Copyright (c) 2000-2023 salesforce.com, inc. All rights reserved."\n'
+          '"Confidential Information - Do Not Distribute"\n'
+          '"Generated By:  SFR Benchmark  1/1/2023 10:00 AM"\n'
+          '"SFR"\n')
+
+
+def synthetic_rows(seed: int = 0) -> Generator[str, None, None]:
+    """Generates endless stream of SFDC-like CSV rows, every 10th row has quoted multi-line description.
+
+    :param seed: Seed for random generator. Defaults to 0.
+    :type seed: int
+    :yield: Single CSV row with trailing line break.
+    :rtype: str
+    """
+
+    rand = random.Random(seed)
+    stages = ['Prospecting', 'Qualification', 'Negotiation', 'Closed Won', 'Closed Lost']
+    num = 0
+
+    while True:
+        description = (f'Line one of {num}\nLine two, with ""quotes""' if num % 10 == 0
+                       else f'Regular description {rand.random():.6f}')
+        yield (f'"0065g{num:010d}","Account {rand.randint(1, 99999)}","Owner {num % 97}",'
+               f'"{rand.choice(stages)}","{rand.randint(100, 10**7)}","{rand.randint(1, 12)}/{rand.randint(1, 28)}/2023",'
+               f'"{description}"\n')
+        num += 1
+
+
+def synthetic_export(size: int, seed: int = 0) -> bytes:
+    """Creates SFDC-like CSV export of approximately given size with 5 lines footer.
+
+    :param size: Approximate size of the export in bytes.
+    :type size: int
+    :param seed: Seed for random generator. Defaults to 0.
+    :type seed: int
+    :return: Encoded export.
+    :rtype: bytes
+    """
+
+    rows = [HEADER]
+    length = len(HEADER)
+
+    for row in synthetic_rows(seed):
+        if length >= size:
+            break
+        rows.append(row)
+        length += len(row)
+
+    rows.append(FOOTER)
+
+    return ''.join(rows).encode('UTF-8')
+
+
+def write_synthetic_export(path: os.PathLike, size: int, seed: int = 0) -> None:
+    """Writes SFDC-like CSV export of approximately given size to the file.
+
+    :param path: Path to the file.
+    :type path: os.PathLike
+    :param size: Approximate size of the export in bytes.
+    :type size: int
+    :param seed: Seed for random generator. Defaults to 0.
+    :type seed: int
+    """
+
+    with open(path, 'w', encoding='UTF-8', newline='') as f:
+        f.write(HEADER)
+        written = len(HEADER)
+
+        for row in synthetic_rows(seed):
+            if written >= size:
+                break
+            written += f.write(row)
+
+        f.write(FOOTER)
+
+    return None
@@ -1,12 +1,15 @@
 import os
 import csv
 import logging
+import tempfile
 
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Protocol
 from dotenv import load_dotenv
 
 from components.exceptions import EnvFileNotPresent
+from components.processors import OUTPUT_FORMATS
 
 
 logger_main = logging.getLogger(__name__)
@@ -23,12 +26,90 @@ class ConfigProtocol(Protocol):
     :type cli_path: str
     :param cli_threads: CLI argument for number of threads to use.
     :type cli_threads: int
+    :param cli_stream: CLI argument for streaming responses to spool files.
+    :type cli_stream: bool
+    :param cli_chunk_size: CLI argument for size of a single chunk in bytes in streaming mode.
+    :type cli_chunk_size: int
+    :param cli_concurrency: CLI argument for maximum number of requests in flight per domain.
+    :type cli_concurrency: int
+    :param cli_adaptive: CLI argument for adaptive number of requests in flight.
+    :type cli_adaptive: bool
+    :param cli_max_attempts: CLI argument for maximum number of attempts per report.
+    :type cli_max_attempts: int
+    :param cli_backoff_base: CLI argument for delay in seconds before the first retry.
+    :type cli_backoff_base: float
+    :param cli_backoff_max: CLI argument for maximum delay in seconds between retries.
+    :type cli_backoff_max: float
+    :param cli_jitter: CLI argument for randomized fraction of the delay.
+    :type cli_jitter: float
+    :param cli_retry_budget: CLI argument for maximum number of retries for entire run.
+    :type cli_retry_budget: int
+    :param cli_queue_size: CLI argument for maximum number of reports waiting for workers.
+    :type cli_queue_size: int
+    :param cli_queue_mb: CLI argument for maximum size of reports waiting for workers in Mb.
+    :type cli_queue_mb: int
+    :param cli_backend: CLI argument for processing backend of workers.
+    :type cli_backend: str
+    :param cli_passthrough: CLI argument for copying CSV reports without parsing.
+    :type cli_passthrough: bool
+    :param cli_format: CLI argument for default output format of the reports.
+    :type cli_format: str
+    :param cli_chunk_rows: CLI argument for number of rows in a single chunk processed by Pandas.
+    :type cli_chunk_rows: int
+    :param cli_resume: CLI argument for resuming previous run from the run manifest.
+    :type cli_resume: bool
+    :param cli_skip_unchanged: CLI argument for leaving files of reports unchanged since the previous run alone.
+    :type cli_skip_unchanged: bool
+    :param cli_fsync: CLI argument for fsync policy of written files.
+    :type cli_fsync: str
+    :param cli_dry_run: CLI argument for dry run, reports are parsed and listed without touching the network.
+    :type cli_dry_run: bool
+    :param cli_summary_format: CLI argument for format of the summary streamed during the run.
+    :type cli_summary_format: str
+    :param cli_metrics_interval: CLI argument for interval in seconds between writes of metrics during the run.
+    :type cli_metrics_interval: float
+    :param cli_report_metrics: CLI argument for series of every report in metrics.
+    :type cli_report_metrics: bool
+    :param cli_profile: CLI argument for CPU profiling of the event loop and workers.
+    :type cli_profile: bool
+    :param cli_trace_memory: CLI argument for tracing memory at download, parse and write stages.
+    :type cli_trace_memory: bool
+    :param cli_daemon: CLI argument for daemon mode, reports are requested on their intervals until stopped.
+    :type cli_daemon: bool
+    :param cli_interval: CLI argument for default interval in minutes between runs of reports in daemon mode.
+    :type cli_interval: float
     """
 
     cli_reports_list_path: str
     cli_report: str
     cli_path: str
     cli_threads: int
+    cli_stream: bool
+    cli_chunk_size: int
+    cli_concurrency: int
+    cli_adaptive: bool
+    cli_max_attempts: int
+    cli_backoff_base: float
+    cli_backoff_max: float
+    cli_jitter: float
+    cli_retry_budget: int
+    cli_queue_size: int
+    cli_queue_mb: int
+    cli_backend: str
+    cli_passthrough: bool
+    cli_format: str
+    cli_chunk_rows: int
+    cli_resume: bool
+    cli_skip_unchanged: bool
+    cli_fsync: str
+    cli_dry_run: bool
+    cli_summary_format: str
+    cli_metrics_interval: float
+    cli_report_metrics: bool
+    cli_profile: bool
+    cli_trace_memory: bool
+    cli_daemon: bool
+    cli_interval: float
 
     @staticmethod
     def load_env_file() -> None:
@@ -45,7 +126,33 @@ class Config:
                  cli_reports_list_path: str,
                  cli_report: str,
                  cli_path: str,
-                 cli_threads: int):
+                 cli_threads: int,
+                 cli_stream: bool = False,
+                 cli_chunk_size: int = 262_144,
+                 cli_concurrency: int = 20,
+                 cli_adaptive: bool = False,
+                 cli_max_attempts: int = 20,
+                 cli_backoff_base: float = 1.0,
+                 cli_backoff_max: float = 60.0,
+                 cli_jitter: float = 1.0,
+                 cli_retry_budget: int = 0,
+                 cli_queue_size: int = 0,
+                 cli_queue_mb: int = 0,
+                 cli_backend: str = 'thread',
+                 cli_passthrough: bool = False,
+                 cli_format: str = 'csv',
+                 cli_chunk_rows: int = 0,
+                 cli_resume: bool = False,
+                 cli_skip_unchanged: bool = False,
+                 cli_fsync: str = 'file',
+                 cli_dry_run: bool = False,
+                 cli_summary_format: str = 'csv',
+                 cli_metrics_interval: float = 15.0,
+                 cli_report_metrics: bool = False,
+                 cli_profile: bool = False,
+                 cli_trace_memory: bool = False,
+                 cli_daemon: bool = False,
+                 cli_interval: float = 15.0):
         """Concrete class representing ReportContainer object. 
 
         :param cli_reports_list_path: CLI argument for input report list path.
@@ -56,6 +163,58 @@ class Config:
         :type cli_path: str
         :param cli_threads: CLI argument for number of threads to use.
         :type cli_threads: int
+        :param cli_stream: CLI argument for streaming responses to spool files. Defaults to False.
+        :type cli_stream: bool
+        :param cli_chunk_size: CLI argument for size of a single chunk in bytes in streaming mode. Defaults to 262_144.
+        :type cli_chunk_size: int
+        :param cli_concurrency: CLI argument for maximum number of requests in flight per domain, 0 means no limit. Defaults to 20.
+        :type cli_concurrency: int
+        :param cli_adaptive: CLI argument for adaptive number of requests in flight, `cli_concurrency` is the upper bound. Defaults to False.
+        :type cli_adaptive: bool
+        :param cli_max_attempts: CLI argument for maximum number of attempts per report. Defaults to 20.
+        :type cli_max_attempts: int
+        :param cli_backoff_base: CLI argument for delay in seconds before the first retry, doubled with every retry. Defaults to 1.0.
+        :type cli_backoff_base: float
+        :param cli_backoff_max: CLI argument for maximum delay in seconds between retries. Defaults to 60.0.
+        :type cli_backoff_max: float
+        :param cli_jitter: CLI argument for randomized fraction of the delay, 0 means no jitter, 1 means full jitter. Defaults to 1.0.
+        :type cli_jitter: float
+        :param cli_retry_budget: CLI argument for maximum number of retries for entire run, 0 means no limit. Defaults to 0.
+        :type cli_retry_budget: int
+        :param cli_queue_size: CLI argument for maximum number of reports waiting for workers, 0 means no limit. Defaults to 0.
+        :type cli_queue_size: int
+        :param cli_queue_mb: CLI argument for maximum size of reports waiting for workers in Mb, 0 means no limit. Defaults to 0.
+        :type cli_queue_mb: int
+        :param cli_backend: CLI argument for processing backend of workers -> [thread | process], `process` enforces streaming mode. Defaults to 'thread'.
+        :type cli_backend: str
+        :param cli_passthrough: CLI argument for copying CSV reports without parsing, footer is removed at byte level. Defaults to False.
+        :type cli_passthrough: bool
+        :param cli_format: CLI argument for output format of the reports without `output_format` column -> [csv | csv.gz | parquet | feather]. Defaults to 'csv'.
+        :type cli_format: str
+        :param cli_chunk_rows: CLI argument for number of rows in a single chunk processed by Pandas, 0 means entire report is read at once. Defaults to 0.
+        :type cli_chunk_rows: int
+        :param cli_resume: CLI argument for resuming previous run, reports finished and verified in the run manifest are skipped. Defaults to False.
+        :type cli_resume: bool
+        :param cli_skip_unchanged: CLI argument for skip-unchanged mode, files of reports with the same content as in the previous run are not rewritten. Defaults to False.
+        :type cli_skip_unchanged: bool
+        :param cli_fsync: CLI argument for fsync policy of written files -> [none | file | full], files are always written to temporary file and renamed into place. Defaults to 'file'.
+        :type cli_fsync: str
+        :param cli_dry_run: CLI argument for dry run, reports are parsed and listed without touching the network. Defaults to False.
+        :type cli_dry_run: bool
+        :param cli_summary_format: CLI argument for format of the summary streamed during the run -> [csv | jsonl]. Defaults to 'csv'.
+        :type cli_summary_format: str
+        :param cli_metrics_interval: CLI argument for interval in seconds between writes of metrics during the run, 0 means metrics are written once the run is finished. Defaults to 15.0.
+        :type cli_metrics_interval: float
+        :param cli_report_metrics: CLI argument for series of every report (duration, size, result, scheduled runs) in metrics, only totals of the run are recorded otherwise. Defaults to False.
+        :type cli_report_metrics: bool
+        :param cli_profile: CLI argument for CPU profiling (cProfile) of the event loop and every worker thread. Defaults to False.
+        :type cli_profile: bool
+        :param cli_trace_memory: CLI argument for tracing memory (tracemalloc) at download, parse and write stages. Defaults to False.
+        :type cli_trace_memory: bool
+        :param cli_daemon: CLI argument for daemon mode, one session and one pool of workers are kept alive and reports are requested on their intervals until stopped. Defaults to False.
+        :type cli_daemon: bool
+        :param cli_interval: CLI argument for default interval in minutes between runs of reports without `interval` column in daemon mode. Defaults to 15.0.
+        :type cli_interval: float
         """
 
         self.load_env_file()
@@ -66,8 +225,42 @@ class Config:
         self.cli_path: str = cli_path
         self.summary_report_path: os.PathLike = Path(
             os.path.abspath(str(os.getenv("SUMMARY_REPORTS_PATH"))))
+        self.manifest_path: os.PathLike = self._define_manifest_path()
+        self.history_path: os.PathLike = self._define_history_path()
+        self.sid_cache_path: os.PathLike | None = self._define_sid_cache_path()
+        self.summary_format: str = cli_summary_format
+        self.summary_stream_path: os.PathLike = self._define_summary_stream_path()
+        self.metrics_path: os.PathLike = self._define_metrics_path()
+        self.metrics_interval: float = cli_metrics_interval
+        self.report_metrics: bool = cli_report_metrics
+        self.profile: bool = cli_profile
+        self.trace_memory: bool = cli_trace_memory
+        self.profile_path: os.PathLike = self._define_profile_path()
+        self.resume: bool = cli_resume
+        self.skip_unchanged: bool = cli_skip_unchanged
+        self.fsync: str = cli_fsync
+        self.dry_run: bool = cli_dry_run
+        self.daemon: bool = cli_daemon
+        self.interval: float = cli_interval
         self.cli_threads: int = cli_threads
-        self.keys: list[str] = ['type', 'name', 'id', 'path', 'params']
+        self.backend: str = cli_backend
+        self.stream: bool = self._define_stream(cli_stream)
+        self.passthrough: bool = cli_passthrough
+        self.output_format: str = cli_format
+        self.chunk_rows: int = cli_chunk_rows
+        self.chunk_size: int = cli_chunk_size
+        self.spool_path: os.PathLike = self._define_spool_path()
+        self.concurrency: int = cli_concurrency
+        self.adaptive: bool = cli_adaptive
+        self.max_attempts: int = cli_max_attempts
+        self.backoff_base: float = cli_backoff_base
+        self.backoff_max: float = cli_backoff_max
+        self.jitter: float = cli_jitter
+        self.retry_budget: int = cli_retry_budget
+        self.queue_size: int = cli_queue_size
+        self.queue_bytes: int = cli_queue_mb * 1024 * 1024
+        self.keys: list[str] = ['type', 'name', 'id',
+                                'path', 'export_params', 'output_format', 'shards', 'interval']
 
         self.reports_list_path: os.PathLike = self._define_reports_list_path()
         self.report_params_list: list[dict[str,
@@ -93,7 +286,82 @@ class Config:
         If CLI report is filled (single report mode) then number of threads will be automatically set to 1  
         """
 
-        return (int((os.cpu_count() or 4) / 2) if not self.cli_threads else self.cli_threads) if not self.cli_report else 1
+        return (max(1, int((os.cpu_count() or 4) / 2)) if not self.cli_threads else self.cli_threads) if not self.cli_report else 1
+
+    def _define_stream(self, cli_stream: bool) -> bool:
+        """Defines streaming mode. Process backend works on spool files only, so streaming mode is enforced.
+        """
+
+        if self.backend == 'process' and not cli_stream:
+            logger_main.info('Process backend selected, streaming mode enforced')
+            return True
+
+        return cli_stream
+
+    def _define_spool_path(self) -> os.PathLike:
+        """Defines directory for spool files used in streaming mode. 
+        Taken from `SPOOL_PATH` environment variable, defaults to `sfr` folder in system temp directory.
+        """
+
+        if os.getenv("SPOOL_PATH"):
+            return Path(os.path.abspath(str(os.getenv("SPOOL_PATH"))))
+        else:
+            return Path(tempfile.gettempdir(), 'sfr')
+
+    def _define_manifest_path(self) -> os.PathLike:
+        """Defines path to the run manifest, saved next to summary report with `_manifest` suffix.
+        """
+
+        return Path(self.summary_report_path).with_name(
+            f'{Path(self.summary_report_path).stem}_manifest.jsonl')
+
+    def _define_summary_stream_path(self) -> os.PathLike:
+        """Defines path to the summary streamed during the run, saved next to summary report with `_progress` suffix.
+        """
+
+        return Path(self.summary_report_path).with_name(
+            f'{Path(self.summary_report_path).stem}_progress.{self.summary_format}')
+
+    def _define_metrics_path(self) -> os.PathLike:
+        """Defines path to the metrics of the run. Taken from `METRICS_PATH` environment variable, metrics are saved in `sfr.prom`
+        if it points to a directory (e.g. directory of textfile collector). Defaults to Prometheus text file next to summary report with `_metrics` suffix.
+        """
+
+        if os.getenv("METRICS_PATH"):
+            metrics_path = Path(os.path.abspath(str(os.getenv("METRICS_PATH"))))
+            return metrics_path / 'sfr.prom' if metrics_path.is_dir() else metrics_path
+        else:
+            return Path(self.summary_report_path).with_name(
+                f'{Path(self.summary_report_path).stem}_metrics.prom')
+
+    @staticmethod
+    def _define_profile_path() -> os.PathLike:
+        """Defines directory of profiling results, `profile_<date and time of the run>` in `logs` folder of the app.
+        """
+
+        return Path(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs',
+                                                 f'profile_{datetime.now():%Y%m%d_%H%M%S}')))
+
+    def _define_history_path(self) -> os.PathLike:
+        """Defines path to the history of past runs. Taken from `HISTORY_PATH` environment variable, 
+        defaults to SQLite database next to summary report with `_history` suffix.
+        """
+
+        if os.getenv("HISTORY_PATH"):
+            return Path(os.path.abspath(str(os.getenv("HISTORY_PATH"))))
+        else:
+            return Path(self.summary_report_path).with_name(
+                f'{Path(self.summary_report_path).stem}_history.sqlite')
+
+    def _define_sid_cache_path(self) -> os.PathLike | None:
+        """Defines path to the cache of intercepted SID, taken from `SID_CACHE_PATH` environment variable.
+        Cache is opt-in as SID is saved in plain text, None if the variable is not set.
+        """
+
+        if os.getenv("SID_CACHE_PATH"):
+            return Path(os.path.abspath(str(os.getenv("SID_CACHE_PATH"))))
+        else:
+            return None
 
     def _define_reports_list_path(self) -> os.PathLike:
         if self.cli_reports_list_path:
@@ -126,11 +394,6 @@ class Config:
 
         logger_main.debug("Parsing input reports - single mode report")
 
-        if len(self.cli_report) != 5:
-            logger_main.debug(
-                "Parsing input reports - single mode report | optional_params not present")
-            self.cli_report.append('')
-
         return [dict(zip(self.keys, self.cli_report))]
 
     def _input_report_csv_standard_file_mode(self) -> list[dict[str, str]]:
@@ -164,6 +427,45 @@ class Config:
 
         return object_kwargs
 
+    def _input_report_defaults(self, object_kwargs: list[dict[str, str]]) -> list[dict[str, str]]:
+        """Removes empty optional parameters so report defaults apply, fills missing `output_format` with value from CLI argument.
+        Casts `shards` to integer and `interval` to float, invalid values fall back to defaults.
+
+        :param object_kwargs: Colection of object parameters
+        :type object_kwargs: list[dict[str, str]]
+        :return: Collection of object parameters with defaults applied
+        :rtype: list[dict[str, str]]
+        """
+
+        logger_main.debug("Parsing input reports - applying defaults")
+
+        object_kwargs = [{key: value.strip() for key, value in dict.items() if value and value.strip()}
+                         for dict in object_kwargs]
+
+        for dict in object_kwargs:
+            dict.setdefault('output_format', self.output_format)
+
+            if dict['output_format'] not in OUTPUT_FORMATS:
+                logger_main.warning("%s -> Unknown output format %s, %s used instead",
+                                    dict.get('name'), dict['output_format'], self.output_format)
+                dict['output_format'] = self.output_format
+
+            if 'shards' in dict:
+                if dict['shards'].isdigit() and int(dict['shards']) > 0:
+                    dict['shards'] = int(dict['shards'])
+                else:
+                    logger_main.warning("%s -> Invalid number of shards %s, report requested as a whole",
+                                        dict.get('name'), dict.pop('shards'))
+
+            if 'interval' in dict:
+                if dict['interval'].replace('.', '', 1).isdigit() and float(dict['interval']) > 0:
+                    dict['interval'] = float(dict['interval'])
+                else:
+                    logger_main.warning("%s -> Invalid interval %s, default interval used instead",
+                                        dict.get('name'), dict.pop('interval'))
+
+        return object_kwargs
+
     def _parse_input_report(self) -> list[dict[str, Any]]:
         """Orchestrating function for parsing parameters for input reports.
 
@@ -180,6 +482,8 @@ class Config:
         else:
             _temp_report_params = self._input_report_csv_standard_file_mode()
 
+        _temp_report_params = self._input_report_defaults(_temp_report_params)
+
         if self.cli_path:
             _temp_report_params = self._input_report_path_override(
                 _temp_report_params)
@@ -187,3 +491,15 @@ class Config:
         logger_main.debug("Input reports successfully generated")
 
         return self._input_report_path_cast(_temp_report_params)
+
+    def reload_reports(self) -> list[dict[str, Any]]:
+        """Parses input reports once again, e.g. once the reports list has been changed in daemon mode.
+
+        :return: Collection of ready to use object kwargs.
+        :rtype: list[dict[str, Any]]
+        """
+
+        logger_main.debug("Reloading input reports from %s", self.reports_list_path)
+        self.report_params_list = self._parse_input_report()
+
+        return self.report_params_list
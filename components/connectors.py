@@ -1,18 +1,30 @@
 import logging
 import asyncio
 import os
-import requests
+import uuid
+import shutil
 import aiohttp
-import browser_cookie3
 import webbrowser
+import tempfile
 
+from dataclasses import replace
+from pathlib import Path
 from typing import Protocol, runtime_checkable
+from urllib.parse import urlparse
 from queue import Queue
 from datetime import datetime
-from tqdm.asyncio import tqdm
-from time import sleep
+from time import sleep, monotonic
 
 from components.containers import ReportProtocol
+from components.metrics import MetricsProtocol
+from components.limiters import AimdLimiter, ConcurrencyLimiter, LimiterProtocol, WindowAdjustment
+from components.policies import ABORT, RetryPolicy, RetryPolicyProtocol
+from components.processors import ContentHasher
+from components.profilers import ProfilerProtocol
+from components.queues import HandoffQueue
+from components.sessions import SidCacheProtocol
+from components.shards import collect_shards, create_shards
+from components.summaries import SummaryProtocol
 
 
 logger_main = logging.getLogger(__name__)
@@ -37,9 +49,11 @@ class Connector(Protocol):
     timeout: int
     headers: dict[str, str]
 
-    def check_connection(self) -> bool:
+    async def check_connection(self, session: aiohttp.ClientSession) -> bool:
         """Checks connection with given domain.
 
+        :param session: HTTP client session object shared with requests.
+        :type session: aiohttp.ClientSession
         :return: Flag, True if connection is established, False otherwise.
         :rtype: bool
         """
@@ -55,6 +69,34 @@ class Connector(Protocol):
         """
         ...
 
+    def open_session(self) -> aiohttp.ClientSession:
+        """Creates HTTP client session shared by requests.
+
+        :return: HTTP client session object.
+        :rtype: aiohttp.ClientSession
+        """
+        ...
+
+    async def reconnect(self, session: aiohttp.ClientSession) -> bool:
+        """Checks connection once again if the session has expired.
+
+        :param session: HTTP client session object shared with requests.
+        :type session: aiohttp.ClientSession
+        :return: Flag, True if connection is established, False otherwise.
+        :rtype: bool
+        """
+        ...
+
+    async def request_reports(self, reports: list[ReportProtocol], session: aiohttp.ClientSession) -> None:
+        """Requests reports within the session.
+
+        :param reports: Collection of ReportProtocol objects.
+        :type reports: list[ReportProtocol]
+        :param session: HTTP client session object shared with requests.
+        :type session: aiohttp.ClientSession
+        """
+        ...
+
 
 class SfdcConnector():
     """Concrete class representing Connector object for SFDC
@@ -69,6 +111,22 @@ class SfdcConnector():
     :type headers: dict[str, str]
     :param export_params: Default parameters required by SFDC. Defaults to '?export=csv&enc=UTF-8&isdtp=p1'.
     :type export_params: str
+    :param stream: Flag, if True responses are streamed in chunks to spool files instead of being kept in memory. Defaults to False.
+    :type stream: bool
+    :param chunk_size: Size of a single chunk in bytes read from the response in streaming mode. Defaults to 262_144.
+    :type chunk_size: int
+    :param spool_path: Directory for spool files used in streaming mode. Defaults to system temp directory.
+    :type spool_path: os.PathLike | None
+    :param concurrency: Maximum number of requests in flight per domain, remaining requests are queued. 0 means no limit. Defaults to 20.
+    :type concurrency: int
+    :param adaptive: Flag, if True number of requests in flight adapts to server responses (AIMD), `concurrency` is the upper bound. Defaults to False.
+    :type adaptive: bool
+    :param retry_policy: Policy driving retries of failed requests. Defaults to `RetryPolicy` with default settings.
+    :type retry_policy: RetryPolicyProtocol | None
+    :param hash_content: Flag, if True hash of the response without the footer is computed while the body is read. Defaults to False.
+    :type hash_content: bool
+    :param sid_cache: Cache of intercepted SID, cached SID is used as long as it's valid. Defaults to None.
+    :type sid_cache: SidCacheProtocol | None
     """
 
     def __init__(self,
@@ -77,8 +135,19 @@ class SfdcConnector():
                  verbose: bool = False,
                  timeout: int = 900,
                  headers: dict[str, str] = {'Content-Type': 'application/csv',
-                                            'X-PrettyPrint': '1'}):
-        """Constructor method for SfdcConnector, automatically checks connection after initialization.
+                                            'X-PrettyPrint': '1'},
+                 stream: bool = False,
+                 chunk_size: int = 262_144,
+                 spool_path: os.PathLike | None = None,
+                 concurrency: int = 20,
+                 adaptive: bool = False,
+                 retry_policy: RetryPolicyProtocol | None = None,
+                 hash_content: bool = False,
+                 sid_cache: SidCacheProtocol | None = None,
+                 summary: SummaryProtocol | None = None,
+                 metrics: MetricsProtocol | None = None,
+                 profiler: ProfilerProtocol | None = None):
+        """Constructor method for SfdcConnector. Connection is checked once the session is opened, see `check_connection`.
 
         :param queue: Shared, thread-safe queue.
         :type queue: Queue
@@ -88,6 +157,28 @@ class SfdcConnector():
         :type timeout: int
         :param headers: Headers for the request. Defaults to {'Content-Type': 'application/csv', 'X-PrettyPrint': '1'}.
         :type headers: dict[str, str]
+        :param stream: Flag, if True responses are streamed in chunks to spool files instead of being kept in memory. Defaults to False.
+        :type stream: bool
+        :param chunk_size: Size of a single chunk in bytes read from the response in streaming mode. Defaults to 262_144.
+        :type chunk_size: int
+        :param spool_path: Directory for spool files used in streaming mode. Defaults to system temp directory.
+        :type spool_path: os.PathLike | None
+        :param concurrency: Maximum number of requests in flight per domain, remaining requests are queued. 0 means no limit. Defaults to 20.
+        :type concurrency: int
+        :param adaptive: Flag, if True number of requests in flight adapts to server responses (AIMD), `concurrency` is the upper bound. Defaults to False.
+        :type adaptive: bool
+        :param retry_policy: Policy driving retries of failed requests. Defaults to `RetryPolicy` with default settings.
+        :type retry_policy: RetryPolicyProtocol | None
+        :param hash_content: Flag, if True hash of the response without the footer is computed while the body is read. Defaults to False.
+        :type hash_content: bool
+        :param sid_cache: Cache of intercepted SID, cached SID is used as long as it's valid. Defaults to None.
+        :type sid_cache: SidCacheProtocol | None
+        :param summary: Summary report streamed during the run, reports which failed to download are appended to it. Defaults to None.
+        :type summary: SummaryProtocol | None
+        :param metrics: Metrics of the run, requests in flight, responses, retries, bytes and queue depth are recorded in it. Defaults to None.
+        :type metrics: MetricsProtocol | None
+        :param profiler: Profiler of the run, memory is traced once the body of the response is downloaded. Defaults to None.
+        :type profiler: ProfilerProtocol | None
         """
 
         self.queue = queue
@@ -95,11 +186,26 @@ class SfdcConnector():
         self.domain = str(os.getenv("SFDC_DOMAIN"))
         self.timeout = timeout
         self.headers = headers
-        self.sid = self._intercept_sid()
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.spool_path = Path(spool_path or tempfile.gettempdir())
+        self.concurrency = concurrency
+        self.adaptive = adaptive
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.hash_content = hash_content
+        self.sid_cache = sid_cache
+        self.summary = summary
+        self.metrics = metrics
+        self.profiler = profiler
+        self._limiters: dict[str, LimiterProtocol] = {}
+        self._session_ready: asyncio.Event | None = None
+        self._refresh_lock: asyncio.Lock | None = None
+        self._sid_generation: int = 0
+        self._session_expired: bool = False
+        self.sid: str = ""
+        self.sid_expires: datetime | None = None
         self.edge_path = '"C:\\Program Files (x86)\\Microsoft\\Edge\\Application\\msedge.exe" --profile-directory=Default %s'
 
-        self.check_connection()
-
     def _convert_domain_for_cookies_lookup(self) -> str:
         """Converts domain as key in cookier for sid lookup.
 
@@ -111,26 +217,37 @@ class SfdcConnector():
         return self.domain.replace('https://', '').replace('/', '')
 
     def _intercept_sid(self) -> str:
-        """Intercepts sid from MS Edge's CookieJar.
+        """Intercepts sid from MS Edge's CookieJar, only cookies of the domain are read. Expiry date of the cookie is saved in `sid_expires`.
+        SID given in `SFDC_SID` environment variable takes precedence.
 
         :return: Intercepted `sid` or empty string if `sid` doesn't exist.
         :rtype: str
         """
 
+        if os.getenv("SFDC_SID"):
+            logger_main.info('SID taken from SFDC_SID environment variable')
+            return str(os.getenv("SFDC_SID"))
+
         logger_main.info('SID interception started')
         try:
+            import browser_cookie3
+
+            domain = self._convert_domain_for_cookies_lookup()
+
             logger_main.debug("Trying to access MS Edge's CookieJar")
-            cookie_jar = browser_cookie3.edge()
+            cookie_jar = browser_cookie3.edge(domain_name=domain)
 
             logger_main.debug("Retrieving SID entry from CookieJar")
-            sid = [cookie.value for cookie in cookie_jar if cookie.name ==
-                   'sid' and cookie.domain == self._convert_domain_for_cookies_lookup()]
+            for cookie in cookie_jar:
+                if cookie.name == 'sid' and cookie.domain == domain:
+                    self.sid_expires = datetime.fromtimestamp(cookie.expires) if cookie.expires else None
+                    return cookie.value or ""
+        except Exception:
+            pass
 
-            return sid[0] or ""
-        except:
-            logger_main.debug("SID entry not there")
+        logger_main.debug("SID entry not there")
 
-            return ""
+        return ""
 
     def _open_sfdc_site(self) -> None:
         """Opens SFDC website on given domain url if `sid`
@@ -163,33 +280,87 @@ class SfdcConnector():
 
         return None
 
-    def check_connection(self) -> bool:
-        """Checks the connection with given domain.
+    def _cache_sid(self) -> None:
+        """Caches intercepted SID, SID taken from `SFDC_SID` environment variable is not cached.
+        """
 
-        :return: Flag, True if connection was successful, False wasn't.
-        :rtype: bool
+        if self.sid_cache and not os.getenv("SFDC_SID"):
+            self.sid_cache.save(self.domain, self.sid, self.sid_expires)
+
+        return None
+
+    async def _find_sid(self) -> None:
+        """Intercepts SID without blocking the event loop, opens SFDC website to log in as long as SID is not found.
         """
 
-        logger_main.info("SID checking in progress ...")
+        self.sid = await asyncio.to_thread(self._intercept_sid)
 
         while not self.sid:
-            self._open_sfdc_site()
+            await asyncio.to_thread(self._open_sfdc_site)
 
         logger_main.info('SID found!')
 
-        self._parse_headers()
+        return None
+
+    async def _is_sid_valid(self, session: aiohttp.ClientSession) -> bool:
+        """Checks validity of SID, landing page of valid session is marked with private cache control.
+
+        :param session: Shared session object.
+        :type session: aiohttp.ClientSession
+        :return: Flag, True if SID is valid, False otherwise.
+        :rtype: bool
+        """
 
         logger_main.debug("Checking SID validity")
-        response = requests.get(self.domain,
-                                cookies={'sid': self.sid},
-                                allow_redirects=True)
-        if response.headers['Cache-Control'] == 'private':
-            logger_main.info('SID ok!')
-        else:
+        self._parse_headers()
+
+        try:
+            async with session.get(self.domain,
+                                   cookies={'sid': self.sid},
+                                   allow_redirects=True) as r:
+                return r.headers.get('Cache-Control') == 'private'
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger_main.critical('Connection with %s failed: %s', self.domain, repr(e))
+            return False
+
+    async def check_connection(self, session: aiohttp.ClientSession) -> bool:
+        """Checks the connection with given domain within the session used for requests.
+        Cached SID is checked first, CookieJar is searched only if cached SID is missing, expired or rejected.
+
+        :param session: Shared session object.
+        :type session: aiohttp.ClientSession
+        :return: Flag, True if connection was successful, False wasn't.
+        :rtype: bool
+        """
+
+        logger_main.info("SID checking in progress ...")
+
+        cached = bool(self.sid_cache and not os.getenv("SFDC_SID") and not self.sid)
+        if cached:
+            self.sid = self.sid_cache.load(self.domain)
+            cached = bool(self.sid)
+
+        if not self.sid:
+            await self._find_sid()
+
+        valid = await self._is_sid_valid(session)
+
+        if not valid and cached:
+            logger_main.info('Cached SID rejected')
+            self.sid_cache.clear()
+            await self._find_sid()
+            valid = await self._is_sid_valid(session)
+
+        if not valid:
             logger_main.critical('SID not ok!!!')
-            self.sid = None
+            self.sid = ""
             return False
 
+        logger_main.info('SID ok!')
+
+        if not cached:
+            self._cache_sid()
+
         return True
 
     def _parse_report_url(self, report: ReportProtocol) -> str:
@@ -202,64 +373,491 @@ class SfdcConnector():
         """
         return self.domain + report.id + report.export_params
 
-    async def _request_report(self, report: ReportProtocol, session: aiohttp.ClientSession) -> None:
+    def _domain_limiter(self, url: str) -> LimiterProtocol:
+        """Returns limiter of requests in flight for the domain of given url, creates it on first use.
+
+        :param url: Request url.
+        :type url: str
+        :return: Limiter shared by all requests to the domain.
+        :rtype: LimiterProtocol
+        """
+
+        domain = urlparse(url).netloc
+
+        if domain not in self._limiters:
+            logger_main.debug("Limiting requests to %s to %s in flight, adaptive: %s",
+                              domain, self.concurrency, self.adaptive)
+            limiter = AimdLimiter if self.adaptive else ConcurrencyLimiter
+            self._limiters[domain] = limiter(domain, self.concurrency)
+
+        return self._limiters[domain]
+
+    @property
+    def window_adjustments(self) -> list[WindowAdjustment]:
+        """Collection of all concurrency window adjustments made during the run.
+        """
+        return sorted((adjustment for limiter in self._limiters.values() for adjustment in limiter.adjustments),
+                      key=lambda adjustment: adjustment.date)
+
+    async def _spool_response(self, report: ReportProtocol, response: aiohttp.ClientResponse) -> os.PathLike:
+        """Streams response body in chunks to the spool file, memory usage is bounded by `chunk_size`.
+        Partially written spool file is removed if the stream breaks. Size of the body (and its hash if required) is saved in the report.
+
+        :param report: Instance of `ReportProtocol`.
+        :type report: ReportProtocol
+        :param response: Response object with not yet consumed body.
+        :type response: aiohttp.ClientResponse
+        :return: Path to the spool file.
+        :rtype: os.PathLike
+        """
+
+        self.spool_path.mkdir(parents=True, exist_ok=True)
+        fd, spool_file = tempfile.mkstemp(
+            prefix=f'{report.id}-', suffix='.csv', dir=self.spool_path)
+
+        logger_main.debug("%s -> Streaming content to %s",
+                          report.name, spool_file)
+        hasher = ContentHasher() if self.hash_content else None
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    f.write(chunk)
+                    if hasher:
+                        hasher.update(chunk)
+                report.bytes_transferred = f.tell()
+        except BaseException:
+            Path(spool_file).unlink(missing_ok=True)
+            raise
+
+        if hasher:
+            report.content_hash = hasher.hexdigest()
+
+        return Path(spool_file)
+
+    def _hash_body(self, body: bytes) -> str:
+        """Computes hash of the response body without the footer, body is consumed in chunks of `chunk_size`.
+
+        :param body: Response body.
+        :type body: bytes
+        :return: Hash of the body without the footer.
+        :rtype: str
+        """
+
+        hasher = ContentHasher()
+        view = memoryview(body)
+
+        for start in range(0, len(body), self.chunk_size):
+            hasher.update(view[start:start + self.chunk_size])
+
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _is_auth_failure(response: aiohttp.ClientResponse) -> bool:
+        """Checks if the request has been rejected due to expired session -> status 401 or redirect to the login page.
+
+        :param response: Response object.
+        :type response: aiohttp.ClientResponse
+        :return: Flag, True if the session has expired, False otherwise.
+        :rtype: bool
+        """
+
+        if response.status == 401:
+            return True
+
+        return bool(response.history) and ('startURL' in response.url.query
+                                            or str(response.url.host).startswith('login.'))
+
+    async def _refresh_session(self, sid_generation: int, session: aiohttp.ClientSession) -> bool:
+        """Refreshes expired session. New requests are paused, SID is intercepted once again and headers are updated,
+        then requests are resumed. Only the first report rejected with given SID refreshes the session,
+        the remaining ones wait for the outcome. If no new SID is found, current SID is validated once again:
+        if it's still valid only the rejected report fails (e.g. report not accessible with the session),
+        otherwise the session is marked as expired for the rest of the run.
+
+        :param sid_generation: Generation of SID used by rejected request.
+        :type sid_generation: int
+        :param session: Shared session object.
+        :type session: aiohttp.ClientSession
+        :return: Flag, True if the request can be repeated with new SID, False otherwise.
+        :rtype: bool
+        """
+
+        async with self._refresh_lock:
+            if self._session_expired or sid_generation != self._sid_generation:
+                return not self._session_expired
+
+            self._session_ready.clear()
+            logger_main.warning('Session expired, pausing new requests and intercepting SID')
+
+            try:
+                sid = await asyncio.to_thread(self._intercept_sid)
+
+                if (not sid or sid == self.sid) and await self._is_sid_valid(session):
+                    logger_main.warning('SID not refreshed, but still valid, only the rejected request is aborted')
+                    return False
+
+                if not sid or sid == self.sid:
+                    logger_main.critical('SID not refreshed, remaining requests are aborted')
+                    self._session_expired = True
+                    if self.sid_cache:
+                        self.sid_cache.clear()
+                    return False
+
+                self.sid = sid
+                self._sid_generation += 1
+                self._parse_headers()
+                self._cache_sid()
+                logger_main.warning('SID refreshed, resuming requests')
+            finally:
+                self._session_ready.set()
+
+        return True
+
+    async def _enqueue(self, report: ReportProtocol) -> None:
+        """Puts the report to the queue. Bounded `HandoffQueue` is awaited without blocking the event loop,
+        time spent on waiting for free space and depth of the queue are saved in the report.
+
+        :param report: Instance of `ReportProtocol`.
+        :type report: ReportProtocol
+        """
+
+        report.queue_depth = self.queue.qsize()
+        report.timings.enqueued = datetime.now()
+
+        if isinstance(self.queue, HandoffQueue):
+            report.queue_wait = await self.queue.async_put(report)
+        else:
+            self.queue.put(report)
+
+        if self.metrics:
+            self.metrics.set('sfr_queue_depth', self.queue.qsize())
+
+        if report.queue_wait:
+            logger_main.debug("%s waited %.2f s for free space in the queue",
+                              report.name, report.queue_wait)
+
+        return None
+
+    async def _enqueue_in_slot(self, report: ReportProtocol) -> None:
+        """Puts the report downloaded outside of the limiter (sharded or shared download) to the queue within the slot
+        of its domain, so reports waiting for free space in the queue hold back further downloads, as single reports do.
+
+        :param report: Instance of `ReportProtocol`.
+        :type report: ReportProtocol
+        """
+
+        async with self._domain_limiter(self._parse_report_url(report)):
+            await self._enqueue(report)
+
+        return None
+
+    def _request_timeout(self, report: ReportProtocol) -> float:
+        """Returns timeout of the current attempt of the report. Timeout based on history of past runs is multiplied
+        by the number of the attempt, so the report slower than in recent runs isn't cut off at the same point on every retry.
+        Reports without history use `timeout` of the connector.
+
+        :param report: Instance of `ReportProtocol`.
+        :type report: ReportProtocol
+        :return: Timeout in seconds.
+        :rtype: float
+        """
+
+        if not report.timeout:
+            return self.timeout
+
+        return report.timeout * max(1, report.attempt_count)
+
+    async def _request_report(self, report: ReportProtocol, session: aiohttp.ClientSession, *, enqueue: bool = True) -> None:
         """Sends asynchronous request to given domain with given parameters within shared session. Checks response status:
-        - 200: response is saved in `ReportProtocol.response`, `ReportProtocol.valid` set to True, ReportProtocol is being put to the `queue`.
+        - 200: response is saved in `ReportProtocol.response` (or streamed to `ReportProtocol.spool_path` in streaming mode), `ReportProtocol.valid` set to True, ReportProtocol is being put to the `queue` (unless `enqueue` is False).
         - 404: error in response, `ReportProtocol.valid` set to False, no retries.
         - 500: request timeour, `ReportProtocol.valid` set to False, another attempt.
         - *: unknown error, `ReportProtocol.valid` set to False, another attempt.
+        Retries are driven by `retry_policy`, statuses marked as `abort` in the policy are not retried.
+        Requests rejected due to expired session (401 or redirect to the login page) are repeated without backing off
+        once the session is refreshed, see `_refresh_session`.
+        Timeout of the request is taken from the report (history of past runs), `timeout` of the connector otherwise,
+        see `_request_timeout`.
 
         :param report: Instance of `ReportProtocol`.
         :type report: ReportProtocol
         :param session: Shared session object.
         :type session: aiohttp.ClientSession
+        :param enqueue: Flag, if False downloaded report is not put to the queue, e.g. shard of the report. Defaults to True.
+        :type enqueue: bool
         """
 
         report.created_date = datetime.now()
 
         report_url = self._parse_report_url(report)
 
-        logger_main.info("%s -> Sending request", report.name)
-        logger_main.debug(
-            "Sending asynchronous report request with params: %s, %s", report_url, self.headers)
+        logger_main.info("%s -> Sending request, timeout: %s s", report.name, report.timeout or self.timeout)
+        logger_main.debug("Sending asynchronous report request with params: %s", report_url)
 
-        while not report.valid and report.attempt_count < 20:
-            async with session.get(report_url,
-                                   headers=self.headers,
-                                   cookies={'sid': str(self.sid)},
-                                   timeout=self.timeout,
-                                   allow_redirects=True) as r:
+        limiter = self._domain_limiter(report_url)
+
+        while not report.valid:
+            retry_after = None
+            auth_failure = False
+            failure = 'unknown'
 
+            if self._session_expired:
+                logger_main.error("%s is invalid, session expired, no retries", report.name)
+                break
+
+            await self._session_ready.wait()
+
+            async with limiter:
+                report.concurrency_window = limiter.window
+                sid_generation = self._sid_generation
+                request_time = monotonic()
+                report.timings.request_sent = datetime.now()
                 report.attempt_count += 1
 
-                if r.status == 200:
-                    logger_main.info(
-                        "%s -> Request successful, retrieving content", report.name)
-                    try:
-                        report.response = await r.text()
-                        report.valid = True
-                        logger_main.debug(
-                            "Sending the content to the queue for processing, %s elements in the queue before transfer", self.queue.qsize())
-                        self.queue.put(report)
-                        logger_main.debug(
-                            '%s succesfuly downloaded and put to the queue', report.name)
-                    except aiohttp.ClientPayloadError as e:
-                        logger_main.warning(
-                            '%s is invalid, Unexpected end of stream, SFDC just broke the connection', report.name, e)
-                        continue
-                elif r.status == 404:
-                    logger_main.error(
-                        "%s is invalid, Report does not exist - check ID, SFDC respond with status %s - %s", report.name, r.status, r.reason)
-                    report.valid = False
-                    break
-                elif r.status == 500:
+                if report.attempt_count > 1:
+                    logger_main.debug("%s -> Attempt %s, timeout: %s s",
+                                      report.name, report.attempt_count, self._request_timeout(report))
+
+                if self.metrics:
+                    self.metrics.inc('sfr_requests_in_flight')
+
+                try:
+                    async with session.get(report_url,
+                                           headers=self.headers,
+                                           cookies={'sid': str(self.sid)},
+                                           timeout=aiohttp.ClientTimeout(total=self._request_timeout(report)),
+                                           allow_redirects=True) as r:
+
+                        latency = monotonic() - request_time
+                        report.timings.first_byte = datetime.now()
+
+                        if self.metrics:
+                            self.metrics.inc('sfr_responses_total', status=str(r.status))
+
+                        if self._is_auth_failure(r):
+                            logger_main.warning(
+                                "%s is invalid, session expired, SFDC respond with status %s - %s", report.name, r.status, r.reason)
+                            auth_failure = True
+                        elif r.status == 200:
+                            logger_main.info(
+                                "%s -> Request successful, retrieving content", report.name)
+                            if self.stream:
+                                report.spool_path = await self._spool_response(report, r)
+                            else:
+                                body = await r.read()
+                                report.bytes_transferred = len(body)
+                                if self.hash_content:
+                                    report.content_hash = self._hash_body(body)
+                                report.response = await r.text()
+                            report.timings.body_complete = datetime.now()
+                            limiter.record_success(latency, report.expected_duration)
+                            report.valid = True
+                            if self.metrics:
+                                self.metrics.inc('sfr_downloaded_bytes_total', report.bytes_transferred)
+                            if self.profiler:
+                                self.profiler.snapshot('download', report)
+                            if enqueue:
+                                logger_main.debug(
+                                    "Sending the content to the queue for processing, %s elements in the queue before transfer", self.queue.qsize())
+                                await self._enqueue(report)
+                                logger_main.debug(
+                                    '%s succesfuly downloaded and put to the queue', report.name)
+                            break
+                        elif self.retry_policy.rule(r.status) == ABORT:
+                            logger_main.error(
+                                "%s is invalid, SFDC respond with status %s - %s, no retries", report.name, r.status, r.reason)
+                            report.valid = False
+                            break
+                        elif r.status == 500:
+                            logger_main.warning(
+                                "%s is invalid, Timeout, SFDC respond with status %s - %s", report.name, r.status, r.reason)
+                            limiter.record_failure(f'status {r.status}')
+                            report.valid = False
+                            failure = str(r.status)
+                        else:
+                            logger_main.warning(
+                                "%s is invalid, Unknown Error, SFDC respond with status %s - %s", report.name, r.status, r.reason)
+                            report.valid = False
+                            failure = str(r.status)
+
+                        retry_after = r.headers.get('Retry-After')
+                except aiohttp.ClientPayloadError as e:
                     logger_main.warning(
-                        "%s is invalid, Timeout, SFDC respond with status %s - %s", report.name, r.status, r.reason)
-                    report.valid = False
-                else:
+                        '%s is invalid, Unexpected end of stream, SFDC just broke the connection: %s', report.name, e)
+                    limiter.record_failure('unexpected end of stream')
+                    failure = 'disconnect'
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
                     logger_main.warning(
-                        "%s is invalid, Unknown Error, SFDC respond with status %s - %s", report.name, r.status, r.reason)
-                    report.valid = False
+                        '%s is invalid, Connection error: %s', report.name, repr(e))
+                    limiter.record_failure('connection error')
+                    failure = 'timeout' if isinstance(e, asyncio.TimeoutError) else 'connection_error'
+                finally:
+                    if self.metrics:
+                        self.metrics.inc('sfr_requests_in_flight', -1)
+
+            if auth_failure:
+                if await self._refresh_session(sid_generation, session) or self._session_expired:
+                    continue
+                logger_main.error("%s is invalid, request rejected although session is valid, no retries", report.name)
+                break
+
+            if not await self.retry_policy.backoff(report, retry_after):
+                break
+
+            if self.metrics:
+                self.metrics.inc('sfr_retries_total', status=failure)
+
+        return None
+
+    async def _request_sharded_report(self, report: ReportProtocol, session: aiohttp.ClientSession, *, enqueue: bool = True) -> None:
+        """Splits date range of the report into `ReportProtocol.shards` windows and requests them concurrently,
+        every shard goes through the concurrency limit and is retried independently. Once all shards are downloaded
+        the report is put to the queue together with its shards, which are merged by the worker.
+        If any of shards fails, the report is invalid and downloaded shards are discarded.
+        Report which can't be sharded (no date range in `pv1` and `pv2`) is requested as a whole.
+
+        :param report: Instance of `ReportProtocol`.
+        :type report: ReportProtocol
+        :param session: Shared session object.
+        :type session: aiohttp.ClientSession
+        :param enqueue: Flag, if False downloaded report is not put to the queue. Defaults to True.
+        :type enqueue: bool
+        """
+
+        try:
+            report.parts = create_shards(report)
+        except ValueError as e:
+            logger_main.warning("%s can't be sharded, requesting entire report -> %s", report.name, e)
+            report.shards = 1
+            return await self._request_report(report, session, enqueue=enqueue)
+
+        report.created_date = datetime.now()
+
+        logger_main.info("%s -> Requesting %s shards", report.name, len(report.parts))
+
+        await asyncio.gather(*(self._request_report(part, session, enqueue=False) for part in report.parts))
+
+        collect_shards(report)
+
+        if not report.valid:
+            logger_main.error("%s is invalid, %s of %s shards failed", report.name,
+                              sum(not part.valid for part in report.parts), len(report.parts))
+            for part in report.parts:
+                if part.spool_path:
+                    Path(part.spool_path).unlink(missing_ok=True)
+            report.parts = []
+            return None
+
+        if enqueue:
+            await self._enqueue_in_slot(report)
+            logger_main.debug('%s succesfuly downloaded in %s shards and put to the queue', report.name, len(report.parts))
+
+        return None
+
+    def _link_spool_file(self, spool_path: os.PathLike) -> Path:
+        """Creates another name of the spool file (hard link), so the spool file can be removed by every worker independently.
+        Spool file is copied if hard links are not supported.
+
+        :param spool_path: Path to the spool file.
+        :type spool_path: os.PathLike
+        :return: Path to the linked spool file.
+        :rtype: Path
+        """
+
+        spool_path = Path(spool_path)
+        link_path = spool_path.with_name(f'{spool_path.stem}-{uuid.uuid4().hex[:8]}{spool_path.suffix}')
+
+        try:
+            os.link(spool_path, link_path)
+        except OSError:
+            shutil.copyfile(spool_path, link_path)
+
+        return link_path
+
+    def _share_download(self, report: ReportProtocol, duplicate: ReportProtocol) -> None:
+        """Hands the response of downloaded report over to its duplicate. Response in memory is shared,
+        spool files (also of shards) are linked. Request stats stay with the downloaded report only.
+
+        :param report: Downloaded instance of `ReportProtocol`.
+        :type report: ReportProtocol
+        :param duplicate: Instance of `ReportProtocol` with the same request.
+        :type duplicate: ReportProtocol
+        """
+
+        duplicate.shared_from = report.name
+        duplicate.created_date = report.created_date
+        duplicate.concurrency_window = report.concurrency_window
+        duplicate.valid = report.valid
+
+        if not report.valid:
+            return None
+
+        duplicate.content_hash = report.content_hash
+        duplicate.response = report.response
+        duplicate.spool_path = self._link_spool_file(report.spool_path) if report.spool_path else None
+        duplicate.parts = [replace(part, spool_path=self._link_spool_file(part.spool_path) if part.spool_path else None)
+                           for part in report.parts]
+
+        return None
+
+    def _coalesce(self, reports: list[ReportProtocol]) -> list[list[ReportProtocol]]:
+        """Groups reports with identical request (domain, id, export params and shards), every group is downloaded once.
+        Order of the first reports of groups is kept.
+
+        :param reports: Collection of `ReportsProtocol' instances.
+        :type reports: list[ReportProtocol]
+        :return: Collection of groups of reports, the first report of the group is downloaded.
+        :rtype: list[list[ReportProtocol]]
+        """
+
+        groups: dict[tuple[str, int], list[ReportProtocol]] = {}
+
+        for report in reports:
+            groups.setdefault((self._parse_report_url(report), report.shards), []).append(report)
+
+        duplicates = len(reports) - len(groups)
+        if duplicates:
+            logger_main.info("%s duplicated requests served from shared downloads", duplicates)
+
+        return list(groups.values())
+
+    async def _request_shared_report(self, reports: list[ReportProtocol], session: aiohttp.ClientSession) -> None:
+        """Downloads the first report of the group of identical requests and fans its response out to the remaining ones,
+        every report of the group is put to the queue and saved by workers to its own destination.
+        Reports which failed to download never reach the workers, those are appended to the streamed summary here.
+
+        :param reports: Group of `ReportsProtocol' instances with the same request.
+        :type reports: list[ReportProtocol]
+        :param session: Shared session object.
+        :type session: aiohttp.ClientSession
+        """
+
+        report, *duplicates = reports
+        request = self._request_sharded_report if report.shards > 1 else self._request_report
+
+        if not duplicates:
+            await request(report, session)
+        else:
+            logger_main.debug("%s downloaded once for %s reports", report.name, len(reports))
+
+            await request(report, session, enqueue=False)
+
+            for duplicate in duplicates:
+                self._share_download(report, duplicate)
+
+            for shared in reports:
+                if shared.valid:
+                    await self._enqueue_in_slot(shared)
+
+        if not report.valid:
+            for failed in reports:
+                failed.finished = True
+                if self.metrics:
+                    self.metrics.inc('sfr_reports_total', result='failed')
+                if self.summary:
+                    await asyncio.to_thread(self.summary.record, failed)
+
         return None
 
     async def _toggle_progress_bar(self, tasks: list[asyncio.Task]) -> None:
@@ -270,8 +868,23 @@ class SfdcConnector():
         """
 
         if self.verbose:
+            from tqdm.asyncio import tqdm
+
             _ = [await task_ for task_ in tqdm.as_completed(tasks, total=len(tasks))]
 
+    def _schedule(self, reports: list[ReportProtocol]) -> list[ReportProtocol]:
+        """Orders reports longest expected download first, so the longest reports don't hold the run at the end.
+        Reports without history are scheduled first as their duration is unknown.
+
+        :param reports: Collection of `ReportsProtocol' instances.
+        :type reports: list[ReportProtocol]
+        :return: Ordered collection of `ReportsProtocol' instances.
+        :rtype: list[ReportProtocol]
+        """
+
+        logger_main.debug("Scheduling reports longest expected first")
+        return sorted(reports, key=lambda report: report.expected_duration or float('inf'), reverse=True)
+
     def _create_async_tasks(self, reports: list[ReportProtocol], session: aiohttp.ClientSession) -> list[asyncio.Task]:
         """Creates collection of asynchronous request tasks. 
 
@@ -284,7 +897,8 @@ class SfdcConnector():
         """
 
         logger_main.debug("Creating tasks for asynchronous processing")
-        return [asyncio.create_task(self._request_report(report, session)) for report in reports]
+        return [asyncio.create_task(self._request_shared_report(group, session))
+                for group in self._coalesce(self._schedule(reports))]
 
     async def _report_request_all(self, reports: list[ReportProtocol], session: aiohttp.ClientSession) -> None:
         """Orchestrates entire process of processing tasks.
@@ -303,6 +917,57 @@ class SfdcConnector():
 
         return None
 
+    async def request_reports(self, reports: list[ReportProtocol], session: aiohttp.ClientSession) -> None:
+        """Requests reports within already open session without progress bar, e.g. reports due in daemon mode.
+        Identical requests are coalesced and reports are ordered the same way as in a single run.
+
+        :param reports: Collection of `ReportProtocol` instances.
+        :type reports: list[ReportProtocol]
+        :param session: Shared asyncio session.
+        :type session: aiohttp.ClientSession
+        """
+
+        await asyncio.gather(*self._create_async_tasks(reports, session))
+
+        return None
+
+    async def reconnect(self, session: aiohttp.ClientSession) -> bool:
+        """Checks connection once again if the session has expired and SID hasn't been refreshed,
+        so the daemon requests following reports with new SID once the user logs in. Session is marked as expired until it succeeds.
+
+        :param session: Shared session object.
+        :type session: aiohttp.ClientSession
+        :return: Flag, True if connection is established, False otherwise.
+        :rtype: bool
+        """
+
+        if not self._session_expired:
+            return True
+
+        logger_main.warning('Session expired in previous requests, checking connection once again')
+        self.sid = ""
+        self._session_expired = not await self.check_connection(session)
+
+        return not self._session_expired
+
+    def open_session(self) -> aiohttp.ClientSession:
+        """Creates session shared by all requests, with connection pool limited to `concurrency`.
+        Has to be called within running event loop.
+
+        :return: Shared asyncio session, used as asynchronous context manager.
+        :rtype: aiohttp.ClientSession
+        """
+
+        self._session_ready = asyncio.Event()
+        self._session_ready.set()
+        self._refresh_lock = asyncio.Lock()
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        tcp_connector = aiohttp.TCPConnector(limit=self.concurrency,
+                                             limit_per_host=self.concurrency)
+
+        return aiohttp.ClientSession(timeout=timeout, connector=tcp_connector)
+
     async def handle_requests(self, reports: list[ReportProtocol]) -> None:
         """Creates session and process asynchronous tasks.
 
@@ -311,8 +976,15 @@ class SfdcConnector():
         """
 
         logger_main.debug("Awaiting responses")
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+
+        async with self.open_session() as session:
+            if not await self.check_connection(session):
+                logger_main.critical('Connection with %s not established, no reports requested', self.domain)
+                return None
+
             await self._report_request_all(reports, session)
 
+        logger_main.info("Retries: %s, time spent on backing off: %.2f s",
+                         self.retry_policy.retries, self.retry_policy.backoff_time)
+
         return None
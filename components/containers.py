@@ -1,11 +1,20 @@
 import csv
+import json
 import logging
 
 from dataclasses import dataclass, field
 from os import PathLike
-from typing import Any, Generator, Protocol, runtime_checkable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Generator, Protocol, runtime_checkable
 from datetime import datetime, timedelta
-from pandas import DataFrame
+
+from components.history import HistoryProtocol
+from components.limiters import WindowAdjustment
+from components.metrics import MetricsProtocol
+from components.profiles import run_profile
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 logger_main = logging.getLogger(__name__)
@@ -26,6 +35,12 @@ class ReportProtocol(Protocol):
     :type path: PathLike
     :param export_params: Default parameters required by SFDC. Defaults to '?export=csv&enc=UTF-8&isdtp=p1'.
     :type export_params: str
+    :param output_format: Format of saved file, allowed options ['csv', 'csv.gz', 'parquet', 'feather']
+    :type output_format: str
+    :param shards: Number of date windows the range given in `pv1` and `pv2` export parameters is split into, every window is requested separately
+    :type shards: int
+    :param interval: Interval in minutes between runs of the report in daemon mode, 0.0 means default interval of the daemon
+    :type interval: float
     :param downloaded: Flag indicating whether the reports has been succesfully downloaded or not
     :type downloaded: bool
     :param valid: Flag indicating whether the response has been succesfully retrieved or not
@@ -38,12 +53,44 @@ class ReportProtocol(Protocol):
     :type pull_date: timedelta
     :param attempt_count: Number of attempts to process the report 
     :type attempt_count: int
-    :param size: Size of saved report file in Mb
+    :param concurrency_window: Concurrency window of the domain at the time of the last request
+    :type concurrency_window: int
+    :param retry_count: Number of retries of the request
+    :type retry_count: int
+    :param backoff_time: Time spent on backing off before retries in seconds
+    :type backoff_time: float
+    :param queue_depth: Number of items in the queue at the time the report was put to the queue
+    :type queue_depth: int
+    :param queue_wait: Time spent on waiting for free space in the queue in seconds
+    :type queue_wait: float
+    :param size: Size of saved report file on disk in Mb
     :type size: float
     :param response: Container for request response
     :type response: str
-    :param content: Pandas DataFrame based on response
-    :type content: DataFrame
+    :param spool_path: Path to spool file with streamed response, used instead of `response` in streaming mode
+    :type spool_path: PathLike | None
+    :param parts: Downloaded shards of the report waiting to be merged by the worker
+    :type parts: list[ReportProtocol]
+    :param resumed: Flag indicating whether the report has been finished in the previous run
+    :type resumed: bool
+    :param bytes_transferred: Size of the response body in bytes
+    :type bytes_transferred: int
+    :param expected_duration: Expected download time in seconds based on history of past runs, 0.0 if unknown
+    :type expected_duration: float
+    :param timeout: Timeout of the request in seconds based on history of past runs, 0.0 if unknown
+    :type timeout: float
+    :param content_hash: SHA-256 hash of the response without the footer, computed in skip-unchanged mode only
+    :type content_hash: str
+    :param unchanged: Flag indicating whether the content is the same as in the previous run and the file has been left alone
+    :type unchanged: bool
+    :param shared_from: Name of the report whose download served this report, empty if the report has been downloaded on its own
+    :type shared_from: str
+    :param finished: Flag indicating whether the report has been handled by the worker or has failed to download
+    :type finished: bool
+    :param timings: Timestamps of processing stages of the report
+    :type timings: ReportTimings
+    :param content: Pandas DataFrame based on response, None if content is not read
+    :type content: DataFrame | None
     """
 
     type: str
@@ -51,15 +98,56 @@ class ReportProtocol(Protocol):
     id: str
     path: PathLike
     export_params: str
+    output_format: str
+    shards: int
+    interval: float
     downloaded: bool
     valid: bool
     created_date: datetime
     pull_date: datetime
     processing_time: timedelta
     attempt_count: int
+    concurrency_window: int
+    retry_count: int
+    backoff_time: float
+    queue_depth: int
+    queue_wait: float
     size: float
     response: str
-    content: DataFrame
+    spool_path: PathLike | None
+    parts: list['ReportProtocol']
+    resumed: bool
+    bytes_transferred: int
+    expected_duration: float
+    timeout: float
+    content_hash: str
+    unchanged: bool
+    shared_from: str
+    finished: bool
+    timings: 'ReportTimings'
+    content: 'DataFrame | None'
+
+
+SUMMARY_HEADER = ['file_name', 'report_id', 'type', 'output_format', 'shards', 'valid', 'created_date',
+                  'pull_date', 'processing_time', 'attempt_count', 'concurrency_window',
+                  'retry_count', 'backoff_time', 'queue_depth', 'queue_wait', 'resumed', 'unchanged', 'shared_from',
+                  'expected_duration', 'timeout', 'bytes_transferred', 'file_size']
+
+
+def summary_row(report: ReportProtocol) -> list[Any]:
+    """Returns details of the report in the order of `SUMMARY_HEADER`.
+
+    :param report: Instance of the ReportProtocol object.
+    :type report: ReportProtocol
+    :return: Row of the summary report.
+    :rtype: list[Any]
+    """
+
+    return [report.name, report.id, report.type, report.output_format, report.shards, report.valid, report.created_date,
+            report.pull_date, report.processing_time, report.attempt_count, report.concurrency_window,
+            report.retry_count, round(report.backoff_time, 2), report.queue_depth,
+            round(report.queue_wait, 2), report.resumed, report.unchanged, report.shared_from, round(report.expected_duration, 2),
+            round(report.timeout, 2), report.bytes_transferred, report.size]
 
 
 @runtime_checkable
@@ -80,12 +168,92 @@ class ReportsContainerProtocol(Protocol):
         """
         ...
 
+    def create_report(self, report_params: dict[str, Any]) -> ReportProtocol:
+        """Creates single report object.
+
+        :param report_params: Parameters of the report.
+        :type report_params: dict[str, Any]
+        :return: Report
+        :rtype: ReportProtocol
+        """
+        ...
+
+    def pending_reports(self, manifest: Any) -> list[ReportProtocol]:
+        """Restores reports finished in the previous run and returns the remaining ones.
+
+        :param manifest: Run manifest of the previous run.
+        :type manifest: ManifestProtocol
+        :return: Collection of Reports to be downloaded
+        :rtype: list[ReportProtocol]
+        """
+        ...
+
+    def update_history(self, reports: list[ReportProtocol] | None = None) -> None:
+        """Records durations and sizes of reports downloaded in the run in history of past runs.
+
+        :param reports: Collection of Reports, all reports of the container if not given. Defaults to None.
+        :type reports: list[ReportProtocol] | None
+        """
+        ...
+
     def create_summary_report(self) -> None:
         """Creates summary report which consist of all important details regarding Report objects. 
         Summary report is generated once all the reports are completed.
         """
         ...
 
+    def create_profile_report(self) -> None:
+        """Creates JSON profile of the run with aggregated durations of processing stages.
+        """
+        ...
+
+    def update_metrics(self, metrics: MetricsProtocol, reports: list[ReportProtocol] | None = None) -> None:
+        """Records duration, size and result of every report in metrics of the run.
+
+        :param metrics: Metrics of the run.
+        :type metrics: MetricsProtocol
+        :param reports: Collection of Reports, all reports of the container if not given. Defaults to None.
+        :type reports: list[ReportProtocol] | None
+        """
+        ...
+
+    def create_concurrency_report(self, adjustments: list[WindowAdjustment]) -> None:
+        """Creates report of concurrency window adjustments made during the session.
+
+        :param adjustments: Collection of window adjustments.
+        :type adjustments: list[WindowAdjustment]
+        """
+        ...
+
+
+@dataclass(slots=True)
+class ReportTimings():
+    """Concrete class representing timestamps of processing stages of the report. Request stages describe the last attempt.
+
+    :param request_sent: Request sent, slot of the concurrency window acquired. Defaults to None.
+    :type request_sent: datetime | None
+    :param first_byte: Response headers received. Defaults to None.
+    :type first_byte: datetime | None
+    :param body_complete: Entire body of the response received. Defaults to None.
+    :type body_complete: datetime | None
+    :param enqueued: Report put to the queue. Defaults to None.
+    :type enqueued: datetime | None
+    :param dequeued: Report taken from the queue by the worker. Defaults to None.
+    :type dequeued: datetime | None
+    :param parsed: Content parsed by Pandas, empty if content is parsed and written together (passthrough, chunks). Defaults to None.
+    :type parsed: datetime | None
+    :param written: File written. Defaults to None.
+    :type written: datetime | None
+    """
+
+    request_sent: datetime | None = None
+    first_byte: datetime | None = None
+    body_complete: datetime | None = None
+    enqueued: datetime | None = None
+    dequeued: datetime | None = None
+    parsed: datetime | None = None
+    written: datetime | None = None
+
 
 @dataclass(slots=True)
 class SfdcReport():
@@ -101,6 +269,12 @@ class SfdcReport():
     :type path: PathLike
     :param export_params: Default parameters required by SFDC. Defaults to '?export=csv&enc=UTF-8&isdtp=p1'.
     :type export_params: str
+    :param output_format: Format of saved file, allowed options ['csv', 'csv.gz', 'parquet', 'feather']. Defaults to 'csv'.
+    :type output_format: str
+    :param shards: Number of date windows the range given in `pv1` and `pv2` export parameters is split into, every window is requested separately. Defaults to 1.
+    :type shards: int
+    :param interval: Interval in minutes between runs of the report in daemon mode, 0.0 means default interval of the daemon. Defaults to 0.0 .
+    :type interval: float
     :param downloaded: Flag indicating whether the reports has been succesfully downloaded or not. Defaults to False.
     :type downloaded: bool
     :param valid: Flag indicating whether the response has been succesfully retrieved or not. Defaults to False.
@@ -113,12 +287,44 @@ class SfdcReport():
     :type pull_date: timedelta
     :param attempt_count: Number of attempts to process the report. Defaults to 0 .
     :type attempt_count: int
-    :param size: Size of saved report file in Mb. Defaults to 0.0 .
+    :param concurrency_window: Concurrency window of the domain at the time of the last request. Defaults to 0 .
+    :type concurrency_window: int
+    :param retry_count: Number of retries of the request. Defaults to 0 .
+    :type retry_count: int
+    :param backoff_time: Time spent on backing off before retries in seconds. Defaults to 0.0 .
+    :type backoff_time: float
+    :param queue_depth: Number of items in the queue at the time the report was put to the queue. Defaults to 0 .
+    :type queue_depth: int
+    :param queue_wait: Time spent on waiting for free space in the queue in seconds. Defaults to 0.0 .
+    :type queue_wait: float
+    :param size: Size of saved report file on disk in Mb. Defaults to 0.0 .
     :type size: float
     :param response: Container for request response. Defaults to empty string.
     :type response: str
-    :param content: Pandas DataFrame based on response. Defaults to empty Pandas DataFrame.
-    :type content: DataFrame
+    :param spool_path: Path to spool file with streamed response, used instead of `response` in streaming mode. Defaults to None.
+    :type spool_path: PathLike | None
+    :param parts: Downloaded shards of the report waiting to be merged by the worker. Defaults to empty list.
+    :type parts: list[SfdcReport]
+    :param resumed: Flag indicating whether the report has been finished in the previous run. Defaults to False.
+    :type resumed: bool
+    :param bytes_transferred: Size of the response body in bytes. Defaults to 0 .
+    :type bytes_transferred: int
+    :param expected_duration: Expected download time in seconds based on history of past runs, 0.0 if unknown. Defaults to 0.0 .
+    :type expected_duration: float
+    :param timeout: Timeout of the request in seconds based on history of past runs, 0.0 if unknown. Defaults to 0.0 .
+    :type timeout: float
+    :param content_hash: SHA-256 hash of the response without the footer, computed in skip-unchanged mode only. Defaults to empty string.
+    :type content_hash: str
+    :param unchanged: Flag indicating whether the content is the same as in the previous run and the file has been left alone. Defaults to False.
+    :type unchanged: bool
+    :param shared_from: Name of the report whose download served this report, empty if the report has been downloaded on its own. Defaults to empty string.
+    :type shared_from: str
+    :param finished: Flag indicating whether the report has been handled by the worker or has failed to download. Defaults to False.
+    :type finished: bool
+    :param timings: Timestamps of processing stages of the report. Defaults to empty ReportTimings.
+    :type timings: ReportTimings
+    :param content: Pandas DataFrame based on response, None if content is not read. Defaults to None.
+    :type content: DataFrame | None
     """
 
     type: str
@@ -126,15 +332,34 @@ class SfdcReport():
     id: str
     path: PathLike
     export_params: str = '?export=csv&enc=UTF-8&isdtp=p1'
+    output_format: str = 'csv'
+    shards: int = 1
+    interval: float = 0.0
     downloaded: bool = False
     valid: bool = False
     created_date: datetime = datetime.now()
     pull_date: datetime = datetime.now()
     processing_time: timedelta = timedelta(microseconds=0)
     attempt_count: int = 0
+    concurrency_window: int = 0
+    retry_count: int = 0
+    backoff_time: float = 0.0
+    queue_depth: int = 0
+    queue_wait: float = 0.0
     size: float = 0.0
     response: str = ""
-    content: DataFrame = field(default_factory=DataFrame)
+    spool_path: PathLike | None = None
+    parts: list['SfdcReport'] = field(default_factory=list)
+    resumed: bool = False
+    bytes_transferred: int = 0
+    expected_duration: float = 0.0
+    timeout: float = 0.0
+    content_hash: str = ""
+    unchanged: bool = False
+    shared_from: str = ""
+    finished: bool = False
+    timings: ReportTimings = field(default_factory=ReportTimings)
+    content: 'DataFrame | None' = None
 
 
 class ReportsContainer():
@@ -143,12 +368,22 @@ class ReportsContainer():
 
     def __init__(self,
                  reports_params_list: list[dict[str, Any]],
-                 summary_report_path: PathLike):
+                 summary_report_path: PathLike,
+                 *,
+                 history: HistoryProtocol | None = None):
         """Constructor method for ReportContainer, automatically creates reports after initialization
+
+        :param reports_params_list: Collection of dicts with parameters for object crafting.
+        :type reports_params_list: list[dict[str, Any]]
+        :param summary_report_path: Path to save location of summary report.
+        :type summary_report_path: PathLike
+        :param history: History of past runs, expected durations and timeouts of reports are taken from it. Defaults to None.
+        :type history: HistoryProtocol | None
         """
 
         self.reports_params_list: list[dict[str, Any]] = reports_params_list
         self.summary_report_path: PathLike = summary_report_path
+        self.history: HistoryProtocol | None = history
         self.reports_list: list[ReportProtocol]
 
         self.create_reports()
@@ -177,8 +412,77 @@ class ReportsContainer():
         logger_main.debug("Creating all report objects")
         self.reports_list = list(self._create_sfdc_reports())
 
+        if self.history:
+            self._apply_history(self.reports_list)
+
         return self.reports_list
 
+    def create_report(self, report_params: dict[str, Any]) -> ReportProtocol:
+        """Creates single, fresh report object outside of `reports_list`, e.g. next run of the report in daemon mode.
+        History of past runs is applied to it as well.
+
+        :param report_params: Parameters of the report.
+        :type report_params: dict[str, Any]
+        :return: Report
+        :rtype: SfdcReport
+        """
+
+        report = SfdcReport(**report_params)
+
+        if self.history:
+            self._apply_history([report])
+
+        return report
+
+    def _apply_history(self, reports: list[ReportProtocol]) -> None:
+        """Sets expected duration and timeout of every report based on history of past runs.
+
+        :param reports: Collection of Reports.
+        :type reports: list[ReportProtocol]
+        """
+
+        logger_main.debug("Applying history of past runs")
+
+        for report in reports:
+            report.expected_duration = self.history.expected_duration(report.id)
+            report.timeout = self.history.timeout(report.id)
+
+        return None
+
+    def update_history(self, reports: list[ReportProtocol] | None = None) -> None:
+        """Records durations and sizes of reports downloaded in the run in history of past runs.
+
+        :param reports: Collection of Reports, all reports of the container if not given. Defaults to None.
+        :type reports: list[ReportProtocol] | None
+        """
+
+        if self.history:
+            self.history.record(self.reports_list if reports is None else reports)
+
+        return None
+
+    def pending_reports(self, manifest: Any) -> list[ReportProtocol]:
+        """Restores reports finished and verified in the previous run, those are skipped in current run.
+
+        :param manifest: Run manifest of the previous run.
+        :type manifest: ManifestProtocol
+        :return: Collection of Reports to be downloaded
+        :rtype: list[ReportProtocol]
+        """
+
+        pending = []
+
+        for report in self.reports_list:
+            if manifest.is_finished(report):
+                logger_main.info("%s finished in previous run, skipping", report.name)
+                manifest.restore(report)
+            else:
+                pending.append(report)
+
+        logger_main.info("%s of %s reports pending", len(pending), len(self.reports_list))
+
+        return pending
+
     def create_summary_report(self) -> None:
         """Creates summary report which consist of all important details regarding reports. 
         Report is generated once all the reports are completed.
@@ -187,16 +491,80 @@ class ReportsContainer():
         logger_main.debug("Creating summary report, saved in %s",
                           self.summary_report_path)
 
-        header = ['file_name', 'report_id', 'type', 'valid', 'created_date',
-                  'pull_date', 'processing_time', 'attempt_count', 'file_size']
-
         with open(self.summary_report_path, 'w', encoding='UTF8', newline='') as f:
             writer = csv.writer(f)
 
-            writer.writerow(header)
+            writer.writerow(SUMMARY_HEADER)
 
             for report in self.reports_list:
-                writer.writerow([report.name, report.id, report.type, report.valid, report.created_date,
-                                report.pull_date, report.processing_time, report.attempt_count, report.size])
+                writer.writerow(summary_row(report))
+
+        return None
+
+    def update_metrics(self, metrics: MetricsProtocol, reports: list[ReportProtocol] | None = None) -> None:
+        """Records duration, size of saved file and result of every report in metrics of the run, labelled with name and id of the report,
+        if series of every report are enabled in metrics (`per_report`).
+        Reports finished in the previous run are counted as `resumed`, as they never reach the workers.
+
+        :param metrics: Metrics of the run.
+        :type metrics: MetricsProtocol
+        :param reports: Collection of Reports, all reports of the container if not given. Defaults to None.
+        :type reports: list[ReportProtocol] | None
+        """
+
+        for report in self.reports_list if reports is None else reports:
+            if metrics.per_report:
+                labels = {'report': report.name, 'id': report.id}
+
+                metrics.set('sfr_report_last_duration_seconds', report.processing_time.total_seconds(), **labels)
+                metrics.set('sfr_report_last_size_bytes', round(report.size * 1024 * 1024), **labels)
+                metrics.set('sfr_report_last_valid', int(report.valid and report.downloaded), **labels)
+
+            if report.resumed:
+                metrics.inc('sfr_reports_total', result='resumed')
+
+        return None
+
+    def create_concurrency_report(self, adjustments: list[WindowAdjustment]) -> None:
+        """Creates report of concurrency window adjustments made during the session, saved next to summary report
+        with `_concurrency` suffix.
+
+        :param adjustments: Collection of window adjustments.
+        :type adjustments: list[WindowAdjustment]
+        """
+
+        concurrency_report_path = Path(self.summary_report_path).with_name(
+            f'{Path(self.summary_report_path).stem}_concurrency.csv')
+
+        logger_main.debug("Creating concurrency report, saved in %s",
+                          concurrency_report_path)
+
+        header = ['date', 'domain', 'old_window', 'new_window', 'reason']
+
+        with open(concurrency_report_path, 'w', encoding='UTF8', newline='') as f:
+            writer = csv.writer(f)
+
+            writer.writerow(header)
+
+            for adjustment in adjustments:
+                writer.writerow([adjustment.date, adjustment.domain, adjustment.old_window,
+                                adjustment.new_window, adjustment.reason])
+
+        return None
+
+    def create_profile_report(self) -> None:
+        """Creates JSON profile of the run, saved next to summary report with `_profile` suffix.
+        Profile consist of totals, aggregated durations of processing stages and response sizes (percentiles and histograms)
+        and timestamps of stages of every report.
+        """
+
+        profile_report_path = Path(self.summary_report_path).with_name(
+            f'{Path(self.summary_report_path).stem}_profile.json')
+
+        logger_main.debug("Creating profile report, saved in %s",
+                          profile_report_path)
+
+        with open(profile_report_path, 'w', encoding='UTF8') as f:
+            json.dump(run_profile(self.reports_list), f, indent=2)
 
         return None
@@ -1,15 +1,29 @@
 import os
 import logging
-import pandas as pd
+import tempfile
 
+from logging.handlers import QueueListener
 from queue import Queue
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import get_context
 from datetime import datetime
+from time import monotonic
 from io import StringIO
 from threading import Thread, current_thread, active_count
 from typing import NoReturn, Protocol, runtime_checkable
 
 from components.containers import ReportProtocol
+from components.history import HistoryProtocol
+from components.loggers import pool_logger_configurer, pool_logger_listener
+from components.manifests import ManifestProtocol
+from components.metrics import MetricsProtocol
+from components.profilers import ProfilerProtocol
+from components.summaries import SummaryProtocol
+from components.processors import (FOOTER_ROWS, PASSTHROUGH_FORMATS, WRITE_ERRORS, file_size, merge_exports,
+                                   passthrough_content, process_spool_file, read_content, report_file_path, save_content,
+                                   save_content_chunks)
 
 
 logger_main = logging.getLogger(__name__)
@@ -33,6 +47,11 @@ class WorkerFactoryProtocol(Protocol):
         """
         ...
 
+    def shutdown(self) -> None:
+        """Releases resources held by workers.
+        """
+        ...
+
     @staticmethod
     def active_workers() -> int:
         """Counts active works in current time.
@@ -51,11 +70,13 @@ class WorkerProtocol(Protocol):
     :type queue: Queue
     """
 
-    def _read_stream(self, report: ReportProtocol) -> None:
+    def _read_stream(self, report: ReportProtocol) -> bool:
         """Reads the stream of data kept in Report object via Pandas read method. Deletes response content from the object.
 
         :param report: Instance of the ReportProtocol object.
         :type report: ReportProtocol
+        :return: Flag, True if content has been read, False otherwise.
+        :rtype: bool
         """
         ...
 
@@ -99,32 +120,97 @@ class WorkerFactory:
     def __init__(self,
                  queue: Queue,
                  *,
-                 threads: int = 1):
+                 threads: int = 1,
+                 backend: str = 'thread',
+                 passthrough: bool = False,
+                 chunk_rows: int = 0,
+                 manifest: ManifestProtocol | None = None,
+                 history: HistoryProtocol | None = None,
+                 summary: SummaryProtocol | None = None,
+                 metrics: MetricsProtocol | None = None,
+                 profiler: ProfilerProtocol | None = None,
+                 fsync: str = 'file'):
         """Constructor method for WorkerFactory, automatically creates and deploys workers after initialization.
 
         :param queue: Shared, thread-safe queue.
         :type queue: Queue
         :param threads: Number of threads, equal to number of Workers to be deployed. Defaults to 1.
         :type threads: int
+        :param backend: Processing backend, `thread` processes reports within worker threads, `process` hands spool files
+        over to the pool of processes of the same size to escape the GIL. Defaults to 'thread'.
+        :type backend: str
+        :param passthrough: Flag, if True CSV reports (also gzipped) are copied without parsing, footer is removed at byte level. Defaults to False.
+        :type passthrough: bool
+        :param chunk_rows: Number of rows in a single chunk processed by Pandas, 0 means entire report is read at once. Defaults to 0.
+        :type chunk_rows: int
+        :param manifest: Run manifest, finished reports are recorded in it. Defaults to None.
+        :type manifest: ManifestProtocol | None
+        :param history: History of past runs, if given reports with content unchanged since the previous run are not saved again. Defaults to None.
+        :type history: HistoryProtocol | None
+        :param summary: Summary report streamed during the run, processed reports are appended to it. Defaults to None.
+        :type summary: SummaryProtocol | None
+        :param metrics: Metrics of the run, busy time of workers and results, durations and sizes of reports are recorded in it. Defaults to None.
+        :type metrics: MetricsProtocol | None
+        :param profiler: Profiler of the run, CPU profile of every worker and memory at parse and write stages are collected. Defaults to None.
+        :type profiler: ProfilerProtocol | None
+        :param fsync: Fsync policy of written files -> [none | file | full]. Defaults to 'file'.
+        :type fsync: str
         """
 
         self.queue: Queue = queue
         self.threads: int = threads
+        self.backend: str = backend
+        self.passthrough: bool = passthrough
+        self.chunk_rows: int = chunk_rows
+        self.manifest: ManifestProtocol | None = manifest
+        self.history: HistoryProtocol | None = history
+        self.summary: SummaryProtocol | None = summary
+        self.metrics: MetricsProtocol | None = metrics
+        self.profiler: ProfilerProtocol | None = profiler
+        self.fsync: str = fsync
+        self.executor: ProcessPoolExecutor | None = None
+        self._log_listener: QueueListener | None = None
 
         self.create_workers()
 
     def create_workers(self) -> None:
-        """Deploys given number of workers.
+        """Deploys given number of workers. In `process` backend creates shared pool of processes,
+        records logged in the processes are forwarded to loggers of the main process.
         """
 
+        if self.backend == 'process':
+            logger_main.debug('Creating pool of %s processes', self.threads)
+            context = get_context('spawn')
+            self._log_listener = pool_logger_listener(context)
+            self.executor = ProcessPoolExecutor(max_workers=self.threads, mp_context=context,
+                                                initializer=pool_logger_configurer,
+                                                initargs=(self._log_listener.queue, logging.getLogger().level))
+
         for num in range(self.threads):
-            worker = Worker(self.queue)
+            worker = PoolWorker(self.queue, self.executor, passthrough=self.passthrough, chunk_rows=self.chunk_rows,
+                                manifest=self.manifest, history=self.history, summary=self.summary,
+                                metrics=self.metrics, profiler=self.profiler, fsync=self.fsync) if self.executor else Worker(
+                self.queue, passthrough=self.passthrough, chunk_rows=self.chunk_rows, manifest=self.manifest,
+                history=self.history, summary=self.summary, metrics=self.metrics, profiler=self.profiler, fsync=self.fsync)
             worker.name = f'Slave-{num}'
             worker.daemon = True
             worker.start()
 
         return None
 
+    def shutdown(self) -> None:
+        """Shuts down pool of processes and forwarding of its records if present.
+        """
+
+        if self.executor:
+            logger_main.debug('Shutting down pool of processes')
+            self.executor.shutdown()
+
+        if self._log_listener:
+            self._log_listener.stop()
+
+        return None
+
     @staticmethod
     def active_workers() -> int:
         """Returns number of currently active workers.
@@ -139,40 +225,80 @@ class Worker(Thread):
     """Concrete class representing Worker object.
     """
 
-    def __init__(self, queue: Queue):
+    def __init__(self,
+                 queue: Queue,
+                 *,
+                 passthrough: bool = False,
+                 chunk_rows: int = 0,
+                 manifest: ManifestProtocol | None = None,
+                 history: HistoryProtocol | None = None,
+                 summary: SummaryProtocol | None = None,
+                 metrics: MetricsProtocol | None = None,
+                 profiler: ProfilerProtocol | None = None,
+                 fsync: str = 'file'):
         """Constructor method for Worker.
 
         :param queue: Shared, thread-safe queue.
         :type queue: Queue
+        :param passthrough: Flag, if True CSV reports (also gzipped) are copied without parsing, footer is removed at byte level. Defaults to False.
+        :type passthrough: bool
+        :param chunk_rows: Number of rows in a single chunk processed by Pandas, 0 means entire report is read at once. Defaults to 0.
+        :type chunk_rows: int
+        :param manifest: Run manifest, finished reports are recorded in it. Defaults to None.
+        :type manifest: ManifestProtocol | None
+        :param history: History of past runs, if given reports with content unchanged since the previous run are not saved again. Defaults to None.
+        :type history: HistoryProtocol | None
+        :param summary: Summary report streamed during the run, processed reports are appended to it. Defaults to None.
+        :type summary: SummaryProtocol | None
+        :param metrics: Metrics of the run, busy time of workers and results, durations and sizes of reports are recorded in it. Defaults to None.
+        :type metrics: MetricsProtocol | None
+        :param profiler: Profiler of the run, CPU profile of every worker and memory at parse and write stages are collected. Defaults to None.
+        :type profiler: ProfilerProtocol | None
+        :param fsync: Fsync policy of written files -> [none | file | full]. Defaults to 'file'.
+        :type fsync: str
         """
 
         Thread.__init__(self)
         self.queue = queue
-
-    def _read_stream(self, report: ReportProtocol) -> None:
-        """Reads report's response and save it as `content` atribute. Erases saved response. 
+        self.passthrough = passthrough
+        self.chunk_rows = chunk_rows
+        self.manifest = manifest
+        self.history = history
+        self.summary = summary
+        self.metrics = metrics
+        self.profiler = profiler
+        self.fsync = fsync
+
+    def _read_stream(self, report: ReportProtocol) -> bool:
+        """Reads report's response or spool file in streaming mode and save it as `content` atribute. Erases saved response. 
 
         :param report: Instance of the ReportProtocol object.
         :type report: ReportProtocol
+        :return: Flag, True if content has been read, False otherwise.
+        :rtype: bool
         """
 
+        import pandas as pd
+
         logger_main.debug('Reading content of %s', report.name)
 
+        source = report.spool_path if report.spool_path else StringIO(
+            report.response)
+
         try:
-            report.content = pd.read_csv(StringIO(report.response),
-                                         dtype='string',
-                                         low_memory=False)
-        except pd.errors.EmptyDataError as e:
-            logger_main.warning('%s timeouted, attmpts: %s',
-                                report.name, report.attempt_count)
+            logger_main.debug(
+                'Removing last %s lines, footer of %s', FOOTER_ROWS, report.name)
+            report.content = read_content(source)
+            report.timings.parsed = datetime.now()
+        except (pd.errors.EmptyDataError, pd.errors.ParserError) as e:
+            logger_main.warning('%s can\'t be read, attempts: %s -> %s',
+                                report.name, report.attempt_count, e)
             report.downloaded = False
+            return False
         finally:
             report.response = ''
-            logger_main.debug(
-                'Removing last 5 lines, footer of %s', report.name)
-            report.content = report.content.head(report.content.shape[0] - 5)
 
-        return None
+        return True
 
     def _parse_save_path(self, report: ReportProtocol) -> os.PathLike:
         """Parses path to save location.
@@ -182,10 +308,10 @@ class Worker(Thread):
         :return: Path to save location
         :rtype: os.PathLike
         """
-        return Path(f'{"/".join([str(report.path), report.name])}.csv')
+        return report_file_path(report)
 
     def _save_to_csv(self, report: ReportProtocol) -> None:
-        """Saves report content to CSV file. Sets object flags.
+        """Saves report content to the file in report's output format. Sets object flags.
 
         :param report: Instance of the ReportProtocol object.
         :type report: ReportProtocol
@@ -199,36 +325,204 @@ class Worker(Thread):
                           current_thread().name, report.name, file_path)
 
         try:
-            report.content.to_csv(file_path,
-                                  index=False)
-        except pd.errors.ParserError as e:
-            logger_main.warning('%s unexpected end of stream: %s',
-                                report.name, report.attempt_count)
-            report.downloaded = False
-        finally:
+            report.size = save_content(
+                report.content, file_path, report.output_format, self.fsync)
+            report.downloaded = True
             logger_main.debug('%s saved %s -> %s',
                               current_thread().name, report.name, file_path)
+        except WRITE_ERRORS as e:
+            logger_main.warning('%s not saved, %r', report.name, e)
+            report.downloaded = False
+        finally:
+            report.pull_date = report.timings.written = datetime.now()
+            report.processing_time = report.pull_date - report.created_date
+
+        if report.downloaded:
+            logger_main.debug('%s succesfully saved by %s at %s, operation took: %s, file size: %s',
+                              report.name, current_thread().name, report.pull_date, report.processing_time, report.size)
+
+        return None
+
+    def _passthrough(self, report: ReportProtocol) -> None:
+        """Copies raw response or spool file to CSV (optionally gzipped) file without Pandas, footer is removed at byte level. Sets object flags.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+
+        file_path = self._parse_save_path(report)
+
+        logger_main.debug('%s is passing %s through -> %s',
+                          current_thread().name, report.name, file_path)
+
+        source = report.spool_path if report.spool_path else report.response.encode('UTF-8')
+        report.response = ''
+
+        try:
+            report.size = passthrough_content(
+                source, file_path, report.output_format, fsync=self.fsync)
             report.downloaded = True
+        except OSError as e:
+            logger_main.warning('%s not saved, %s', report.name, e)
+            report.downloaded = False
 
-            report.pull_date = datetime.now()
-            report.size = round(
-                (os.stat(file_path).st_size / (1024 * 1024)), 1)
-            report.processing_time = report.pull_date - report.created_date
+        report.pull_date = report.timings.written = datetime.now()
+        report.processing_time = report.pull_date - report.created_date
+
+        if report.downloaded:
+            logger_main.debug('%s succesfully saved by %s at %s, operation took: %s, file size: %s',
+                              report.name, current_thread().name, report.pull_date, report.processing_time, report.size)
+
+        return None
+
+    def _save_in_chunks(self, report: ReportProtocol) -> None:
+        """Reads report's response or spool file in chunks of `chunk_rows` rows and appends them to the file,
+        content of the report is never kept in memory entirely. Sets object flags.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+
+        import pandas as pd
 
+        file_path = self._parse_save_path(report)
+
+        logger_main.debug('%s is saving %s in chunks of %s rows -> %s',
+                          current_thread().name, report.name, self.chunk_rows, file_path)
+
+        source = report.spool_path if report.spool_path else StringIO(
+            report.response)
+
+        try:
+            report.size = save_content_chunks(
+                source, file_path, report.output_format, self.chunk_rows, self.fsync)
+            report.downloaded = True
+        except (pd.errors.EmptyDataError, pd.errors.ParserError, *WRITE_ERRORS) as e:
+            logger_main.warning('%s not saved, attempts: %s -> %r',
+                                report.name, report.attempt_count, e)
+            report.downloaded = False
+        finally:
+            report.response = ''
+
+        report.pull_date = report.timings.written = datetime.now()
+        report.processing_time = report.pull_date - report.created_date
+
+        if report.downloaded:
             logger_main.debug('%s succesfully saved by %s at %s, operation took: %s, file size: %s',
                               report.name, current_thread().name, report.pull_date, report.processing_time, report.size)
 
         return None
 
     def _erase_report(self, report: ReportProtocol) -> None:
-        """Deletes report content in ReportProtocol object.
+        """Deletes report content in ReportProtocol object and removes spool file if present.
 
         :param report: Instance of the ReportProtocol object.
         :type report: ReportProtocol
         """
 
         logger_main.debug('Deleting response and content for %s', report.name)
-        report.content = pd.DataFrame()
+        report.content = None
+
+        if report.spool_path:
+            logger_main.debug('Removing spool file for %s -> %s',
+                              report.name, report.spool_path)
+            Path(report.spool_path).unlink(missing_ok=True)
+            report.spool_path = None
+
+        return None
+
+    def _merge_shards(self, report: ReportProtocol) -> None:
+        """Merges downloaded shards of the report into a single export, duplicated headers and footers of shards are dropped.
+        In streaming mode shards are merged into a new spool file, otherwise into the response. Spool files of shards are removed.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+
+        parts, report.parts = report.parts, []
+
+        logger_main.debug('%s is merging %s shards of %s', current_thread().name, len(parts), report.name)
+
+        try:
+            if all(part.spool_path for part in parts):
+                spool_dir = Path(parts[0].spool_path).parent
+                fd, spool_file = tempfile.mkstemp(prefix=f'{report.id}-', suffix='.csv', dir=spool_dir)
+                report.spool_path = Path(spool_file)
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in merge_exports([part.spool_path for part in parts]):
+                        f.write(chunk)
+            else:
+                report.response = b''.join(merge_exports(
+                    [part.response.encode('UTF-8') for part in parts])).decode('UTF-8')
+        finally:
+            for part in parts:
+                if part.spool_path:
+                    Path(part.spool_path).unlink(missing_ok=True)
+
+        return None
+
+    def _skip_unchanged(self, report: ReportProtocol) -> bool:
+        """Checks if content of the report is the same as in the previous run and its file is untouched.
+        Unchanged report is marked as downloaded and its file is left alone.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        :return: Flag, True if saving of the report is skipped, False otherwise.
+        :rtype: bool
+        """
+
+        if not (self.history and report.content_hash and self.history.is_unchanged(report)):
+            return False
+
+        logger_main.info('%s unchanged since previous run, file left alone', report.name)
+
+        report.unchanged = True
+        report.downloaded = True
+        report.response = ''
+        report.size = file_size(self._parse_save_path(report))
+        report.pull_date = report.timings.written = datetime.now()
+        report.processing_time = report.pull_date - report.created_date
+
+        return True
+
+    def _trace_memory(self, stage: str, report: ReportProtocol) -> None:
+        """Records memory traced by the profiler once the report reached the stage.
+
+        :param stage: Processing stage -> [parse | write].
+        :type stage: str
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+
+        if self.profiler:
+            self.profiler.snapshot(stage, report)
+
+        return None
+
+    def _record_metrics(self, report: ReportProtocol, busy_time: float) -> None:
+        """Records busy time of the worker, result of the report and, if saved, its duration and size in metrics of the run.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        :param busy_time: Time in seconds spent on processing the report.
+        :type busy_time: float
+        """
+
+        self.metrics.inc('sfr_worker_busy_seconds_total', busy_time, worker=current_thread().name)
+        self.metrics.set('sfr_queue_depth', self.queue.qsize())
+
+        if report.unchanged:
+            result = 'unchanged'
+        elif report.valid and report.downloaded:
+            result = 'saved'
+        else:
+            result = 'failed'
+
+        self.metrics.inc('sfr_reports_total', result=result)
+
+        if result != 'failed':
+            self.metrics.observe('sfr_report_duration_seconds', report.processing_time.total_seconds())
+            self.metrics.observe('sfr_report_size_bytes', report.bytes_transferred)
 
         return None
 
@@ -240,9 +534,24 @@ class Worker(Thread):
         """
 
         if report.valid:
-            self._read_stream(report)
-            self._save_to_csv(report)
-            self._erase_report(report)
+            try:
+                if report.parts:
+                    self._merge_shards(report)
+
+                if self._skip_unchanged(report):
+                    pass
+                elif self.passthrough and report.output_format in PASSTHROUGH_FORMATS:
+                    self._passthrough(report)
+                    self._trace_memory('write', report)
+                elif self.chunk_rows:
+                    self._save_in_chunks(report)
+                    self._trace_memory('write', report)
+                elif self._read_stream(report):
+                    self._trace_memory('parse', report)
+                    self._save_to_csv(report)
+                    self._trace_memory('write', report)
+            finally:
+                self._erase_report(report)
         else:
             report.downloaded = True
         return None
@@ -259,14 +568,121 @@ class Worker(Thread):
             report = self.queue.get()
 
             if report:
+                report.timings.dequeued = datetime.now()
+                busy_since = monotonic()
                 logger_main.debug('%s processing %s',
                                   current_thread().name, report.name)
                 try:
-                    self.process_report(report)
-                except Exception as e:
-                    logger_main.debug(
-                        '%s failed while processing %s -> %s', current_thread().name, report.name, e)
+                    with self.profiler.profile(current_thread().name) if self.profiler else nullcontext():
+                        self.process_report(report)
+
+                    if self.manifest and report.valid and report.downloaded:
+                        self.manifest.record(report)
+                except Exception:
+                    logger_main.exception(
+                        '%s failed while processing %s', current_thread().name, report.name)
                 finally:
                     logger_main.debug('%s finishing %s',
                                       current_thread().name, report.name)
+                    if self.summary:
+                        self.summary.record(report)
+                    if self.metrics:
+                        self._record_metrics(report, monotonic() - busy_since)
+                    report.finished = True
                     self.queue.task_done()
+
+
+class PoolWorker(Worker):
+    """Concrete class representing Worker object handing reports over to the pool of processes.
+    Only paths travel to the process, metadata of the report travels back.
+    """
+
+    def __init__(self,
+                 queue: Queue,
+                 executor: ProcessPoolExecutor,
+                 *,
+                 passthrough: bool = False,
+                 chunk_rows: int = 0,
+                 manifest: ManifestProtocol | None = None,
+                 history: HistoryProtocol | None = None,
+                 summary: SummaryProtocol | None = None,
+                 metrics: MetricsProtocol | None = None,
+                 profiler: ProfilerProtocol | None = None,
+                 fsync: str = 'file'):
+        """Constructor method for PoolWorker.
+
+        :param queue: Shared, thread-safe queue.
+        :type queue: Queue
+        :param executor: Shared pool of processes.
+        :type executor: ProcessPoolExecutor
+        :param passthrough: Flag, if True CSV reports (also gzipped) are copied without parsing, footer is removed at byte level. Defaults to False.
+        :type passthrough: bool
+        :param chunk_rows: Number of rows in a single chunk processed by Pandas, 0 means entire report is read at once. Defaults to 0.
+        :type chunk_rows: int
+        :param manifest: Run manifest, finished reports are recorded in it. Defaults to None.
+        :type manifest: ManifestProtocol | None
+        :param history: History of past runs, if given reports with content unchanged since the previous run are not saved again. Defaults to None.
+        :type history: HistoryProtocol | None
+        :param summary: Summary report streamed during the run, processed reports are appended to it. Defaults to None.
+        :type summary: SummaryProtocol | None
+        :param metrics: Metrics of the run, busy time of workers and results, durations and sizes of reports are recorded in it. Defaults to None.
+        :type metrics: MetricsProtocol | None
+        :param profiler: Profiler of the run, CPU profile of every worker and memory at parse and write stages are collected. Defaults to None.
+        :type profiler: ProfilerProtocol | None
+        :param fsync: Fsync policy of written files -> [none | file | full]. Defaults to 'file'.
+        :type fsync: str
+        """
+
+        Worker.__init__(self, queue, passthrough=passthrough,
+                        chunk_rows=chunk_rows, manifest=manifest, history=history, summary=summary,
+                        metrics=metrics, profiler=profiler, fsync=fsync)
+        self.executor = executor
+
+    def process_report(self, report: ReportProtocol) -> None:
+        """Orchiestrates entire process of downloading the report in the pool of processes.
+        Requires report streamed to the spool file.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+
+        if not report.valid:
+            report.downloaded = True
+            return None
+
+        if report.parts:
+            try:
+                self._merge_shards(report)
+            except OSError:
+                self._erase_report(report)
+                raise
+
+        if self._skip_unchanged(report):
+            self._erase_report(report)
+            return None
+
+        file_path = self._parse_save_path(report)
+
+        logger_main.debug('%s hands %s over to the pool -> %s',
+                          current_thread().name, report.name, file_path)
+        try:
+            result = self.executor.submit(
+                process_spool_file, report.spool_path, file_path, report.output_format, self.passthrough,
+                self.chunk_rows, self.fsync).result()
+        finally:
+            self._erase_report(report)
+
+        report.downloaded = result['downloaded']
+        report.size = result['size']
+        report.pull_date = report.timings.written = result['pull_date']
+        report.timings.parsed = result['parsed_date']
+        report.processing_time = report.pull_date - report.created_date
+
+        if not report.downloaded:
+            logger_main.warning('%s not saved, attempts: %s -> %s',
+                                report.name, report.attempt_count, result.get('error'))
+        else:
+            logger_main.debug('%s succesfully saved by %s at %s, operation took: %s, file size: %s',
+                              report.name, current_thread().name, report.pull_date, report.processing_time, report.size)
+
+        return None
@@ -0,0 +1,274 @@
+import os
+import logging
+import sqlite3
+
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+from components.processors import report_file_path
+
+
+logger_main = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class HistoryProtocol(Protocol):
+    """Protocol class for history of past runs.
+
+    :param history_path: Path to the history database.
+    :type history_path: os.PathLike
+    """
+
+    history_path: os.PathLike
+
+    def record(self, reports: list[Any]) -> None:
+        """Records durations and sizes of reports downloaded in the run.
+
+        :param reports: Collection of ReportProtocol objects.
+        :type reports: list[ReportProtocol]
+        """
+        ...
+
+    def expected_duration(self, report_id: str) -> float:
+        """Returns expected download time of the report.
+
+        :param report_id: Report id.
+        :type report_id: str
+        :return: Expected download time in seconds, 0.0 if report has no history.
+        :rtype: float
+        """
+        ...
+
+    def timeout(self, report_id: str) -> float:
+        """Returns timeout of the report.
+
+        :param report_id: Report id.
+        :type report_id: str
+        :return: Timeout in seconds, 0.0 if report has no history.
+        :rtype: float
+        """
+        ...
+
+    def is_unchanged(self, report: Any) -> bool:
+        """Checks if content of the report is the same as in the previous run and its file is untouched.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        :return: Flag, True if the report is unchanged, False otherwise.
+        :rtype: bool
+        """
+        ...
+
+
+class ReportHistory():
+    """Concrete class representing SQLite history of past runs, keeps download time, processing time and size of every
+    downloaded report. Recent runs drive the order of requests and timeouts of the reports.
+    Content hash of the last saved file of every report is kept as well, to detect unchanged reports.
+    """
+
+    def __init__(self,
+                 history_path: os.PathLike,
+                 *,
+                 window: int = 5,
+                 timeout_factor: float = 3.0,
+                 min_timeout: float = 900.0,
+                 max_timeout: float = 14_400.0):
+        """Constructor method for ReportHistory, creates the database on first use.
+
+        :param history_path: Path to the history database.
+        :type history_path: os.PathLike
+        :param window: Number of recent runs of the report taken into account. Defaults to 5.
+        :type window: int
+        :param timeout_factor: Timeout is the longest recent download time multiplied by this factor. Defaults to 3.0.
+        :type timeout_factor: float
+        :param min_timeout: Lower bound of the timeout in seconds, the same as flat timeout of reports without history. Defaults to 900.0.
+        :type min_timeout: float
+        :param max_timeout: Upper bound of the timeout in seconds. Defaults to 14_400.0.
+        :type max_timeout: float
+        """
+
+        self.history_path: os.PathLike = history_path
+        self.window: int = window
+        self.timeout_factor: float = timeout_factor
+        self.min_timeout: float = min_timeout
+        self.max_timeout: float = max_timeout
+        self._recent: dict[str, list[float]] = {}
+        self._hashes: dict[str, tuple[str, int, int]] = {}
+
+        self._create_table()
+        self._load_recent()
+        self._load_hashes()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens connection to the database.
+        """
+        return sqlite3.connect(self.history_path)
+
+    def _create_table(self) -> None:
+        """Creates the table of runs if it doesn't exist.
+        """
+
+        logger_main.debug('Opening history %s', self.history_path)
+        Path(self.history_path).parent.mkdir(parents=True, exist_ok=True)
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS runs ('
+                               'report_id TEXT NOT NULL, '
+                               'name TEXT, '
+                               'run_date TEXT NOT NULL, '
+                               'download_time REAL NOT NULL, '
+                               'processing_time REAL, '
+                               'bytes INTEGER, '
+                               'size REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS runs_report_id ON runs (report_id, run_date)')
+            connection.execute('CREATE TABLE IF NOT EXISTS hashes ('
+                               'key TEXT PRIMARY KEY, '
+                               'content_hash TEXT NOT NULL, '
+                               'file_bytes INTEGER NOT NULL, '
+                               'file_mtime INTEGER NOT NULL, '
+                               'updated_date TEXT NOT NULL)')
+
+        return None
+
+    def _load_recent(self) -> None:
+        """Loads download times of recent runs of every report.
+        """
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute('SELECT report_id, download_time FROM ('
+                                      'SELECT report_id, download_time, ROW_NUMBER() OVER ('
+                                      'PARTITION BY report_id ORDER BY run_date DESC) AS num FROM runs) '
+                                      'WHERE num <= ?', (self.window,)).fetchall()
+
+        for report_id, download_time in rows:
+            self._recent.setdefault(report_id, []).append(download_time)
+
+        logger_main.debug('History of %s reports loaded', len(self._recent))
+
+        return None
+
+    def _load_hashes(self) -> None:
+        """Loads content hashes and file stats of reports saved in previous runs.
+        """
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute('SELECT key, content_hash, file_bytes, file_mtime FROM hashes').fetchall()
+
+        self._hashes = {key: (content_hash, file_bytes, file_mtime)
+                        for key, content_hash, file_bytes, file_mtime in rows}
+
+        return None
+
+    @staticmethod
+    def _key(report: Any) -> str:
+        """Returns hash key of the report, report id and save location.
+        """
+        return f'{report.id}|{report_file_path(report)}'
+
+    def _hash_rows(self, reports: list[Any]) -> list[tuple[str, str, int, int, str]]:
+        """Collects content hashes and file stats of saved reports.
+        """
+
+        rows = []
+
+        for report in reports:
+            if not (report.valid and report.downloaded and report.content_hash):
+                continue
+
+            try:
+                stat = os.stat(report_file_path(report))
+            except OSError:
+                continue
+
+            rows.append((self._key(report), report.content_hash, stat.st_size,
+                         stat.st_mtime_ns, report.pull_date.isoformat()))
+
+        return rows
+
+    def record(self, reports: list[Any]) -> None:
+        """Records download time (from the request of the last attempt until the end of the body), processing time
+        and size of reports downloaded in the run. Invalid and resumed reports are not recorded.
+        Content hashes are recorded together with size and modification time of saved files.
+        Recorded runs and hashes are applied to this instance as well, so long-lived history (daemon mode) sees its own runs.
+
+        :param reports: Collection of ReportProtocol objects.
+        :type reports: list[ReportProtocol]
+        """
+
+        rows = [(report.id, report.name, report.pull_date.isoformat(),
+                 (report.timings.body_complete - report.timings.request_sent).total_seconds(),
+                 report.processing_time.total_seconds(), report.bytes_transferred, report.size)
+                for report in reports
+                if report.valid and report.downloaded and not report.resumed
+                and report.timings.request_sent and report.timings.body_complete]
+
+        logger_main.debug('Recording %s reports in history %s', len(rows), self.history_path)
+
+        hash_rows = self._hash_rows(reports)
+
+        with closing(self._connect()) as connection, connection:
+            connection.executemany('INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            connection.executemany('INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)', hash_rows)
+
+        for report_id, _, _, download_time, *_ in sorted(rows, key=lambda row: row[2]):
+            self._recent[report_id] = ([download_time] + self._recent.get(report_id, []))[:self.window]
+
+        self._hashes.update({key: (content_hash, file_bytes, file_mtime)
+                             for key, content_hash, file_bytes, file_mtime, _ in hash_rows})
+
+        return None
+
+    def expected_duration(self, report_id: str) -> float:
+        """Returns expected download time of the report, average of recent runs.
+
+        :param report_id: Report id.
+        :type report_id: str
+        :return: Expected download time in seconds, 0.0 if report has no history.
+        :rtype: float
+        """
+
+        recent = self._recent.get(report_id)
+
+        return sum(recent) / len(recent) if recent else 0.0
+
+    def timeout(self, report_id: str) -> float:
+        """Returns timeout of the report, the longest recent download time multiplied by `timeout_factor`,
+        bounded by `min_timeout` and `max_timeout`.
+
+        :param report_id: Report id.
+        :type report_id: str
+        :return: Timeout in seconds, 0.0 if report has no history.
+        :rtype: float
+        """
+
+        recent = self._recent.get(report_id)
+
+        if not recent:
+            return 0.0
+
+        longest = max(recent)
+
+        return min(self.max_timeout, max(self.min_timeout, longest * self.timeout_factor))
+
+    def is_unchanged(self, report: Any) -> bool:
+        """Checks if content hash of the report is the same as in the previous run and its file is untouched
+        (same size and modification time as right after the previous run).
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        :return: Flag, True if the report is unchanged, False otherwise.
+        :rtype: bool
+        """
+
+        previous = self._hashes.get(self._key(report))
+
+        if not previous or previous[0] != report.content_hash:
+            return False
+
+        try:
+            stat = os.stat(report_file_path(report))
+        except OSError:
+            return False
+
+        return (stat.st_size, stat.st_mtime_ns) == previous[1:]
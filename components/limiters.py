@@ -0,0 +1,269 @@
+import asyncio
+import logging
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol, runtime_checkable
+
+
+logger_main = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class LimiterProtocol(Protocol):
+    """Protocol class for limiter of requests in flight.
+
+    :param domain: Domain guarded by the limiter.
+    :type domain: str
+    :param window: Current number of requests allowed in flight, 0 means no limit.
+    :type window: int
+    :param in_flight: Number of requests currently in flight.
+    :type in_flight: int
+    """
+
+    domain: str
+    window: int
+    in_flight: int
+
+    async def __aenter__(self) -> 'LimiterProtocol':
+        """Awaits free slot in the window and occupies it.
+        """
+        ...
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Releases occupied slot.
+        """
+        ...
+
+    def record_success(self, latency: float, expected: float = 0.0) -> None:
+        """Records successful response.
+
+        :param latency: Time to response headers in seconds.
+        :type latency: float
+        :param expected: Expected download time of the report in seconds, 0.0 if unknown. Defaults to 0.0 .
+        :type expected: float
+        """
+        ...
+
+    def record_failure(self, reason: str) -> None:
+        """Records failed response.
+
+        :param reason: Short description of the failure.
+        :type reason: str
+        """
+        ...
+
+
+@dataclass(slots=True)
+class WindowAdjustment():
+    """Concrete class representing single change of the concurrency window.
+
+    :param domain: Domain guarded by the limiter.
+    :type domain: str
+    :param date: Date of the adjustment.
+    :type date: datetime
+    :param old_window: Window before the adjustment.
+    :type old_window: int
+    :param new_window: Window after the adjustment.
+    :type new_window: int
+    :param reason: Reason of the adjustment.
+    :type reason: str
+    """
+
+    domain: str
+    date: datetime
+    old_window: int
+    new_window: int
+    reason: str
+
+
+class ConcurrencyLimiter():
+    """Concrete class representing fixed limiter of requests in flight for single domain.
+    Requests above the limit wait in line until one of the running requests releases its slot.
+    """
+
+    def __init__(self, domain: str, limit: int):
+        """Constructor method for ConcurrencyLimiter.
+
+        :param domain: Domain guarded by the limiter.
+        :type domain: str
+        :param limit: Maximum number of requests in flight, 0 means no limit.
+        :type limit: int
+        """
+
+        self.domain: str = domain
+        self.limit: int = limit
+        self.in_flight: int = 0
+        self.adjustments: list[WindowAdjustment] = []
+        self._condition: asyncio.Condition = asyncio.Condition()
+
+    @property
+    def window(self) -> int:
+        """Current number of requests allowed in flight, 0 means no limit.
+        """
+        return self.limit
+
+    def _has_capacity(self) -> bool:
+        """Checks if there is a free slot in the window.
+        """
+        return not self.window or self.in_flight < self.window
+
+    async def __aenter__(self) -> 'ConcurrencyLimiter':
+        async with self._condition:
+            await self._condition.wait_for(self._has_capacity)
+            self.in_flight += 1
+
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+        return None
+
+    def record_success(self, latency: float, expected: float = 0.0) -> None:
+        """Fixed limiter ignores responses.
+        """
+        return None
+
+    def record_failure(self, reason: str) -> None:
+        """Fixed limiter ignores responses.
+        """
+        return None
+
+
+class AimdLimiter(ConcurrencyLimiter):
+    """Concrete class representing adaptive limiter of requests in flight for single domain.
+    Window grows additively (by `increase` per full window of successful responses) as long as responses
+    are successful and latency is stable, window is cut multiplicatively by `decrease` on failures and latency spikes.
+    Latency is tracked relative to expected download time of every report, as SFDC responds once the export is generated.
+    """
+
+    def __init__(self,
+                 domain: str,
+                 limit: int,
+                 *,
+                 initial: int = 4,
+                 minimum: int = 1,
+                 increase: float = 1.0,
+                 decrease: float = 0.5,
+                 latency_factor: float = 2.0,
+                 cooldown: float = 5.0):
+        """Constructor method for AimdLimiter.
+
+        :param domain: Domain guarded by the limiter.
+        :type domain: str
+        :param limit: Maximum size of the window, 0 means no upper bound.
+        :type limit: int
+        :param initial: Initial size of the window. Defaults to 4.
+        :type initial: int
+        :param minimum: Minimum size of the window. Defaults to 1.
+        :type minimum: int
+        :param increase: Growth of the window per full window of successful responses. Defaults to 1.0.
+        :type increase: float
+        :param decrease: Multiplier applied to the window on failure. Defaults to 0.5.
+        :type decrease: float
+        :param latency_factor: Relative latency above its average multiplied by this factor is considered a spike. Defaults to 2.0.
+        :type latency_factor: float
+        :param cooldown: Minimum time in seconds between two consecutive cuts of the window. Defaults to 5.0.
+        :type cooldown: float
+        """
+
+        super().__init__(domain, limit)
+        self.minimum: int = minimum
+        self.increase: float = increase
+        self.decrease: float = decrease
+        self.latency_factor: float = latency_factor
+        self.cooldown: float = cooldown
+
+        self._window: float = float(min(initial, limit) if limit else initial)
+        self._latency: float | None = None
+        self._last_decrease: float = 0.0
+        self._wake_ups: set[asyncio.Task] = set()
+
+    @property
+    def window(self) -> int:
+        """Current number of requests allowed in flight.
+        """
+        return max(self.minimum, int(self._window))
+
+    def _adjust(self, new_window: float, reason: str) -> None:
+        """Sets new size of the window, logs and records the adjustment if effective window has changed.
+        Requests waiting for slots added to the window are woken up by a task kept until it's done, as the loop holds weak references only.
+
+        :param new_window: New size of the window.
+        :type new_window: float
+        :param reason: Reason of the adjustment.
+        :type reason: str
+        """
+
+        old_window = self.window
+        self._window = new_window
+
+        if self.window != old_window:
+            logger_main.info("%s concurrency window %s -> %s, %s",
+                             self.domain, old_window, self.window, reason)
+            self.adjustments.append(WindowAdjustment(
+                self.domain, datetime.now(), old_window, self.window, reason))
+
+            if self.window > old_window:
+                task = asyncio.ensure_future(self._wake_up(self.window - old_window))
+                self._wake_ups.add(task)
+                task.add_done_callback(self._wake_ups.discard)
+
+        return None
+
+    async def _wake_up(self, slots: int) -> None:
+        """Wakes up requests waiting for the slots added to the window.
+
+        :param slots: Number of added slots.
+        :type slots: int
+        """
+
+        async with self._condition:
+            self._condition.notify(slots)
+
+        return None
+
+    def record_success(self, latency: float, expected: float = 0.0) -> None:
+        """Records successful response. Grows the window unless latency spike is detected.
+        Time to response headers depends on the report, so latency is compared as a ratio to expected download time
+        of the report, responses of reports without history are never considered a spike.
+
+        :param latency: Time to response headers in seconds.
+        :type latency: float
+        :param expected: Expected download time of the report in seconds, 0.0 if unknown. Defaults to 0.0 .
+        :type expected: float
+        """
+
+        spike = False
+
+        if expected > 0:
+            ratio = latency / expected
+            spike = self._latency is not None and ratio > self._latency * self.latency_factor
+            self._latency = ratio if self._latency is None else 0.8 * self._latency + 0.2 * ratio
+
+        if spike:
+            self.record_failure(f'latency spike {latency:.2f}s, expected {expected:.2f}s')
+        else:
+            new_window = self._window + self.increase / self._window
+            self._adjust(min(new_window, self.limit) if self.limit else new_window,
+                         'successful responses')
+
+        return None
+
+    def record_failure(self, reason: str) -> None:
+        """Records failed response. Cuts the window, not more often than once per `cooldown`.
+
+        :param reason: Short description of the failure.
+        :type reason: str
+        """
+
+        now = asyncio.get_running_loop().time()
+
+        if now - self._last_decrease >= self.cooldown:
+            self._last_decrease = now
+            self._adjust(max(self.minimum, self._window * self.decrease), reason)
+
+        return None
@@ -1,11 +1,22 @@
 import os
+import atexit
 import logging
 import logging.handlers
 
+from queue import SimpleQueue
+from typing import Any
 
-def logger_configurer(cli_stdout_loglevel: str, cli_file_loglevel: str, verbose: bool) -> None:
+
+def logger_configurer(cli_stdout_loglevel: str,
+                      cli_file_loglevel: str,
+                      verbose: bool,
+                      *,
+                      log_path: os.PathLike | None = None) -> logging.handlers.QueueListener:
     """
-    Configures logger settings for file and stdout handlers.
+    Configures logger settings for file and stdout handlers. Records are put to the queue by the logging thread
+    (event loop, workers) and written by a single background listener, so formatting and I/O never block the caller.
+    Listener is stopped and remaining records are flushed at exit.
+    File handler gets file level and stdout handler gets stdout level, root logger passes the lower of the two.
 
     :param cli_stdout_loglevel: LogLevel for stdout logger handler based on CLI option. Defaults to ERROR.
     :type cli_stdout_loglevel: str
@@ -13,6 +24,10 @@ def logger_configurer(cli_stdout_loglevel: str, cli_file_loglevel: str, verbose:
     :type cli_stdout_loglevel: str
     :param verbose: Flag toggling LogLevel for stdout logger handler, if True sets to ERROR, else INFO.
     :type verbose: str
+    :param log_path: Path to the log file. Defaults to `logs/sfr.log` in main folder of the app.
+    :type log_path: os.PathLike | None
+    :return: Started listener writing records to the handlers.
+    :rtype: logging.handlers.QueueListener
     """
 
     levels = {
@@ -32,22 +47,70 @@ def logger_configurer(cli_stdout_loglevel: str, cli_file_loglevel: str, verbose:
     flevel = levels.get(cli_file_loglevel.lower(), logging.INFO)
 
     logger = logging.getLogger()
-    logger.setLevel(slevel)
+    logger.setLevel(min(slevel, flevel))
 
-    log_path = os.path.join(os.path.abspath(__file__),
-                            '..', '..', './logs/sfr.log')
+    log_path = log_path or os.path.join(os.path.abspath(__file__),
+                                        '..', '..', './logs/sfr.log')
 
     handler_f = logging.handlers.RotatingFileHandler(
         log_path, 'a', 1_000_000, 3)
     handler_s = logging.StreamHandler()
 
-    handler_s.setLevel(flevel)
+    handler_f.setLevel(flevel)
+    handler_s.setLevel(slevel)
     formatter = logging.Formatter('%(asctime)-20s| %(levelname)-8s| %(processName)-12s| '
                                   '%(message)s', '%Y-%m-%d %H:%M:%S')
     handler_f.setFormatter(formatter)
     handler_s.setFormatter(formatter)
 
-    logger.addHandler(handler_f)
-    logger.addHandler(handler_s)
+    log_queue = SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler_f, handler_s, respect_handler_level=True)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+
+    return listener
+
+
+class ForwardHandler(logging.Handler):
+    """Handler handing records received from pool processes over to loggers of the main process,
+    which put them to the queue of the main listener.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        logging.getLogger(record.name).handle(record)
+
+
+def pool_logger_listener(context: Any) -> logging.handlers.QueueListener:
+    """
+    Starts listener forwarding records of pool processes to loggers of the main process.
+
+    :param context: Multiprocessing context of the pool, records are passed through the queue of this context.
+    :type context: multiprocessing.context.BaseContext
+    :return: Started listener, its `queue` is passed to `pool_logger_configurer` of every process.
+    :rtype: logging.handlers.QueueListener
+    """
+
+    listener = logging.handlers.QueueListener(context.Queue(), ForwardHandler())
+    listener.start()
+
+    return listener
+
+
+def pool_logger_configurer(queue: Any, level: int) -> None:
+    """
+    Initializer of pool processes, records of the process are put to the queue of the main process.
+
+    :param queue: Queue of the listener started by `pool_logger_listener`.
+    :type queue: multiprocessing.Queue
+    :param level: Level of the root logger of the main process.
+    :type level: int
+    """
+
+    logger = logging.getLogger()
+    logger.handlers.clear()
+    logger.setLevel(level)
+    logger.addHandler(logging.handlers.QueueHandler(queue))
 
     return None
@@ -0,0 +1,168 @@
+import os
+import json
+import logging
+
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Protocol, runtime_checkable
+
+from components.containers import ReportProtocol
+from components.processors import report_file_path
+
+
+logger_main = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class ManifestProtocol(Protocol):
+    """Protocol class for run manifest object.
+
+    :param manifest_path: Path to the manifest file.
+    :type manifest_path: os.PathLike
+    """
+
+    manifest_path: os.PathLike
+
+    def record(self, report: ReportProtocol) -> None:
+        """Records finished report.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+        ...
+
+    def is_finished(self, report: ReportProtocol) -> bool:
+        """Checks if the report has been finished and its file is still in place.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        :return: Flag, True if report is finished and verified, False otherwise.
+        :rtype: bool
+        """
+        ...
+
+    def restore(self, report: ReportProtocol) -> None:
+        """Restores details of the report finished in the previous run.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+        ...
+
+
+class RunManifest():
+    """Concrete class representing persistent manifest of the run. Manifest is a JSON Lines journal,
+    every finished report is appended as a single line and flushed to disk, so the manifest survives the crash of the run.
+    """
+
+    def __init__(self, manifest_path: os.PathLike, *, resume: bool = False):
+        """Constructor method for RunManifest. Starts new manifest unless the run is resumed.
+
+        :param manifest_path: Path to the manifest file.
+        :type manifest_path: os.PathLike
+        :param resume: Flag, if True entries of the previous run are loaded, otherwise manifest is cleared. Defaults to False.
+        :type resume: bool
+        """
+
+        self.manifest_path: os.PathLike = manifest_path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._lock: Lock = Lock()
+
+        if resume:
+            self._load()
+        else:
+            logger_main.debug('Starting new manifest %s', self.manifest_path)
+            Path(self.manifest_path).parent.mkdir(parents=True, exist_ok=True)
+            open(self.manifest_path, 'w').close()
+
+    @staticmethod
+    def _key(report: ReportProtocol) -> str:
+        """Returns manifest key of the report, report id and save location.
+        """
+        return f'{report.id}|{report_file_path(report)}'
+
+    def _load(self) -> None:
+        """Loads entries of the previous run. Broken lines (e.g. the last line written while the run was killed) are skipped.
+        """
+
+        logger_main.info('Resuming the run from manifest %s', self.manifest_path)
+
+        if not os.path.exists(self.manifest_path):
+            logger_main.warning('Manifest %s not found, starting from scratch', self.manifest_path)
+            return None
+
+        with open(self.manifest_path, encoding='UTF8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry['key']] = entry
+                except (json.JSONDecodeError, KeyError):
+                    logger_main.debug('Skipping broken manifest line: %s', line)
+
+        return None
+
+    def record(self, report: ReportProtocol) -> None:
+        """Appends finished report to the manifest and flushes it to disk.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+
+        file_path = report_file_path(report)
+        entry = {'key': self._key(report),
+                 'name': report.name,
+                 'id': report.id,
+                 'file_path': str(file_path),
+                 'file_bytes': os.stat(file_path).st_size,
+                 'pull_date': report.pull_date.isoformat(),
+                 'finished_date': datetime.now().isoformat()}
+
+        with self._lock:
+            self.entries[entry['key']] = entry
+
+            with open(self.manifest_path, 'a', encoding='UTF8') as f:
+                f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+        logger_main.debug('%s recorded in manifest', report.name)
+
+        return None
+
+    def is_finished(self, report: ReportProtocol) -> bool:
+        """Checks if the report has been finished in the previous run and its file is still in place with the same size.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        :return: Flag, True if report is finished and verified, False otherwise.
+        :rtype: bool
+        """
+
+        entry = self.entries.get(self._key(report))
+
+        if not entry:
+            return False
+
+        try:
+            return os.stat(entry['file_path']).st_size == entry['file_bytes']
+        except OSError:
+            logger_main.info('%s finished in previous run, but file is missing', report.name)
+            return False
+
+    def restore(self, report: ReportProtocol) -> None:
+        """Restores details of the report finished in the previous run.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+
+        entry = self.entries[self._key(report)]
+
+        report.valid = True
+        report.downloaded = True
+        report.resumed = True
+        report.pull_date = datetime.fromisoformat(entry['pull_date'])
+        report.size = round(entry['file_bytes'] / (1024 * 1024), 3)
+
+        return None
@@ -0,0 +1,270 @@
+import os
+import time
+import logging
+
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Protocol, runtime_checkable
+
+from components.processors import atomic_write
+
+
+logger_main = logging.getLogger(__name__)
+
+
+DURATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1_800, 3_600, 7_200, 14_400)
+SIZE_BUCKETS = (10_240, 102_400, 1_048_576, 10_485_760, 52_428_800, 104_857_600,
+                524_288_000, 1_073_741_824, 2_147_483_648)
+
+METRICS = {
+    'sfr_requests_in_flight': ('gauge', 'Requests sent and waiting for the response', None),
+    'sfr_responses_total': ('counter', 'Responses by HTTP status', None),
+    'sfr_retries_total': ('counter', 'Retries by HTTP status or failure of the request', None),
+    'sfr_downloaded_bytes_total': ('counter', 'Bytes of downloaded responses', None),
+    'sfr_queue_depth': ('gauge', 'Downloaded reports waiting for workers', None),
+    'sfr_worker_busy_seconds_total': ('counter', 'Time spent by workers on processing reports', None),
+    'sfr_reports_total': ('counter', 'Finished reports by result', None),
+    'sfr_report_duration_seconds': ('histogram', 'Time from the first request until the report is written', DURATION_BUCKETS),
+    'sfr_report_size_bytes': ('histogram', 'Bytes transferred per report', SIZE_BUCKETS),
+    'sfr_report_last_duration_seconds': ('gauge', 'Time from the first request until the report is written, per report', None),
+    'sfr_report_last_size_bytes': ('gauge', 'Size of saved file, per report', None),
+    'sfr_report_last_valid': ('gauge', 'Report downloaded and saved (1) or failed (0), per report', None),
+    'sfr_scheduled_runs_total': ('counter', 'Runs of reports started by the scheduler in daemon mode', None),
+    'sfr_skipped_runs_total': ('counter', 'Runs of reports skipped as the previous run was not finished', None),
+    'sfr_schedule_reloads_total': ('counter', 'Reloads of the reports list in daemon mode by result', None),
+    'sfr_run_start_timestamp_seconds': ('gauge', 'Start of the run', None),
+    'sfr_run_end_timestamp_seconds': ('gauge', 'End of the run', None),
+    'sfr_metrics_write_timestamp_seconds': ('gauge', 'Last write of metrics', None),
+}
+
+
+@runtime_checkable
+class MetricsProtocol(Protocol):
+    """Protocol class for metrics of the run.
+
+    :param metrics_path: Path to the metrics file.
+    :type metrics_path: os.PathLike
+    :param per_report: Flag, if True series of every report are recorded as well.
+    :type per_report: bool
+    """
+
+    metrics_path: os.PathLike
+    per_report: bool
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Increases counter or gauge.
+
+        :param name: Name of the metric.
+        :type name: str
+        :param value: Increase. Defaults to 1.0.
+        :type value: float
+        """
+        ...
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Sets value of the gauge.
+
+        :param name: Name of the metric.
+        :type name: str
+        :param value: Value of the gauge.
+        :type value: float
+        """
+        ...
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Records value in the histogram.
+
+        :param name: Name of the metric.
+        :type name: str
+        :param value: Observed value.
+        :type value: float
+        """
+        ...
+
+    def write(self) -> None:
+        """Writes all metrics to the metrics file.
+        """
+        ...
+
+
+class MetricsRegistry():
+    """Concrete class representing metrics of the run written in Prometheus text format, e.g. for textfile collector of node exporter.
+    Metrics are kept in memory and written atomically (temporary file renamed into place) every `interval` seconds
+    by a background thread and once the run is finished, so the collector never reads half-written file.
+    Series labelled with the report are opt-in (`per_report`), as every report adds its own series to every scrape.
+    """
+
+    def __init__(self, metrics_path: os.PathLike, *, interval: float = 15.0, per_report: bool = False):
+        """Constructor method for MetricsRegistry.
+
+        :param metrics_path: Path to the metrics file, textfile collector reads files with `.prom` extension.
+        :type metrics_path: os.PathLike
+        :param interval: Interval in seconds between writes during the run, 0 means metrics are written only once the run is finished. Defaults to 15.0.
+        :type interval: float
+        :param per_report: Flag, if True duration, size, result and scheduled runs of every report are recorded
+        in series labelled with the report, only totals of the run otherwise. Defaults to False.
+        :type per_report: bool
+        """
+
+        self.metrics_path: os.PathLike = metrics_path
+        self.interval: float = interval
+        self.per_report: bool = per_report
+        self._values: dict[str, dict[tuple[tuple[str, str], ...], float]] = {name: {} for name in METRICS}
+        self._histograms: dict[str, dict[tuple[tuple[str, str], ...], list[float]]] = {
+            name: {} for name, (kind, _, _) in METRICS.items() if kind == 'histogram'}
+        self._lock: Lock = Lock()
+        self._stopped: Event = Event()
+        self._writer: Thread | None = None
+
+    @staticmethod
+    def _key(labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Increases counter or gauge.
+
+        :param name: Name of the metric, one of `METRICS`.
+        :type name: str
+        :param value: Increase, negative for gauges only. Defaults to 1.0.
+        :type value: float
+        """
+
+        key = self._key(labels)
+
+        with self._lock:
+            self._values[name][key] = self._values[name].get(key, 0.0) + value
+
+        return None
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Sets value of the gauge.
+
+        :param name: Name of the metric, one of `METRICS`.
+        :type name: str
+        :param value: Value of the gauge.
+        :type value: float
+        """
+
+        with self._lock:
+            self._values[name][self._key(labels)] = value
+
+        return None
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Records value in the histogram, buckets of the histogram are defined in `METRICS`.
+
+        :param name: Name of the metric, one of `METRICS`.
+        :type name: str
+        :param value: Observed value.
+        :type value: float
+        """
+
+        buckets = METRICS[name][2]
+        key = self._key(labels)
+
+        with self._lock:
+            counts = self._histograms[name].setdefault(key, [0.0] * (len(buckets) + 2))
+            for num, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[num] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+        return None
+
+    @staticmethod
+    def _labels(key: tuple[tuple[str, str], ...], extra: tuple[tuple[str, str], ...] = ()) -> str:
+        """Formats labels, backslashes, quotes and new lines in values are escaped.
+        """
+
+        pairs = [f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+                 for name, value in key + extra]
+
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    @staticmethod
+    def _number(value: float) -> str:
+        """Formats value without loss of precision, integral values without fraction.
+        """
+
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+    def render(self) -> str:
+        """Renders all metrics in Prometheus text format, metrics without values are skipped.
+
+        :return: Metrics in Prometheus text format.
+        :rtype: str
+        """
+
+        lines = []
+
+        with self._lock:
+            for name, (kind, help, buckets) in METRICS.items():
+                series = self._histograms[name] if kind == 'histogram' else self._values[name]
+
+                if not series:
+                    continue
+
+                lines.append(f'# HELP {name} {help}')
+                lines.append(f'# TYPE {name} {kind}')
+
+                for key, value in series.items():
+                    if kind == 'histogram':
+                        for bound, count in zip(buckets, value):
+                            lines.append(f'{name}_bucket{self._labels(key, (("le", str(bound)),))} {self._number(count)}')
+                        lines.append(f'{name}_bucket{self._labels(key, (("le", "+Inf"),))} {self._number(value[-2])}')
+                        lines.append(f'{name}_sum{self._labels(key)} {self._number(value[-1])}')
+                        lines.append(f'{name}_count{self._labels(key)} {self._number(value[-2])}')
+                    else:
+                        lines.append(f'{name}{self._labels(key)} {self._number(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self) -> None:
+        """Writes all metrics to the metrics file, temporary file is renamed into place.
+        """
+
+        self.set('sfr_metrics_write_timestamp_seconds', time.time())
+
+        try:
+            Path(self.metrics_path).parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(self.metrics_path, 'none') as temp_path:
+                with open(temp_path, 'w', encoding='UTF8') as f:
+                    f.write(self.render())
+        except OSError as e:
+            logger_main.warning('Metrics not written to %s -> %s', self.metrics_path, e)
+
+        return None
+
+    def _write_periodically(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.write()
+
+    def start(self) -> None:
+        """Marks the start of the run and starts background writes every `interval` seconds.
+        """
+
+        self.set('sfr_run_start_timestamp_seconds', time.time())
+        self.write()
+
+        if self.interval > 0:
+            self._writer = Thread(target=self._write_periodically, name='Metrics', daemon=True)
+            self._writer.start()
+
+        return None
+
+    def stop(self) -> None:
+        """Marks the end of the run, stops background writes and writes final metrics.
+        """
+
+        self._stopped.set()
+
+        if self._writer:
+            self._writer.join()
+
+        self.set('sfr_run_end_timestamp_seconds', time.time())
+        self.write()
+
+        logger_main.debug('Metrics written to %s', self.metrics_path)
+
+        return None
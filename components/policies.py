@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import random
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Protocol, runtime_checkable
+
+from components.containers import ReportProtocol
+
+
+logger_main = logging.getLogger(__name__)
+
+
+RETRY = 'retry'
+ABORT = 'abort'
+
+
+@runtime_checkable
+class RetryPolicyProtocol(Protocol):
+    """Protocol class for retry policy object.
+
+    :param max_attempts: Maximum number of attempts per report.
+    :type max_attempts: int
+    :param retries: Number of retries made during the run.
+    :type retries: int
+    :param backoff_time: Total time spent on backing off during the run in seconds.
+    :type backoff_time: float
+    """
+
+    max_attempts: int
+    retries: int
+    backoff_time: float
+
+    def rule(self, status: int) -> str:
+        """Returns action for given response status.
+
+        :param status: HTTP status of the response.
+        :type status: int
+        :return: Action, `retry` or `abort`.
+        :rtype: str
+        """
+        ...
+
+    async def backoff(self, report: ReportProtocol, retry_after: str | None = None) -> bool:
+        """Waits before another attempt if retry is allowed.
+
+        :param report: Instance of `ReportProtocol`.
+        :type report: ReportProtocol
+        :param retry_after: Value of `Retry-After` response header. Defaults to None.
+        :type retry_after: str | None
+        :return: Flag, True if another attempt is allowed, False otherwise.
+        :rtype: bool
+        """
+        ...
+
+
+class RetryPolicy():
+    """Concrete class representing retry policy with exponential backoff, jitter and global retry budget.
+    """
+
+    def __init__(self,
+                 *,
+                 max_attempts: int = 20,
+                 backoff_base: float = 1.0,
+                 backoff_max: float = 60.0,
+                 backoff_multiplier: float = 2.0,
+                 jitter: float = 1.0,
+                 budget: int = 0,
+                 status_rules: dict[int, str] | None = None):
+        """Constructor method for RetryPolicy.
+
+        :param max_attempts: Maximum number of attempts per report. Defaults to 20.
+        :type max_attempts: int
+        :param backoff_base: Delay in seconds before the first retry. Defaults to 1.0.
+        :type backoff_base: float
+        :param backoff_max: Upper bound of the delay in seconds, also caps `Retry-After`. Defaults to 60.0.
+        :type backoff_max: float
+        :param backoff_multiplier: Growth of the delay with every retry of the report. Defaults to 2.0.
+        :type backoff_multiplier: float
+        :param jitter: Randomized fraction of the delay, 0 means no jitter, 1 means full jitter. Defaults to 1.0.
+        :type jitter: float
+        :param budget: Maximum number of retries for the entire run, 0 means no limit. Defaults to 0.
+        :type budget: int
+        :param status_rules: Actions (`retry` or `abort`) for response statuses, not listed statuses are retried. Defaults to {404: 'abort'}.
+        :type status_rules: dict[int, str] | None
+        """
+
+        self.max_attempts: int = max_attempts
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.backoff_multiplier: float = backoff_multiplier
+        self.jitter: float = jitter
+        self.budget: int = budget
+        self.status_rules: dict[int, str] = status_rules or {404: ABORT}
+
+        self.retries: int = 0
+        self.backoff_time: float = 0.0
+
+    def rule(self, status: int) -> str:
+        """Returns action for given response status.
+
+        :param status: HTTP status of the response.
+        :type status: int
+        :return: Action, `retry` or `abort`.
+        :rtype: str
+        """
+        return self.status_rules.get(status, RETRY)
+
+    def _parse_retry_after(self, retry_after: str | None) -> float | None:
+        """Parses `Retry-After` header given as number of seconds or HTTP date.
+
+        :param retry_after: Value of `Retry-After` response header.
+        :type retry_after: str | None
+        :return: Delay in seconds or None if header is missing or malformed.
+        :rtype: float | None
+        """
+
+        if not retry_after:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            logger_main.debug("Malformed Retry-After header: %s", retry_after)
+            return None
+
+    def delay(self, retry_count: int, retry_after: str | None = None) -> float:
+        """Computes delay before the retry. `Retry-After` takes precedence over exponential backoff.
+
+        :param retry_count: Number of retries of the report made so far.
+        :type retry_count: int
+        :param retry_after: Value of `Retry-After` response header. Defaults to None.
+        :type retry_after: str | None
+        :return: Delay in seconds.
+        :rtype: float
+        """
+
+        server_delay = self._parse_retry_after(retry_after)
+
+        if server_delay is not None:
+            return min(server_delay, self.backoff_max)
+
+        delay = min(self.backoff_max, self.backoff_base *
+                    self.backoff_multiplier ** retry_count)
+
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    def _can_retry(self, report: ReportProtocol) -> bool:
+        """Checks attempts limit of the report and retry budget of the run.
+
+        :param report: Instance of `ReportProtocol`.
+        :type report: ReportProtocol
+        :return: Flag, True if another attempt is allowed, False otherwise.
+        :rtype: bool
+        """
+
+        if report.attempt_count >= self.max_attempts:
+            logger_main.error("%s failed, limit of %s attempts reached",
+                              report.name, self.max_attempts)
+            return False
+
+        if self.budget and self.retries >= self.budget:
+            logger_main.error("%s failed, retry budget of %s retries for the run is exhausted",
+                              report.name, self.budget)
+            return False
+
+        return True
+
+    async def backoff(self, report: ReportProtocol, retry_after: str | None = None) -> bool:
+        """Waits before another attempt if retry is allowed. Updates retry statistics of the report and the run.
+
+        :param report: Instance of `ReportProtocol`.
+        :type report: ReportProtocol
+        :param retry_after: Value of `Retry-After` response header. Defaults to None.
+        :type retry_after: str | None
+        :return: Flag, True if another attempt is allowed, False otherwise.
+        :rtype: bool
+        """
+
+        if not self._can_retry(report):
+            return False
+
+        delay = self.delay(report.retry_count, retry_after)
+
+        self.retries += 1
+        self.backoff_time += delay
+        report.retry_count += 1
+        report.backoff_time += delay
+
+        logger_main.info("%s -> Retry %s in %.2f s",
+                         report.name, report.retry_count, delay)
+        await asyncio.sleep(delay)
+
+        return True
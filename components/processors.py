@@ -0,0 +1,653 @@
+from __future__ import annotations
+
+import os
+import gzip
+import uuid
+import hashlib
+import logging
+import warnings
+
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Generator
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+logger_main = logging.getLogger(__name__)
+
+
+FOOTER_ROWS = 5
+
+OUTPUT_FORMATS = {'csv': '.csv',
+                  'csv.gz': '.csv.gz',
+                  'parquet': '.parquet',
+                  'feather': '.feather'}
+
+PASSTHROUGH_FORMATS = ('csv', 'csv.gz')
+
+FSYNC_POLICIES = ('none', 'file', 'full')
+
+# errors of writing content, pyarrow errors (Parquet, Feather) subclass ValueError, TypeError and NotImplementedError,
+# ImportError is raised if pyarrow is missing
+WRITE_ERRORS = (OSError, ValueError, TypeError, NotImplementedError, ImportError)
+
+
+class FooterTrimmer():
+    """Concrete class representing byte level footer trimmer for CSV data stream. Bytes are passed through as they come,
+    only the tail which may contain the footer is withheld. Records are detected with respect to quoted fields,
+    so line breaks inside of quoted fields don't split the record. Blank lines are not counted as records.
+    """
+
+    def __init__(self, rows: int = FOOTER_ROWS, window: int = 1_048_576):
+        """Constructor method for FooterTrimmer.
+
+        :param rows: Number of footer records to be removed. Defaults to FOOTER_ROWS.
+        :type rows: int
+        :param window: Size of withheld tail in bytes after which trimmer tries to pass the data through. Defaults to 1_048_576.
+        :type window: int
+        """
+
+        self.rows: int = rows
+        self.window: int = window
+        self._buffer: bytearray = bytearray()
+        self._at_start: bool = True
+
+    def _record_ends(self, final: bool) -> Generator[tuple[int, int], None, None]:
+        """Scans the buffer backwards, buffer always starts at the record boundary. 
+
+        :param final: Flag, if True bytes after the last line break are treated as complete record.
+        :type final: bool
+        :yield: Start and end offsets of non-blank, complete records, starting from the last one.
+        :rtype: tuple[int, int]
+        """
+
+        buffer = self._buffer
+        end = len(buffer)
+        quotes = buffer.count(b'"')
+        record_end = end if final else None
+
+        while end > 0:
+            newline = buffer.rfind(b'\n', 0, end)
+            quotes -= buffer.count(b'"', newline + 1, end)
+
+            if quotes % 2 == 0:
+                if record_end is not None and buffer[newline + 1:record_end].strip():
+                    yield newline + 1, record_end
+                record_end = newline + 1
+
+            if newline < 0:
+                break
+            end = newline
+
+        return None
+
+    def _cut(self, final: bool) -> int | None:
+        """Finds the end of the last record preceding `rows` non-blank records.
+
+        :param final: Flag, if True bytes after the last line break are treated as complete record.
+        :type final: bool
+        :return: Offset in the buffer or None if buffer doesn't hold enough records.
+        :rtype: int | None
+        """
+
+        for num, (_, record_end) in enumerate(self._record_ends(final)):
+            if num == self.rows:
+                return record_end
+
+        return None
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Consumes the chunk of data stream.
+
+        :param chunk: Chunk of data stream.
+        :type chunk: bytes
+        :return: Bytes which for sure are not part of the footer.
+        :rtype: bytes
+        """
+
+        self._buffer += chunk
+
+        if len(self._buffer) < 2 * self.window:
+            return b''
+
+        cut = self._cut(final=False)
+
+        if not cut:
+            return b''
+
+        self._at_start = False
+        passed = bytes(self._buffer[:cut])
+        del self._buffer[:cut]
+
+        return passed
+
+    def finish(self) -> bytes:
+        """Ends the data stream, removes the footer and trailing blank lines.
+
+        :return: Remaining bytes without the footer.
+        :rtype: bytes
+        """
+
+        cut = self._cut(final=True)
+
+        if cut is None:
+            records = list(self._record_ends(final=True))
+            cut = records[-1][1] if records and self._at_start else 0
+
+        passed = bytes(self._buffer[:cut])
+        self._buffer.clear()
+
+        return passed
+
+
+class ContentHasher():
+    """Concrete class representing SHA-256 hash of CSV data stream without the footer, computed chunk by chunk as the stream comes.
+    """
+
+    def __init__(self, rows: int = FOOTER_ROWS):
+        """Constructor method for ContentHasher.
+
+        :param rows: Number of footer records excluded from the hash. Defaults to FOOTER_ROWS.
+        :type rows: int
+        """
+
+        self._trimmer: FooterTrimmer = FooterTrimmer(rows)
+        self._hash = hashlib.sha256()
+
+    def update(self, chunk: bytes) -> None:
+        """Consumes the chunk of data stream.
+
+        :param chunk: Chunk of data stream.
+        :type chunk: bytes
+        """
+
+        self._hash.update(self._trimmer.feed(chunk))
+
+        return None
+
+    def hexdigest(self) -> str:
+        """Ends the data stream and returns the hash.
+
+        :return: Hash of the data stream without the footer.
+        :rtype: str
+        """
+
+        self._hash.update(self._trimmer.finish())
+
+        return self._hash.hexdigest()
+
+
+def _header_end(buffer: bytes | bytearray) -> int | None:
+    """Finds the end of the header record with respect to quoted fields.
+
+    :param buffer: Beginning of CSV data stream.
+    :type buffer: bytes | bytearray
+    :return: Offset right after the header record or None if buffer doesn't hold entire header.
+    :rtype: int | None
+    """
+
+    newline = buffer.find(b'\n')
+
+    while newline >= 0:
+        if buffer.count(b'"', 0, newline) % 2 == 0:
+            return newline + 1
+        newline = buffer.find(b'\n', newline + 1)
+
+    return None
+
+
+def merge_exports(sources: list[os.PathLike | bytes], chunk_size: int = 1_048_576) -> Generator[bytes, None, None]:
+    """Merges SFDC exports of the same report (e.g. date range shards) into a single export at byte level.
+    Header is taken from the first export only, footer from the last export only, so the merged stream has the shape
+    of a single export and is processed as one.
+
+    :param sources: Collection of paths to spool files or responses encoded to bytes, in order.
+    :type sources: list[os.PathLike | bytes]
+    :param chunk_size: Size of a single chunk in bytes read from spool files. Defaults to 1_048_576.
+    :type chunk_size: int
+    :yield: Chunk of merged export.
+    :rtype: bytes
+    """
+
+    last = len(sources) - 1
+
+    for num, source in enumerate(sources):
+        trimmer = FooterTrimmer() if num < last else None
+        header = bytearray() if num > 0 else None
+
+        with (open(source, 'rb') if not isinstance(source, bytes) else nullcontext()) as input:
+            chunks = iter(lambda: input.read(chunk_size), b'') if input else (source,)
+
+            for chunk in chunks:
+                if header is not None:
+                    header += chunk
+                    end = _header_end(header)
+                    if end is None:
+                        continue
+                    chunk, header = bytes(header[end:]), None
+
+                yield trimmer.feed(chunk) if trimmer else chunk
+
+        if trimmer:
+            yield trimmer.finish()
+
+    return None
+
+
+def report_file_path(report: Any) -> Path:
+    """Parses path to save location of the report.
+
+    :param report: Instance of the ReportProtocol object.
+    :type report: ReportProtocol
+    :return: Path to save location
+    :rtype: Path
+    """
+    return Path(f'{"/".join([str(report.path), report.name])}{OUTPUT_FORMATS[report.output_format]}')
+
+
+def _fsync_path(path: os.PathLike) -> None:
+    """Flushes file or directory to disk. Directories can't be flushed on Windows, those are skipped.
+    """
+
+    if os.path.isdir(path) and os.name == 'nt':
+        return None
+
+    fd = os.open(path, os.O_RDONLY if os.path.isdir(path) else os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+    return None
+
+
+@contextmanager
+def atomic_write(file_path: os.PathLike, fsync: str = 'file') -> Generator[Path, None, None]:
+    """Provides temporary path in the directory of the file, the file is moved into place only once writing succeeds,
+    so readers never see half-written file. Temporary file is removed on failure.
+    - none: temporary file is renamed without flushing, safe against crash of the app only,
+    - file: temporary file is flushed to disk before the rename,
+    - full: directory is flushed to disk after the rename as well, rename survives power loss.
+
+    :param file_path: Path to save location.
+    :type file_path: os.PathLike
+    :param fsync: Fsync policy, one of `FSYNC_POLICIES`. Defaults to 'file'.
+    :type fsync: str
+    :yield: Temporary path to write to.
+    :rtype: Path
+    """
+
+    file_path = Path(file_path)
+    temp_path = file_path.with_name(f'.{file_path.name}.{uuid.uuid4().hex}.tmp')
+
+    try:
+        yield temp_path
+
+        if fsync != 'none':
+            _fsync_path(temp_path)
+
+        os.replace(temp_path, file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    if fsync == 'full':
+        _fsync_path(file_path.parent)
+
+    return None
+
+
+def file_size(file_path: os.PathLike) -> float:
+    """Returns size of the file on disk in Mb.
+
+    :param file_path: Path to the file.
+    :type file_path: os.PathLike
+    :return: Size of the file in Mb.
+    :rtype: float
+    """
+    return round(os.stat(file_path).st_size / (1024 * 1024), 3)
+
+
+def passthrough_content(source: os.PathLike | bytes,
+                        file_path: os.PathLike,
+                        output_format: str = 'csv',
+                        chunk_size: int = 1_048_576,
+                        fsync: str = 'file') -> float:
+    """Copies raw SFDC export to the file without parsing and removes the footer at byte level. File is written atomically.
+
+    :param source: Path to spool file or response encoded to bytes.
+    :type source: os.PathLike | bytes
+    :param file_path: Path to save location.
+    :type file_path: os.PathLike
+    :param output_format: Output format, one of `PASSTHROUGH_FORMATS`. Defaults to 'csv'.
+    :type output_format: str
+    :param chunk_size: Size of a single chunk in bytes. Defaults to 1_048_576.
+    :type chunk_size: int
+    :param fsync: Fsync policy, one of `FSYNC_POLICIES`. Defaults to 'file'.
+    :type fsync: str
+    :return: Size of saved file in Mb.
+    :rtype: float
+    """
+
+    trimmer = FooterTrimmer()
+    opener = gzip.open if output_format == 'csv.gz' else open
+
+    with atomic_write(file_path, fsync) as temp_path, opener(temp_path, 'wb') as output:
+        if isinstance(source, bytes):
+            output.write(trimmer.feed(source))
+        else:
+            with open(source, 'rb') as input:
+                while chunk := input.read(chunk_size):
+                    output.write(trimmer.feed(chunk))
+
+        output.write(trimmer.finish())
+
+    return file_size(file_path)
+
+
+def read_content(source: os.PathLike | StringIO) -> pd.DataFrame:
+    """Reads SFDC export via Pandas read method and removes the footer.
+
+    :param source: Path to spool file or response wrapped in buffer.
+    :type source: os.PathLike | StringIO
+    :return: Content of the report without footer.
+    :rtype: pd.DataFrame
+    """
+
+    import pandas as pd
+
+    content = pd.read_csv(source,
+                          dtype='string',
+                          encoding='UTF-8',
+                          low_memory=False)
+
+    return content.head(content.shape[0] - FOOTER_ROWS)
+
+
+def _detect_dtype(values: pd.Series) -> str | None:
+    """Detects dtype of string column. Columns with leading zeros are kept as strings to protect identifiers.
+
+    :param values: Column with string values.
+    :type values: pd.Series
+    :return: Detected dtype -> `Int64`, `Float64`, `datetime64[ns]`, `string` or None if column has no values.
+    :rtype: str | None
+    """
+
+    import pandas as pd
+
+    values = values.dropna()
+
+    if values.empty:
+        return None
+
+    if not values.str.match(r'^[+-]?0\d').any():
+        try:
+            return 'Int64' if pd.to_numeric(values).dtype.kind in 'iu' else 'Float64'
+        except (ValueError, TypeError):
+            pass
+
+    if values.str.contains(r'\d[/.-]\d').all():
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                pd.to_datetime(values)
+            return 'datetime64[ns]'
+        except (ValueError, TypeError, OverflowError):
+            pass
+
+    return 'string'
+
+
+def detect_dtypes(content: pd.DataFrame) -> dict[str, str | None]:
+    """Detects dtypes of content read as strings.
+
+    :param content: Content of the report with string columns.
+    :type content: pd.DataFrame
+    :return: Detected dtype for every column, None for columns without values.
+    :rtype: dict[str, str | None]
+    """
+    return {column: _detect_dtype(content[column]) for column in content.columns}
+
+
+def merge_dtypes(dtypes: dict[str, str | None], other: dict[str, str | None]) -> dict[str, str | None]:
+    """Merges dtypes detected in two parts of the same content, e.g. two chunks.
+
+    :param dtypes: Dtypes detected in the first part.
+    :type dtypes: dict[str, str | None]
+    :param other: Dtypes detected in the second part.
+    :type other: dict[str, str | None]
+    :return: Dtypes valid for both parts.
+    :rtype: dict[str, str | None]
+    """
+
+    merged = {}
+
+    for column in dtypes.keys() | other.keys():
+        first, second = dtypes.get(column), other.get(column)
+
+        if first is None or first == second:
+            merged[column] = second
+        elif second is None:
+            merged[column] = first
+        elif {first, second} == {'Int64', 'Float64'}:
+            merged[column] = 'Float64'
+        else:
+            merged[column] = 'string'
+
+    return merged
+
+
+def apply_dtypes(content: pd.DataFrame, dtypes: dict[str, str | None]) -> pd.DataFrame:
+    """Converts string columns of the content to given dtypes.
+
+    :param content: Content of the report with string columns.
+    :type content: pd.DataFrame
+    :param dtypes: Dtypes of columns, columns with `string` or None are left untouched.
+    :type dtypes: dict[str, str | None]
+    :return: Content of the report with converted columns.
+    :rtype: pd.DataFrame
+    """
+
+    import pandas as pd
+
+    for column, dtype in dtypes.items():
+        if dtype in ('Int64', 'Float64'):
+            content[column] = pd.to_numeric(content[column]).astype(dtype)
+        elif dtype == 'datetime64[ns]':
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                content[column] = pd.to_datetime(content[column])
+
+    return content
+
+
+def infer_dtypes(content: pd.DataFrame) -> pd.DataFrame:
+    """Infers numeric and datetime columns of content read as strings. Columns with leading zeros are kept as strings
+    to protect identifiers, columns which can't be converted entirely are kept as strings.
+
+    :param content: Content of the report with string columns.
+    :type content: pd.DataFrame
+    :return: Content of the report with inferred dtypes.
+    :rtype: pd.DataFrame
+    """
+    return apply_dtypes(content, detect_dtypes(content))
+
+
+def save_content(content: pd.DataFrame, file_path: os.PathLike, output_format: str = 'csv', fsync: str = 'file') -> float:
+    """Saves content to the file in given format using Pandas save methods. File is written atomically.
+    Parquet and Feather files are compressed with default codecs (snappy and lz4), dtypes are inferred before saving.
+
+    :param content: Content of the report.
+    :type content: pd.DataFrame
+    :param file_path: Path to save location.
+    :type file_path: os.PathLike
+    :param output_format: Output format, one of `OUTPUT_FORMATS`. Defaults to 'csv'.
+    :type output_format: str
+    :param fsync: Fsync policy, one of `FSYNC_POLICIES`. Defaults to 'file'.
+    :type fsync: str
+    :return: Size of saved file in Mb.
+    :rtype: float
+    """
+
+    with atomic_write(file_path, fsync) as temp_path:
+        if output_format == 'parquet':
+            infer_dtypes(content).to_parquet(temp_path, index=False)
+        elif output_format == 'feather':
+            infer_dtypes(content).reset_index(drop=True).to_feather(temp_path)
+        else:
+            content.to_csv(temp_path, index=False,
+                           compression='gzip' if output_format == 'csv.gz' else None)
+
+    return file_size(file_path)
+
+
+def read_content_chunks(source: os.PathLike | StringIO, chunk_rows: int) -> Generator[pd.DataFrame, None, None]:
+    """Reads SFDC export via Pandas read method in chunks of fixed number of rows. Last rows of every chunk are held back
+    and joined with the next chunk, so the footer is removed even if it is split between the last two chunks.
+
+    :param source: Path to spool file or response wrapped in buffer, buffer is read from the beginning.
+    :type source: os.PathLike | StringIO
+    :param chunk_rows: Number of rows in a single chunk.
+    :type chunk_rows: int
+    :yield: Chunk of content without footer, the first chunk is yielded even if it's empty.
+    :rtype: pd.DataFrame
+    """
+
+    import pandas as pd
+
+    if isinstance(source, StringIO):
+        source.seek(0)
+
+    tail = None
+
+    with pd.read_csv(source,
+                     dtype='string',
+                     encoding='UTF-8',
+                     chunksize=chunk_rows) as reader:
+        for num, chunk in enumerate(reader):
+            if tail is not None:
+                chunk = pd.concat([tail, chunk])
+
+            tail = chunk.iloc[-FOOTER_ROWS:]
+            body = chunk.iloc[:-FOOTER_ROWS]
+
+            if num == 0 or not body.empty:
+                yield body
+
+    return None
+
+
+def save_content_chunks(source: os.PathLike | StringIO,
+                        file_path: os.PathLike,
+                        output_format: str = 'csv',
+                        chunk_rows: int = 100_000,
+                        fsync: str = 'file') -> float:
+    """Saves content to the file in given format chunk by chunk, so memory usage doesn't depend on the size of the report.
+    File is written atomically.
+    For Parquet and Feather dtypes are detected in the first pass over all chunks, so all chunks share the same schema.
+
+    :param source: Path to spool file or response wrapped in buffer.
+    :type source: os.PathLike | StringIO
+    :param file_path: Path to save location.
+    :type file_path: os.PathLike
+    :param output_format: Output format, one of `OUTPUT_FORMATS`. Defaults to 'csv'.
+    :type output_format: str
+    :param chunk_rows: Number of rows in a single chunk. Defaults to 100_000.
+    :type chunk_rows: int
+    :param fsync: Fsync policy, one of `FSYNC_POLICIES`. Defaults to 'file'.
+    :type fsync: str
+    :return: Size of saved file in Mb.
+    :rtype: float
+    """
+
+    with atomic_write(file_path, fsync) as temp_path:
+        _write_content_chunks(source, temp_path, output_format, chunk_rows)
+
+    return file_size(file_path)
+
+
+def _write_content_chunks(source: os.PathLike | StringIO, file_path: os.PathLike, output_format: str, chunk_rows: int) -> None:
+    """Writes content to the file chunk by chunk, see `save_content_chunks`.
+    """
+
+    if output_format in ('parquet', 'feather'):
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        dtypes = {}
+        for chunk in read_content_chunks(source, chunk_rows):
+            dtypes = merge_dtypes(dtypes, detect_dtypes(chunk))
+
+        writer = schema = None
+        try:
+            for chunk in read_content_chunks(source, chunk_rows):
+                table = pa.Table.from_pandas(apply_dtypes(chunk, dtypes),
+                                             schema=schema,
+                                             preserve_index=False)
+                if writer is None:
+                    schema = table.schema
+                    writer = (pyarrow.parquet.ParquetWriter(file_path, table.schema) if output_format == 'parquet'
+                              else pyarrow.ipc.new_file(file_path, table.schema,
+                                                        options=pyarrow.ipc.IpcWriteOptions(compression='lz4')))
+                writer.write_table(table)
+        finally:
+            if writer:
+                writer.close()
+    else:
+        opener = gzip.open if output_format == 'csv.gz' else open
+
+        with opener(file_path, 'wt', encoding='UTF-8', newline='') as output:
+            for num, chunk in enumerate(read_content_chunks(source, chunk_rows)):
+                chunk.to_csv(output, index=False, header=num == 0)
+
+    return None
+
+
+def process_spool_file(spool_path: os.PathLike,
+                       file_path: os.PathLike,
+                       output_format: str = 'csv',
+                       passthrough: bool = False,
+                       chunk_rows: int = 0,
+                       fsync: str = 'file') -> dict[str, Any]:
+    """Reads spool file, removes the footer and saves content to the file. Designed to be run in separate process,
+    takes only paths and returns only report metadata so no content is pickled between processes.
+
+    :param spool_path: Path to spool file with the response.
+    :type spool_path: os.PathLike
+    :param file_path: Path to save location.
+    :type file_path: os.PathLike
+    :param output_format: Output format, one of `OUTPUT_FORMATS`. Defaults to 'csv'.
+    :type output_format: str
+    :param passthrough: Flag, if True spool file is copied without parsing when output format allows. Defaults to False.
+    :type passthrough: bool
+    :param chunk_rows: Number of rows in a single chunk, 0 means entire content is read at once. Defaults to 0.
+    :type chunk_rows: int
+    :param fsync: Fsync policy, one of `FSYNC_POLICIES`. Defaults to 'file'.
+    :type fsync: str
+    :return: Report metadata -> `downloaded`, `size`, `parsed_date`, `pull_date`, and `error` if the file hasn't been saved (size is 0.0 then).
+    :rtype: dict[str, Any]
+    """
+
+    import pandas as pd
+
+    parsed_date = None
+
+    try:
+        if passthrough and output_format in PASSTHROUGH_FORMATS:
+            size = passthrough_content(spool_path, file_path, output_format, fsync=fsync)
+        elif chunk_rows:
+            size = save_content_chunks(spool_path, file_path, output_format, chunk_rows, fsync)
+        else:
+            content = read_content(spool_path)
+            parsed_date = datetime.now()
+            size = save_content(content, file_path, output_format, fsync)
+    except (pd.errors.EmptyDataError, pd.errors.ParserError, *WRITE_ERRORS) as e:
+        logger_main.warning('%s not saved: %r', file_path, e)
+        return {'downloaded': False, 'size': 0.0, 'parsed_date': parsed_date, 'pull_date': datetime.now(), 'error': repr(e)}
+
+    return {'downloaded': True, 'size': size, 'parsed_date': parsed_date, 'pull_date': datetime.now()}
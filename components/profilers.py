@@ -0,0 +1,189 @@
+import os
+import csv
+import cProfile
+import logging
+import tracemalloc
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from threading import Lock, current_thread
+from typing import ContextManager, Generator, Protocol, runtime_checkable
+
+from components.containers import ReportProtocol
+from components.processors import atomic_write
+
+
+logger_main = logging.getLogger(__name__)
+
+
+MEMORY_STAGES = ('download', 'parse', 'write')
+
+
+@runtime_checkable
+class ProfilerProtocol(Protocol):
+    """Protocol class for profiler of the run.
+
+    :param profile_path: Directory of profiling results.
+    :type profile_path: os.PathLike
+    """
+
+    profile_path: os.PathLike
+
+    def profile(self, name: str) -> ContextManager[None]:
+        """Collects CPU profile of the code run within the context in the current thread.
+
+        :param name: Name of the profile, e.g. name of the thread.
+        :type name: str
+        """
+        ...
+
+    def snapshot(self, stage: str, report: ReportProtocol) -> None:
+        """Records memory allocated once the report reached the stage.
+
+        :param stage: Processing stage, one of `MEMORY_STAGES`.
+        :type stage: str
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+        ...
+
+    def dump(self) -> None:
+        """Saves collected profiles and memory snapshots.
+        """
+        ...
+
+
+class RunProfiler():
+    """Concrete class representing opt-in profiler of the run.
+    - cpu: cProfile stats collected separately for every thread (event loop, each worker), saved as `<name>.pstats`
+    readable by `pstats`, snakeviz or gprof2dot,
+    - memory: traced memory (tracemalloc) recorded for every report at download, parse and write stages in `memory.csv`,
+    snapshot of the stage is saved as `<stage>.snapshot` (`tracemalloc.Snapshot.load`) whenever the stage reaches new peak,
+    together with the top allocations of the snapshot in `<stage>_top.txt`.
+    """
+
+    def __init__(self, profile_path: os.PathLike, *, cpu: bool = False, memory: bool = False, frames: int = 10, top: int = 25):
+        """Constructor method for RunProfiler, starts tracing of memory allocations if `memory` is set.
+
+        :param profile_path: Directory of profiling results.
+        :type profile_path: os.PathLike
+        :param cpu: Flag, if True CPU profiles are collected. Defaults to False.
+        :type cpu: bool
+        :param memory: Flag, if True memory allocations are traced. Defaults to False.
+        :type memory: bool
+        :param frames: Number of frames kept for every traced allocation. Defaults to 10.
+        :type frames: int
+        :param top: Number of the top allocations listed for every stage. Defaults to 25.
+        :type top: int
+        """
+
+        self.profile_path: os.PathLike = profile_path
+        self.cpu: bool = cpu
+        self.memory: bool = memory
+        self.top: int = top
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._memory_rows: list[list] = []
+        self._stage_peaks: dict[str, int] = {}
+        self._lock: Lock = Lock()
+
+        Path(self.profile_path).mkdir(parents=True, exist_ok=True)
+
+        if self.memory:
+            logger_main.info('Tracing memory allocations, results saved in %s', self.profile_path)
+            tracemalloc.start(frames)
+
+    @contextmanager
+    def profile(self, name: str) -> Generator[None, None, None]:
+        """Collects CPU profile of the code run within the context in the current thread only,
+        profiles of the same name are accumulated.
+
+        :param name: Name of the profile, e.g. name of the thread.
+        :type name: str
+        """
+
+        if not self.cpu:
+            yield None
+            return None
+
+        with self._lock:
+            profiler = self._profiles.setdefault(name, cProfile.Profile())
+
+        profiler.enable()
+        try:
+            yield None
+        finally:
+            profiler.disable()
+
+    def snapshot(self, stage: str, report: ReportProtocol) -> None:
+        """Records memory traced once the report reached the stage. Snapshot of all allocations is taken
+        only if traced memory is the highest seen at the stage, it replaces the previous snapshot of the stage.
+
+        :param stage: Processing stage, one of `MEMORY_STAGES`.
+        :type stage: str
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+
+        if not self.memory or not tracemalloc.is_tracing():
+            return None
+
+        current, peak = tracemalloc.get_traced_memory()
+
+        with self._lock:
+            self._memory_rows.append([datetime.now().isoformat(), stage, report.name,
+                                      current_thread().name, current, peak])
+
+            if current <= self._stage_peaks.get(stage, 0):
+                return None
+
+            self._stage_peaks[stage] = current
+
+        logger_main.debug('New peak of traced memory at %s stage: %s bytes, taking snapshot', stage, current)
+
+        snapshot = tracemalloc.take_snapshot()
+
+        with atomic_write(Path(self.profile_path, f'{stage}.snapshot'), 'none') as temp_path:
+            snapshot.dump(temp_path)
+
+        return None
+
+    def _dump_memory(self) -> None:
+        """Saves traced memory of every report and stage and the top allocations of snapshots of every stage.
+        """
+
+        with open(Path(self.profile_path, 'memory.csv'), 'w', encoding='UTF8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['date', 'stage', 'report', 'thread', 'traced_bytes', 'peak_bytes'])
+            writer.writerows(self._memory_rows)
+
+        for stage in MEMORY_STAGES:
+            snapshot_path = Path(self.profile_path, f'{stage}.snapshot')
+
+            if not snapshot_path.exists():
+                continue
+
+            statistics = tracemalloc.Snapshot.load(snapshot_path).statistics('lineno')
+
+            with open(Path(self.profile_path, f'{stage}_top.txt'), 'w', encoding='UTF8') as f:
+                f.write(f'Top {self.top} allocations at the peak of {stage} stage '
+                        f'({self._stage_peaks[stage] / 1024 / 1024:.1f} Mb traced)\n\n')
+                for stat in statistics[:self.top]:
+                    f.write(f'{stat}\n')
+
+        return None
+
+    def dump(self) -> None:
+        """Saves CPU profile of every thread and results of memory tracing, tracing of memory is stopped.
+        """
+
+        for name, profiler in self._profiles.items():
+            profiler.dump_stats(Path(self.profile_path, f'{name}.pstats'))
+
+        if self.memory:
+            tracemalloc.stop()
+            self._dump_memory()
+
+        logger_main.info('Profiling results saved in %s', self.profile_path)
+
+        return None
@@ -0,0 +1,149 @@
+import logging
+
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any
+
+
+logger_main = logging.getLogger(__name__)
+
+
+STAGES = ('wait', 'first_byte', 'download', 'queue', 'parse', 'write', 'total')
+
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, float('inf'))
+
+SIZE_BUCKETS = (100 * 1024, 1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2, 1024 ** 3, float('inf'))
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def _seconds(start: datetime | None, end: datetime | None) -> float | None:
+    """Returns time between two timestamps in seconds, None if any of them is missing.
+    """
+
+    if start is None or end is None:
+        return None
+
+    return (end - start).total_seconds()
+
+
+def stage_durations(report: Any) -> dict[str, float | None]:
+    """Computes durations of processing stages of the report in seconds, missing stages are None.
+    - wait: from the first request until the last attempt was sent, covers concurrency limit and retries,
+    - first_byte: from the request until response headers,
+    - download: from response headers until the end of the body,
+    - queue: from the handoff to the queue until the worker took the report, covers wait for free space in the queue,
+    - parse: from the worker taking the report until content was parsed,
+    - write: from parsed content (or from the worker taking the report) until the file was written,
+    - total: from the first request until the file was written.
+
+    :param report: Instance of the ReportProtocol object.
+    :type report: ReportProtocol
+    :return: Durations of stages in seconds.
+    :rtype: dict[str, float | None]
+    """
+
+    timings = report.timings
+
+    return {'wait': _seconds(report.created_date, timings.request_sent),
+            'first_byte': _seconds(timings.request_sent, timings.first_byte),
+            'download': _seconds(timings.first_byte, timings.body_complete),
+            'queue': _seconds(timings.enqueued, timings.dequeued),
+            'parse': _seconds(timings.dequeued, timings.parsed),
+            'write': _seconds(timings.parsed or timings.dequeued, timings.written),
+            'total': _seconds(report.created_date if timings.request_sent else None, timings.written)}
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Returns percentile of sorted values with linear interpolation.
+    """
+
+    position = (len(values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def histogram(values: list[float], buckets: tuple[float, ...]) -> list[dict[str, Any]]:
+    """Counts values in buckets, every value is counted in the first bucket with upper bound not lower than the value.
+
+    :param values: Collection of values.
+    :type values: list[float]
+    :param buckets: Upper bounds of buckets in ascending order, the last one should be infinity.
+    :type buckets: tuple[float, ...]
+    :return: Collection of buckets -> `le` (upper bound, `+Inf` for infinity) and `count`.
+    :rtype: list[dict[str, Any]]
+    """
+
+    counts = [0] * len(buckets)
+
+    for value in values:
+        counts[next(num for num, bound in enumerate(buckets) if value <= bound)] += 1
+
+    return [{'le': '+Inf' if bound == float('inf') else bound, 'count': count}
+            for bound, count in zip(buckets, counts)]
+
+
+def aggregate(values: list[float], buckets: tuple[float, ...]) -> dict[str, Any]:
+    """Aggregates values into count, mean, percentiles, max and histogram.
+
+    :param values: Collection of values.
+    :type values: list[float]
+    :param buckets: Upper bounds of histogram buckets in ascending order.
+    :type buckets: tuple[float, ...]
+    :return: Aggregated values.
+    :rtype: dict[str, Any]
+    """
+
+    values = sorted(values)
+
+    if not values:
+        return {'count': 0}
+
+    return {'count': len(values),
+            'mean': round(sum(values) / len(values), 4),
+            **{f'p{int(q * 100)}': round(_percentile(values, q), 4) for q in PERCENTILES},
+            'max': round(values[-1], 4),
+            'histogram': histogram(values, buckets)}
+
+
+def run_profile(reports: list[Any]) -> dict[str, Any]:
+    """Creates profile of the run -> totals, aggregated durations of stages, aggregated response sizes and details of every report.
+    Reports resumed from the previous run are counted, but not profiled.
+
+    :param reports: Collection of reports.
+    :type reports: list[ReportProtocol]
+    :return: Profile of the run.
+    :rtype: dict[str, Any]
+    """
+
+    logger_main.debug("Creating run profile")
+
+    profiled = [report for report in reports if not report.resumed]
+    durations = [stage_durations(report) for report in profiled]
+    requested = [report.created_date for report in profiled if report.timings.request_sent]
+    written = [report.timings.written for report in profiled if report.timings.written]
+
+    return {'started': min(requested).isoformat() if requested else None,
+            'finished': max(written).isoformat() if written else None,
+            'reports': len(reports),
+            'valid': sum(report.valid for report in reports),
+            'resumed': len(reports) - len(profiled),
+            'attempts': sum(report.attempt_count for report in profiled),
+            'retries': sum(report.retry_count for report in profiled),
+            'bytes_transferred': sum(report.bytes_transferred for report in profiled),
+            'stages': {stage: aggregate([stages[stage] for stages in durations if stages[stage] is not None],
+                                        DURATION_BUCKETS)
+                       for stage in STAGES},
+            'response_bytes': aggregate([report.bytes_transferred for report in profiled if report.valid], SIZE_BUCKETS),
+            'details': [{'name': report.name,
+                         'id': report.id,
+                         'valid': report.valid,
+                         'attempt_count': report.attempt_count,
+                         'bytes_transferred': report.bytes_transferred,
+                         'created_date': report.created_date.isoformat(),
+                         'timings': {stage: date.isoformat() if date else None
+                                     for stage, date in asdict(report.timings).items()},
+                         'stages': stages}
+                        for report, stages in zip(profiled, durations)]}
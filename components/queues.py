@@ -0,0 +1,175 @@
+import os
+import asyncio
+import logging
+
+from collections import deque
+from queue import Full, Queue
+from time import monotonic
+from typing import Any
+
+
+logger_main = logging.getLogger(__name__)
+
+
+def payload_size(item: Any) -> int:
+    """Returns size in bytes of the payload carried by the queue item, spool file size in streaming mode,
+    length of the response otherwise. Payload of sharded report is the sum of payloads of its shards.
+
+    :param item: Queue item, instance of the ReportProtocol object or None.
+    :type item: Any
+    :return: Size of the payload in bytes.
+    :rtype: int
+    """
+
+    if getattr(item, 'parts', None):
+        return sum(payload_size(part) for part in item.parts)
+
+    if getattr(item, 'spool_path', None):
+        try:
+            return os.stat(item.spool_path).st_size
+        except OSError:
+            return 0
+
+    return len(getattr(item, 'response', '') or '')
+
+
+class HandoffQueue(Queue):
+    """Concrete class representing thread-safe queue between downloader and workers, bounded by number of items
+    and/or total size of their payloads. Asynchronous side awaits free space without blocking the event loop.
+    """
+
+    def __init__(self, maxsize: int = 0, *, max_bytes: int = 0):
+        """Constructor method for HandoffQueue.
+
+        :param maxsize: Maximum number of items in the queue, 0 means no limit. Defaults to 0.
+        :type maxsize: int
+        :param max_bytes: Maximum total size of payloads in the queue in bytes, 0 means no limit.
+        Single item bigger than the limit is accepted once the queue is empty. Defaults to 0.
+        :type max_bytes: int
+        """
+
+        super().__init__(maxsize)
+        self.max_bytes: int = max_bytes
+        self.bytes: int = 0
+        self.max_depth: int = 0
+        self.max_bytes_seen: int = 0
+        self.put_count: int = 0
+        self.put_wait_time: float = 0.0
+        self._sizes: deque[int] = deque()
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def _put(self, item: Any) -> None:
+        size = payload_size(item)
+        self.queue.append(item)
+        self._sizes.append(size)
+        self.bytes += size
+        self.max_depth = max(self.max_depth, len(self.queue))
+        self.max_bytes_seen = max(self.max_bytes_seen, self.bytes)
+
+    def _get(self) -> Any:
+        self.bytes -= self._sizes.popleft()
+        item = self.queue.popleft()
+        self._wake_up_async_waiters()
+
+        return item
+
+    def _wake_up_async_waiters(self) -> None:
+        """Wakes up asynchronous producers waiting for free space, called with the mutex held.
+        """
+
+        for loop, waiter in self._async_waiters:
+            loop.call_soon_threadsafe(
+                lambda waiter=waiter: waiter.done() or waiter.set_result(None))
+        self._async_waiters.clear()
+
+    def _is_full_for(self, size: int) -> bool:
+        """Checks if item of given payload size fits into the queue, called with the mutex held.
+
+        :param size: Size of the payload in bytes.
+        :type size: int
+        :return: Flag, True if item doesn't fit, False otherwise.
+        :rtype: bool
+        """
+
+        if 0 < self.maxsize <= self._qsize():
+            return True
+
+        return 0 < self.max_bytes < self.bytes + size and self._qsize() > 0
+
+    def full(self) -> bool:
+        with self.mutex:
+            return self._is_full_for(0)
+
+    def put(self, item: Any, block: bool = True, timeout: float | None = None) -> None:
+        """Puts item into the queue, blocks the thread while the queue is full.
+        """
+
+        size = payload_size(item)
+
+        with self.not_full:
+            if not block:
+                if self._is_full_for(size):
+                    raise Full
+            elif timeout is None:
+                while self._is_full_for(size):
+                    self.not_full.wait()
+            else:
+                deadline = monotonic() + timeout
+                while self._is_full_for(size):
+                    remaining = deadline - monotonic()
+                    if remaining <= 0.0:
+                        raise Full
+                    self.not_full.wait(remaining)
+
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+        return None
+
+    async def async_put(self, item: Any) -> float:
+        """Puts item into the queue, awaits free space without blocking the event loop.
+
+        :param item: Queue item, instance of the ReportProtocol object.
+        :type item: Any
+        :return: Time spent on waiting for free space in seconds.
+        :rtype: float
+        """
+
+        loop = asyncio.get_running_loop()
+        size = payload_size(item)
+        start = monotonic()
+
+        while True:
+            with self.mutex:
+                if not self._is_full_for(size):
+                    self._put(item)
+                    self.unfinished_tasks += 1
+                    self.not_empty.notify()
+                    break
+
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+
+            await waiter
+
+        wait_time = monotonic() - start
+        self.put_count += 1
+        self.put_wait_time += wait_time
+
+        return wait_time
+
+    def stats(self) -> dict[str, float]:
+        """Returns statistics of the queue.
+
+        :return: Current and maximum depth, current and maximum size of payloads in bytes, total and average wait time of producers.
+        :rtype: dict[str, float]
+        """
+
+        with self.mutex:
+            return {'depth': self._qsize(),
+                    'max_depth': self.max_depth,
+                    'bytes': self.bytes,
+                    'max_bytes': self.max_bytes_seen,
+                    'put_wait_time': round(self.put_wait_time, 3),
+                    'avg_put_wait_time': round(self.put_wait_time / self.put_count, 3) if self.put_count else 0.0}
@@ -0,0 +1,392 @@
+import os
+import signal
+import asyncio
+import logging
+
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Protocol, runtime_checkable
+
+from components.connectors import Connector
+from components.containers import ReportProtocol, ReportsContainerProtocol
+from components.metrics import MetricsProtocol
+
+
+logger_main = logging.getLogger(__name__)
+
+
+RECONNECT_DELAY = 60.0
+
+
+@dataclass(slots=True)
+class ScheduledReport():
+    """Concrete class representing entry of the schedule in daemon mode.
+
+    :param params: Parameters of the report taken from the reports list.
+    :type params: dict[str, Any]
+    :param interval: Interval in seconds between runs of the report.
+    :type interval: float
+    :param next_run: Monotonic time of the next run of the report.
+    :type next_run: float
+    :param report: Report of the last run, None if the report hasn't been requested yet. Defaults to None.
+    :type report: ReportProtocol | None
+    :param runs: Number of runs started. Defaults to 0 .
+    :type runs: int
+    :param skipped: Number of runs skipped as the previous run was not finished. Defaults to 0 .
+    :type skipped: int
+    """
+
+    params: dict[str, Any]
+    interval: float
+    next_run: float
+    report: ReportProtocol | None = None
+    runs: int = 0
+    skipped: int = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self.report and not self.report.finished)
+
+
+@runtime_checkable
+class SchedulerProtocol(Protocol):
+    """Protocol class for scheduler of reports in daemon mode.
+    """
+
+    async def serve(self) -> None:
+        """Requests reports on their intervals until stopped.
+        """
+        ...
+
+    def stop(self) -> None:
+        """Stops requesting new reports.
+        """
+        ...
+
+    def close(self) -> None:
+        """Records reports finished after the scheduler has been stopped.
+        """
+        ...
+
+
+class ReportScheduler():
+    """Concrete class representing in-process scheduler of reports in daemon mode. Single session of the connector
+    (SID, connection pool) and single pool of workers are kept alive, every report is requested on its own interval:
+    - reports due at the same tick are requested together, so identical requests are still coalesced,
+    - run of the report is skipped if its previous run is not finished yet (still downloading or waiting for the worker),
+    - reports list is reloaded once its modification time changes, new reports are requested at once, removed reports
+    are no longer scheduled and changed intervals apply from the last run; invalid reports list keeps the previous schedule,
+    - SIGINT / SIGTERM (Ctrl+C on Windows) stops scheduling, requests in flight are finished.
+    """
+
+    def __init__(self,
+                 connector: Connector,
+                 container: ReportsContainerProtocol,
+                 report_params_list: list[dict[str, Any]],
+                 *,
+                 load_reports: Callable[[], list[dict[str, Any]]] | None = None,
+                 reports_list_path: os.PathLike | None = None,
+                 interval: float = 15.0,
+                 metrics: MetricsProtocol | None = None,
+                 tick: float = 1.0):
+        """Constructor method for ReportScheduler, every report is due at once.
+
+        :param connector: Connector used for all requests.
+        :type connector: Connector
+        :param container: Container creating reports of every run and recording finished ones in history of past runs.
+        :type container: ReportsContainerProtocol
+        :param report_params_list: Collection of dicts with parameters of scheduled reports.
+        :type report_params_list: list[dict[str, Any]]
+        :param load_reports: Function parsing reports list once again, reports list is not reloaded if not given. Defaults to None.
+        :type load_reports: Callable[[], list[dict[str, Any]]] | None
+        :param reports_list_path: Reports list watched for changes. Defaults to None.
+        :type reports_list_path: os.PathLike | None
+        :param interval: Default interval in minutes between runs of reports without their own interval. Defaults to 15.0.
+        :type interval: float
+        :param metrics: Metrics of the run, started and skipped runs (per report if `per_report` is set), reloads and finished reports are recorded in it. Defaults to None.
+        :type metrics: MetricsProtocol | None
+        :param tick: Interval in seconds between checks of due reports, finished reports and the reports list. Defaults to 1.0.
+        :type tick: float
+        """
+
+        self.connector: Connector = connector
+        self.container: ReportsContainerProtocol = container
+        self.load_reports: Callable[[], list[dict[str, Any]]] | None = load_reports
+        self.reports_list_path: os.PathLike | None = reports_list_path
+        self.interval: float = interval
+        self.metrics: MetricsProtocol | None = metrics
+        self.tick: float = tick
+        self.schedule: dict[tuple[str, ...], ScheduledReport] = {}
+        self._dispatched: list[ReportProtocol] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping: asyncio.Event | None = None
+        self._mtime: int | None = None
+        self._mtime = self._modification_time()
+
+        self._update_schedule(report_params_list)
+
+    @staticmethod
+    def _key(params: dict[str, Any]) -> tuple[str, ...]:
+        """Identifies the report by its id and destination, so renamed or moved report is a new entry of the schedule.
+        """
+
+        return (params['id'], params['name'], str(params['path']), params['output_format'])
+
+    def _modification_time(self) -> int | None:
+        if not self.load_reports or not self.reports_list_path:
+            return None
+
+        try:
+            return os.stat(self.reports_list_path).st_mtime_ns
+        except OSError as e:
+            logger_main.warning('Reports list %s not available -> %s', self.reports_list_path, e)
+            return self._mtime
+
+    def _update_schedule(self, report_params_list: list[dict[str, Any]]) -> None:
+        """Builds the schedule from parameters of reports, entries of reports already scheduled are kept.
+
+        :param report_params_list: Collection of dicts with parameters of scheduled reports.
+        :type report_params_list: list[dict[str, Any]]
+        """
+
+        now = monotonic()
+        schedule = {}
+
+        for params in report_params_list:
+            key = self._key(params)
+            interval = 60 * (params.get('interval') or self.interval)
+
+            if key in schedule:
+                logger_main.warning('%s -> Duplicated in reports list, scheduled once', params['name'])
+                continue
+
+            entry = self.schedule.get(key)
+
+            if not entry:
+                entry = ScheduledReport(params, interval, now)
+            elif entry.interval != interval:
+                logger_main.info('%s -> Interval changed from %s to %s min',
+                                 params['name'], entry.interval / 60, interval / 60)
+                entry.next_run += interval - entry.interval
+
+            entry.params = params
+            entry.interval = interval
+            schedule[key] = entry
+
+        added = schedule.keys() - self.schedule.keys()
+        removed = self.schedule.keys() - schedule.keys()
+
+        if self.schedule:
+            logger_main.info('Schedule updated, %s reports added, %s removed', len(added), len(removed))
+
+        for key in removed:
+            logger_main.info('%s -> Removed from schedule', self.schedule[key].params['name'])
+
+        self.schedule = schedule
+        logger_main.info('%s reports scheduled', len(self.schedule))
+
+        return None
+
+    def _reload(self) -> None:
+        """Reloads the reports list once its modification time has changed.
+        """
+
+        mtime = self._modification_time()
+
+        if mtime == self._mtime:
+            return None
+
+        self._mtime = mtime
+        logger_main.info('Reports list %s changed, reloading', self.reports_list_path)
+
+        try:
+            report_params_list = self.load_reports()
+        except Exception as e:
+            logger_main.error('Reports list %s not reloaded, previous schedule kept -> %r', self.reports_list_path, e)
+            if self.metrics:
+                self.metrics.inc('sfr_schedule_reloads_total', result='failed')
+            return None
+
+        self._update_schedule(report_params_list)
+
+        if self.metrics:
+            self.metrics.inc('sfr_schedule_reloads_total', result='reloaded')
+
+        return None
+
+    def _record_finished(self) -> list[ReportProtocol]:
+        """Records reports finished since the last check in history of past runs and metrics.
+
+        :return: Collection of finished reports.
+        :rtype: list[ReportProtocol]
+        """
+
+        finished, pending = [], []
+
+        for report in self._dispatched:
+            (finished if report.finished else pending).append(report)
+
+        if not finished:
+            return finished
+
+        self._dispatched = pending
+        self.container.update_history(finished)
+
+        if self.metrics:
+            self.container.update_metrics(self.metrics, finished)
+
+        for report in finished:
+            logger_main.info('%s -> Run finished, %s', report.name,
+                             'saved' if report.valid and report.downloaded else 'failed')
+
+        return finished
+
+    def _finish_task(self, reports: list[ReportProtocol], task: asyncio.Task) -> None:
+        """Marks reports of the task as finished if the task failed before they reached the workers,
+        so following runs are not skipped forever.
+        """
+
+        self._tasks.discard(task)
+
+        if task.cancelled() or task.exception():
+            logger_main.error('Requests of %s reports failed -> %r', len(reports),
+                              None if task.cancelled() else task.exception())
+            for report in reports:
+                if not report.valid:
+                    report.finished = True
+
+        return None
+
+    async def _dispatch(self, session: Any) -> None:
+        """Requests reports which are due, runs of reports still running are skipped.
+        Retry budget is renewed whenever no report is running.
+
+        :param session: Shared session object.
+        :type session: aiohttp.ClientSession
+        """
+
+        now = monotonic()
+        due = [entry for entry in self.schedule.values() if entry.next_run <= now]
+
+        if not due:
+            return None
+
+        if not await self.connector.reconnect(session):
+            logger_main.error('Connection not established, %s reports postponed by %s s', len(due), RECONNECT_DELAY)
+            for entry in due:
+                entry.next_run = now + RECONNECT_DELAY
+            return None
+
+        if not self._dispatched:
+            self.connector.retry_policy.retries = 0
+
+        reports = []
+
+        for entry in due:
+            labels = {'report': entry.params['name']} if self.metrics and self.metrics.per_report else {}
+
+            entry.next_run += entry.interval
+            if entry.next_run <= now:
+                entry.next_run = now + entry.interval
+
+            if entry.running:
+                entry.skipped += 1
+                logger_main.warning('%s -> Previous run not finished, run skipped', entry.params['name'])
+                if self.metrics:
+                    self.metrics.inc('sfr_skipped_runs_total', **labels)
+                continue
+
+            entry.report = self.container.create_report(entry.params)
+            entry.runs += 1
+            reports.append(entry.report)
+
+            if self.metrics:
+                self.metrics.inc('sfr_scheduled_runs_total', **labels)
+
+        if not reports:
+            return None
+
+        logger_main.info('Requesting %s due reports', len(reports))
+        self._dispatched.extend(reports)
+
+        task = asyncio.create_task(self.connector.request_reports(reports, session))
+        task.add_done_callback(lambda task: self._finish_task(reports, task))
+        self._tasks.add(task)
+
+        return None
+
+    def _add_signal_handlers(self) -> list[signal.Signals]:
+        """Stops the scheduler on SIGINT and SIGTERM, not supported on Windows where Ctrl+C interrupts the event loop.
+        """
+
+        loop = asyncio.get_running_loop()
+        handled = []
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+                handled.append(signum)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        return handled
+
+    async def serve(self) -> None:
+        """Opens the session and requests reports on their intervals until stopped, every `tick` seconds due reports are requested,
+        finished reports are recorded and the reports list is checked for changes. Requests in flight are finished once stopped.
+        """
+
+        self._stopping = asyncio.Event()
+        handled = self._add_signal_handlers()
+
+        try:
+            async with self.connector.open_session() as session:
+                if not await self.connector.check_connection(session):
+                    logger_main.critical('Connection not established, daemon not started')
+                    return None
+
+                logger_main.info('Daemon started, default interval %s min', self.interval)
+
+                while not self._stopping.is_set():
+                    if self.load_reports:
+                        self._reload()
+
+                    await asyncio.to_thread(self._record_finished)
+                    await self._dispatch(session)
+
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), self.tick)
+                    except asyncio.TimeoutError:
+                        pass
+
+                logger_main.info('Daemon stopping, waiting for %s requests in flight', len(self._tasks))
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            for signum in handled:
+                asyncio.get_running_loop().remove_signal_handler(signum)
+
+        return None
+
+    def stop(self) -> None:
+        """Stops requesting new reports, requests in flight are finished. Requests in flight are cancelled if already stopping.
+        """
+
+        if self._stopping and self._stopping.is_set():
+            logger_main.warning('Daemon stopped again, cancelling %s requests in flight', len(self._tasks))
+            for task in self._tasks:
+                task.cancel()
+        elif self._stopping:
+            self._stopping.set()
+
+        return None
+
+    def close(self) -> None:
+        """Records reports finished after the scheduler has been stopped, to be called once the queue is empty.
+        """
+
+        self._record_finished()
+
+        for entry in self.schedule.values():
+            logger_main.debug('%s -> %s runs, %s skipped', entry.params['name'], entry.runs, entry.skipped)
+
+        return None
@@ -0,0 +1,125 @@
+import os
+import json
+import logging
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Protocol, runtime_checkable
+
+from components.processors import atomic_write
+
+
+logger_main = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class SidCacheProtocol(Protocol):
+    """Protocol class for cache of intercepted SID.
+
+    :param cache_path: Path to the cache file.
+    :type cache_path: os.PathLike
+    """
+
+    cache_path: os.PathLike
+
+    def load(self, domain: str) -> str:
+        """Returns cached SID of the domain.
+
+        :param domain: SFDC domain.
+        :type domain: str
+        :return: Cached SID or empty string if SID is missing or expired.
+        :rtype: str
+        """
+        ...
+
+    def save(self, domain: str, sid: str, expires: datetime | None) -> None:
+        """Caches SID of the domain.
+
+        :param domain: SFDC domain.
+        :type domain: str
+        :param sid: Intercepted SID.
+        :type sid: str
+        :param expires: Expiry date of SID, None if unknown.
+        :type expires: datetime | None
+        """
+        ...
+
+    def clear(self) -> None:
+        """Removes cached SID.
+        """
+        ...
+
+
+class SidCache():
+    """Concrete class representing cache of intercepted SID kept in JSON file readable only by the owner.
+    Cached SID spares CookieJar lookup on startup as long as it's valid.
+    """
+
+    def __init__(self, cache_path: os.PathLike, *, ttl: float = 7_200.0):
+        """Constructor method for SidCache.
+
+        :param cache_path: Path to the cache file.
+        :type cache_path: os.PathLike
+        :param ttl: Lifetime of SID in seconds if the cookie has no expiry date, SFDC default session timeout. Defaults to 7_200.0.
+        :type ttl: float
+        """
+
+        self.cache_path: os.PathLike = cache_path
+        self.ttl: float = ttl
+
+    def load(self, domain: str) -> str:
+        """Returns cached SID of the domain if it's not expired.
+
+        :param domain: SFDC domain.
+        :type domain: str
+        :return: Cached SID or empty string if SID is missing or expired.
+        :rtype: str
+        """
+
+        try:
+            with open(self.cache_path, encoding='UTF8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return ""
+
+        if entry.get('domain') != domain or datetime.fromisoformat(entry['expires']) <= datetime.now():
+            logger_main.debug('Cached SID expired or issued for other domain')
+            return ""
+
+        logger_main.debug('SID taken from cache, valid until %s', entry['expires'])
+
+        return entry.get('sid', "")
+
+    def save(self, domain: str, sid: str, expires: datetime | None) -> None:
+        """Caches SID of the domain, SID without expiry date expires after `ttl` seconds.
+
+        :param domain: SFDC domain.
+        :type domain: str
+        :param sid: Intercepted SID.
+        :type sid: str
+        :param expires: Expiry date of SID, None if unknown.
+        :type expires: datetime | None
+        """
+
+        expires = expires or datetime.now() + timedelta(seconds=self.ttl)
+
+        logger_main.debug('Caching SID in %s, valid until %s', self.cache_path, expires)
+        Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            with atomic_write(self.cache_path, 'none') as temp_path:
+                with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'w', encoding='UTF8') as f:
+                    json.dump({'domain': domain, 'sid': sid, 'expires': expires.isoformat()}, f)
+        except OSError as e:
+            logger_main.warning('SID not cached -> %s', e)
+
+        return None
+
+    def clear(self) -> None:
+        """Removes cached SID.
+        """
+
+        logger_main.debug('Removing cached SID')
+        Path(self.cache_path).unlink(missing_ok=True)
+
+        return None
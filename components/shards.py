@@ -0,0 +1,163 @@
+import re
+import hashlib
+import logging
+
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Any, Callable
+from urllib.parse import quote, unquote
+
+from components.containers import ReportTimings
+
+
+logger_main = logging.getLogger(__name__)
+
+
+DATE_PARAMS = ('pv1', 'pv2')
+
+DATE_PATTERNS = ((re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})$'), ('month', 'day', 'year'), '/'),
+                 (re.compile(r'^(\d{1,2})\.(\d{1,2})\.(\d{4})$'), ('day', 'month', 'year'), '.'),
+                 (re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$'), ('year', 'month', 'day'), '-'))
+
+
+def parse_date(value: str) -> tuple[date, Callable[[date], str]]:
+    """Parses date filter value in one of SFDC formats -> `M/D/YYYY`, `D.M.YYYY` or `YYYY-MM-DD`.
+
+    :param value: Date filter value.
+    :type value: str
+    :raises ValueError: Value is not a date in one of supported formats.
+    :return: Parsed date and formatter writing dates back in the same format (order, separator and zero padding).
+    :rtype: tuple[date, Callable[[date], str]]
+    """
+
+    for pattern, order, separator in DATE_PATTERNS:
+        if match := pattern.match(value):
+            parts = dict(zip(order, match.groups()))
+            padded = len(parts['day']) == 2 and len(parts['month']) == 2
+
+            def formatter(day: date, order=order, separator=separator, padded=padded) -> str:
+                values = {'year': f'{day.year:04d}',
+                          'month': f'{day.month:02d}' if padded else str(day.month),
+                          'day': f'{day.day:02d}' if padded else str(day.day)}
+                return separator.join(values[part] for part in order)
+
+            return date(int(parts['year']), int(parts['month']), int(parts['day'])), formatter
+
+    raise ValueError(f'{value} is not a date')
+
+
+def date_windows(start: date, end: date, shards: int) -> list[tuple[date, date]]:
+    """Splits date range into consecutive, non-overlapping windows of similar length, both ends are inclusive.
+    Number of windows is limited by number of days in the range.
+
+    :param start: First day of the range.
+    :type start: date
+    :param end: Last day of the range.
+    :type end: date
+    :param shards: Number of windows.
+    :type shards: int
+    :raises ValueError: End of the range precedes its start.
+    :return: Collection of first and last days of windows.
+    :rtype: list[tuple[date, date]]
+    """
+
+    days = (end - start).days + 1
+
+    if days < 1:
+        raise ValueError(f'range {start} - {end} is empty')
+
+    shards = max(1, min(shards, days))
+    bounds = [start + timedelta(days=days * num // shards) for num in range(shards + 1)]
+
+    return [(first, next_first - timedelta(days=1)) for first, next_first in zip(bounds, bounds[1:])]
+
+
+def shard_export_params(export_params: str, shards: int) -> list[str]:
+    """Splits date range given in `pv1` (start) and `pv2` (end) filters of export parameters into windows,
+    other parameters are left untouched. URL encoded dates are encoded back.
+
+    :param export_params: Export parameters of the report, e.g. '?export=csv&pv1=1/1/2023&pv2=12/31/2023'.
+    :type export_params: str
+    :param shards: Number of windows.
+    :type shards: int
+    :raises ValueError: `pv1` or `pv2` is missing, is not a date or the range is empty.
+    :return: Export parameters of every window.
+    :rtype: list[str]
+    """
+
+    prefix, query = ('?', export_params[1:]) if export_params.startswith('?') else ('', export_params)
+    params = query.split('&')
+    positions = {param.split('=', 1)[0]: num for num, param in enumerate(params) if '=' in param}
+
+    missing = [name for name in DATE_PARAMS if name not in positions]
+    if missing:
+        raise ValueError(f'{", ".join(missing)} missing in export parameters')
+
+    raw = {name: params[positions[name]].split('=', 1)[1] for name in DATE_PARAMS}
+    encoded = any(unquote(value) != value for value in raw.values())
+    start, formatter = parse_date(unquote(raw['pv1']))
+    end, _ = parse_date(unquote(raw['pv2']))
+
+    sharded = []
+    for window in date_windows(start, end, shards):
+        window_params = params.copy()
+        for name, day in zip(DATE_PARAMS, window):
+            value = formatter(day)
+            window_params[positions[name]] = f'{name}={quote(value, safe="") if encoded else value}'
+        sharded.append(prefix + '&'.join(window_params))
+
+    return sharded
+
+
+def create_shards(report: Any) -> list[Any]:
+    """Creates sub-reports of the report, one per date window. Sub-reports share all parameters of the report apart
+    from name (suffixed with the number of the shard), export parameters and stats, so each of them is requested
+    and retried independently.
+
+    :param report: Instance of the ReportProtocol object with `shards` greater than 1.
+    :type report: ReportProtocol
+    :raises ValueError: Date range of the report can't be sharded.
+    :return: Collection of sub-reports.
+    :rtype: list[ReportProtocol]
+    """
+
+    sharded_params = shard_export_params(report.export_params, report.shards)
+
+    logger_main.debug('%s split into %s shards', report.name, len(sharded_params))
+
+    return [replace(report,
+                    name=f'{report.name} [{num}/{len(sharded_params)}]',
+                    export_params=export_params,
+                    shards=1,
+                    parts=[],
+                    timings=ReportTimings())
+            for num, export_params in enumerate(sharded_params, 1)]
+
+
+def collect_shards(report: Any) -> None:
+    """Collects stats of downloaded sub-reports in the report. Report is valid only if all of its shards are valid.
+    Request stages cover all shards, from the first request sent until the last body received.
+    Content hash of the report is the hash of content hashes of shards.
+
+    :param report: Instance of the ReportProtocol object with downloaded `parts`.
+    :type report: ReportProtocol
+    """
+
+    parts = report.parts
+
+    report.valid = all(part.valid for part in parts)
+    report.attempt_count = sum(part.attempt_count for part in parts)
+    report.retry_count = sum(part.retry_count for part in parts)
+    report.backoff_time = sum(part.backoff_time for part in parts)
+    report.concurrency_window = max(part.concurrency_window for part in parts)
+    report.bytes_transferred = sum(part.bytes_transferred for part in parts)
+
+    for stage, pick in (('request_sent', min), ('first_byte', min), ('body_complete', max)):
+        dates = [getattr(part.timings, stage) for part in parts]
+        setattr(report.timings, stage, pick(dates) if all(dates) else None)
+
+    if report.valid and all(part.content_hash for part in parts):
+        report.content_hash = hashlib.sha256(
+            ''.join(part.content_hash for part in parts).encode()).hexdigest()
+
+    return None
@@ -0,0 +1,162 @@
+import os
+import csv
+import json
+import time
+import logging
+
+from pathlib import Path
+from threading import Lock, Timer
+from typing import Any, Protocol, runtime_checkable
+
+from components.containers import SUMMARY_HEADER, ReportProtocol, summary_row
+
+
+logger_main = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class SummaryProtocol(Protocol):
+    """Protocol class for summary report written during the run.
+
+    :param summary_path: Path to the summary file.
+    :type summary_path: os.PathLike
+    """
+
+    summary_path: os.PathLike
+
+    def record(self, report: ReportProtocol) -> None:
+        """Appends finished report to the summary.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+        ...
+
+    def close(self) -> None:
+        """Writes remaining reports and closes the summary.
+        """
+        ...
+
+
+class SummaryStream():
+    """Concrete class representing summary report streamed during the run, every finished report is appended as
+    a single row (CSV) or line (JSON Lines). Rows are buffered and written in batches, once `batch_size` rows are waiting
+    or the oldest of them waits `flush_interval` seconds, so progress of the run can be followed and survives its crash.
+    """
+
+    def __init__(self,
+                 summary_path: os.PathLike,
+                 *,
+                 summary_format: str = 'csv',
+                 batch_size: int = 20,
+                 flush_interval: float = 5.0,
+                 resume: bool = False):
+        """Constructor method for SummaryStream. Starts new summary unless the run is resumed.
+
+        :param summary_path: Path to the summary file.
+        :type summary_path: os.PathLike
+        :param summary_format: Format of the summary -> [csv | jsonl]. Defaults to 'csv'.
+        :type summary_format: str
+        :param batch_size: Number of rows written at once. Defaults to 20.
+        :type batch_size: int
+        :param flush_interval: Max time in seconds a row waits to be written. Defaults to 5.0.
+        :type flush_interval: float
+        :param resume: Flag, if True rows are appended to the summary of the previous run, otherwise summary is cleared. Defaults to False.
+        :type resume: bool
+        """
+
+        self.summary_path: os.PathLike = summary_path
+        self.summary_format: str = summary_format
+        self.batch_size: int = max(1, batch_size)
+        self.flush_interval: float = flush_interval
+        self.rows: int = 0
+        self._buffer: list[list[Any]] = []
+        self._timer: Timer | None = None
+        self._lock: Lock = Lock()
+
+        Path(self.summary_path).parent.mkdir(parents=True, exist_ok=True)
+        append = resume and os.path.exists(self.summary_path) and os.path.getsize(self.summary_path)
+
+        logger_main.debug('%s summary stream %s', 'Resuming' if append else 'Starting new', self.summary_path)
+        self._file = open(self.summary_path, 'a' if append else 'w', encoding='UTF8', newline='')
+        self._writer = csv.writer(self._file)
+
+        if not append and self.summary_format == 'csv':
+            self._writer.writerow(SUMMARY_HEADER)
+            self._file.flush()
+
+    def record(self, report: ReportProtocol) -> None:
+        """Buffers finished report, buffer is written once full.
+
+        :param report: Instance of the ReportProtocol object.
+        :type report: ReportProtocol
+        """
+
+        with self._lock:
+            if self._file.closed:
+                logger_main.debug('Summary stream closed, %s not recorded', report.name)
+                return None
+
+            self._buffer.append(summary_row(report))
+
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+            elif not self._timer:
+                self._timer = Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        return None
+
+    def _flush(self) -> None:
+        """Writes buffered rows to the summary, requires the lock.
+        """
+
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._buffer or self._file.closed:
+            return None
+
+        t0 = time.perf_counter()
+
+        try:
+            if self.summary_format == 'jsonl':
+                self._file.writelines(json.dumps(dict(zip(SUMMARY_HEADER, row)), default=str) + '\n'
+                                      for row in self._buffer)
+            else:
+                self._writer.writerows(self._buffer)
+
+            self._file.flush()
+            self.rows += len(self._buffer)
+
+            logger_main.debug('%s rows written to summary stream in %.4f s, %s in total',
+                              len(self._buffer), time.perf_counter() - t0, self.rows)
+        except OSError as e:
+            logger_main.warning('%s rows not written to summary stream -> %s', len(self._buffer), e)
+        finally:
+            self._buffer = []
+
+        return None
+
+    def flush(self) -> None:
+        """Writes buffered rows to the summary.
+        """
+
+        with self._lock:
+            self._flush()
+
+        return None
+
+    def close(self) -> None:
+        """Writes remaining rows and closes the summary.
+        """
+
+        with self._lock:
+            self._flush()
+            self._file.close()
+
+        logger_main.debug('Summary stream %s closed, %s rows written', self.summary_path, self.rows)
+
+        return None
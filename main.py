@@ -1,16 +1,12 @@
 #!/usr/bin/env python3.11
 
+import os
 import time
 import click
-import asyncio
 import logging
 
-from queue import Queue
+from contextlib import nullcontext
 
-from components.connectors import SfdcConnector
-from components.containers import ReportsContainer
-from components.handlers import WorkerFactory
-from components.config import Config
 from components.loggers import logger_configurer
 
 
@@ -19,7 +15,8 @@ CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
 @click.command(context_settings=CONTEXT_SETTINGS)
 @click.argument('cli_reports_list_path', required=False, type=click.Path(exists=True))
-@click.option('--cli_report', '-r', type=click.STRING, help='Run single report -> "type,name,id,path,optional_report_params"')
+@click.option('--cli_report', '-r', type=click.STRING,
+              help='Run single report -> "type,name,id,path,optional_report_params,optional_output_format,optional_shards,optional_interval"')
 @click.option('--cli_path', '-p', type=click.Path(exists=True), help='Override save location of the reports')
 @click.option('--cli_threads', '-t', type=click.INT, default=0, show_default=True, help='Number of threads to spawn')
 @click.option('--cli_stdout_loglevel', '-ls', type=click.STRING, default="WARNING", show_default=True, 
@@ -27,38 +24,221 @@ CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 @click.option('--cli_file_loglevel', '-lf', type=click.STRING, default="INFO", show_default=True, 
               help='File logging level -> [DEBUG | INFO | WARN| WARNING | ERROR | CRITICAL]')
 @click.option('--verbose', '-v', is_flag=True, show_default=True, default=True, help='Turn on/off progress bar')
-def main(cli_reports_list_path, cli_report, cli_path, cli_threads, cli_stdout_loglevel, cli_file_loglevel, verbose):
+@click.option('--cli_stream', '-s', is_flag=True, show_default=True, default=False, help='Stream responses to spool files instead of memory')
+@click.option('--cli_chunk_size', '-cs', type=click.INT, default=262_144, show_default=True, help='Size of a single chunk in bytes in streaming mode')
+@click.option('--cli_concurrency', '-c', type=click.INT, default=20, show_default=True,
+              help='Max number of requests in flight per domain, 0 for no limit')
+@click.option('--cli_adaptive', '-a', is_flag=True, show_default=True, default=False,
+              help='Adapt number of requests in flight to SFDC responses, up to --cli_concurrency')
+@click.option('--cli_max_attempts', '-ma', type=click.INT, default=20, show_default=True, help='Max number of attempts per report')
+@click.option('--cli_backoff_base', '-bb', type=click.FLOAT, default=1.0, show_default=True,
+              help='Delay in seconds before the first retry, doubled with every retry')
+@click.option('--cli_backoff_max', '-bm', type=click.FLOAT, default=60.0, show_default=True, help='Max delay in seconds between retries')
+@click.option('--cli_jitter', '-j', type=click.FloatRange(0, 1), default=1.0, show_default=True,
+              help='Randomized fraction of the delay, 0 for no jitter, 1 for full jitter')
+@click.option('--cli_retry_budget', '-rb', type=click.INT, default=0, show_default=True,
+              help='Max number of retries for entire run, 0 for no limit')
+@click.option('--cli_queue_size', '-qs', type=click.INT, default=0, show_default=True,
+              help='Max number of downloaded reports waiting for workers, 0 for no limit')
+@click.option('--cli_queue_mb', '-qm', type=click.INT, default=0, show_default=True,
+              help='Max size in Mb of downloaded reports waiting for workers, 0 for no limit')
+@click.option('--cli_backend', '-b', type=click.Choice(['thread', 'process']), default='thread', show_default=True,
+              help='Processing backend of workers, process enforces streaming')
+@click.option('--cli_passthrough', '-pt', is_flag=True, show_default=True, default=False,
+              help='Copy CSV reports without parsing, footer removed at byte level')
+@click.option('--cli_format', '-f', type=click.Choice(['csv', 'csv.gz', 'parquet', 'feather']), default='csv', show_default=True,
+              help='Output format of reports without output_format column')
+@click.option('--cli_chunk_rows', '-cr', type=click.INT, default=0, show_default=True,
+              help='Process reports in chunks of given number of rows, 0 to read entire report at once')
+@click.option('--cli_resume', '-rs', is_flag=True, show_default=True, default=False,
+              help='Resume previous run, skip reports finished and verified in the run manifest')
+@click.option('--cli_skip_unchanged', '-su', is_flag=True, show_default=True, default=False,
+              help='Leave files of reports with the same content as in the previous run alone')
+@click.option('--cli_fsync', '-fs', type=click.Choice(['none', 'file', 'full']), default='file', show_default=True,
+              help='Flush written files (file) and their directory (full) to disk before the run moves on')
+@click.option('--cli_dry_run', '-dr', is_flag=True, show_default=True, default=False,
+              help='Parse configuration and list reports to be requested without touching the network')
+@click.option('--cli_summary_format', '-sf', type=click.Choice(['csv', 'jsonl']), default='csv', show_default=True,
+              help='Format of the summary streamed during the run, reports are appended once finished')
+@click.option('--cli_metrics_interval', '-mi', type=click.FLOAT, default=15.0, show_default=True,
+              help='Interval in seconds between writes of metrics during the run, 0 to write them once the run is finished')
+@click.option('--cli_report_metrics', '-rm', is_flag=True, show_default=True, default=False,
+              help='Add series of every report (duration, size, result, scheduled runs) to metrics, run totals only otherwise')
+@click.option('--cli_profile', '-pr', is_flag=True, show_default=True, default=False,
+              help='Collect CPU profile (cProfile) of the event loop and every worker, saved in logs folder')
+@click.option('--cli_trace_memory', '-tm', is_flag=True, show_default=True, default=False,
+              help='Trace memory (tracemalloc) at download, parse and write stages, saved in logs folder')
+@click.option('--cli_daemon', '-dm', is_flag=True, show_default=True, default=False,
+              help='Keep running and request reports on their intervals, reports list is reloaded once changed')
+@click.option('--cli_interval', '-di', type=click.FloatRange(min=0, min_open=True), default=15.0, show_default=True,
+              help='Interval in minutes between runs of reports without optional_interval column in daemon mode')
+def main(cli_reports_list_path, cli_report, cli_path, cli_threads, cli_stdout_loglevel, cli_file_loglevel, verbose,
+         cli_stream, cli_chunk_size, cli_concurrency, cli_adaptive, cli_max_attempts, cli_backoff_base, cli_backoff_max,
+         cli_jitter, cli_retry_budget, cli_queue_size, cli_queue_mb, cli_backend, cli_passthrough, cli_format,
+         cli_chunk_rows, cli_resume, cli_skip_unchanged, cli_fsync, cli_dry_run, cli_summary_format,
+         cli_metrics_interval, cli_report_metrics, cli_profile, cli_trace_memory, cli_daemon, cli_interval):
     """
     SFR is a simple, but very efficient due to scalability, Python application which allows you to download various reports.  
     Program supports asynchronous requests and threading for saving/processing content. Logging and CLI parameters handlig is also included.
 
     So far the App supports SFDC reports with SSO authentication.
     """
+    # heavy dependencies (aiohttp, Pandas) are imported only on the code paths that need them
+    from components.config import Config
+    from components.containers import ReportsContainer
+    from components.history import ReportHistory
+    from components.manifests import RunManifest
+
     t0 = time.time()
 
     logger_main = logging.getLogger(__name__)
     logger_configurer(cli_stdout_loglevel, cli_file_loglevel, verbose)
     logger_main.info('SFR started')
 
-    queue = Queue()
-
-    config = Config(cli_reports_list_path, cli_report, cli_path, cli_threads)
-    connector = SfdcConnector(queue, verbose=verbose)
+    config = Config(cli_reports_list_path, cli_report, cli_path, cli_threads,
+                    cli_stream, cli_chunk_size, cli_concurrency, cli_adaptive, cli_max_attempts,
+                    cli_backoff_base, cli_backoff_max, cli_jitter, cli_retry_budget, cli_queue_size, cli_queue_mb,
+                    cli_backend, cli_passthrough, cli_format, cli_chunk_rows, cli_resume,
+                    cli_skip_unchanged, cli_fsync, cli_dry_run, cli_summary_format, cli_metrics_interval,
+                    cli_report_metrics, cli_profile, cli_trace_memory, cli_daemon, cli_interval)
+
+    if config.dry_run:
+        history = ReportHistory(config.history_path) if os.path.exists(config.history_path) else None
+        container = ReportsContainer(
+            config.report_params_list, config.summary_report_path, history=history)
+        reports = container.pending_reports(RunManifest(config.manifest_path, resume=True)) if config.resume \
+            else container.reports_list
+        dry_run(reports, config.interval)
+        return None
+
+    import asyncio
+
+    from components.connectors import SfdcConnector
+    from components.handlers import WorkerFactory
+    from components.metrics import MetricsRegistry
+    from components.policies import RetryPolicy
+    from components.profilers import RunProfiler
+    from components.queues import HandoffQueue
+    from components.sessions import SidCache
+    from components.summaries import SummaryStream
+
+    if (config.profile or config.trace_memory) and config.backend == 'process':
+        logger_main.warning('Reports are processed in pool of processes, which is not profiled, '
+                            'only the event loop and waiting of workers on the pool are profiled, '
+                            'use thread backend to profile processing of reports')
+
+    profiler = RunProfiler(config.profile_path, cpu=config.profile, memory=config.trace_memory) \
+        if config.profile or config.trace_memory else None
+    metrics = MetricsRegistry(config.metrics_path, interval=config.metrics_interval,
+                              per_report=config.report_metrics)
+    summary = SummaryStream(config.summary_stream_path, summary_format=config.summary_format,
+                            resume=config.resume or config.daemon)
+    queue = HandoffQueue(config.queue_size, max_bytes=config.queue_bytes)
+    retry_policy = RetryPolicy(max_attempts=config.max_attempts, backoff_base=config.backoff_base,
+                               backoff_max=config.backoff_max, jitter=config.jitter, budget=config.retry_budget)
+    connector = SfdcConnector(queue, verbose=verbose, stream=config.stream,
+                              chunk_size=config.chunk_size, spool_path=config.spool_path,
+                              concurrency=config.concurrency, adaptive=config.adaptive,
+                              retry_policy=retry_policy, hash_content=config.skip_unchanged,
+                              sid_cache=SidCache(config.sid_cache_path) if config.sid_cache_path else None, summary=summary, metrics=metrics,
+                              profiler=profiler)
+    history = ReportHistory(config.history_path)
     container = ReportsContainer(
-        config.report_params_list, config.summary_report_path)
-    WorkerFactory(queue, threads=config.threads)
+        config.report_params_list, config.summary_report_path, history=history)
+    manifest = RunManifest(config.manifest_path, resume=config.resume) if not config.daemon else None
+    worker_factory = WorkerFactory(
+        queue, threads=config.threads, backend=config.backend, passthrough=config.passthrough,
+        chunk_rows=config.chunk_rows, manifest=manifest, history=history if config.skip_unchanged else None,
+        summary=summary, metrics=metrics, profiler=profiler, fsync=config.fsync)
+
+    if config.daemon:
+        from components.schedulers import ReportScheduler
+
+        scheduler = ReportScheduler(connector, container, config.report_params_list,
+                                    load_reports=config.reload_reports if not config.cli_report else None,
+                                    reports_list_path=config.reports_list_path, interval=config.interval,
+                                    metrics=metrics)
+
+        metrics.start()
+        with profiler.profile('event_loop') if profiler else nullcontext():
+            try:
+                asyncio.run(scheduler.serve())
+            except KeyboardInterrupt:
+                logger_main.warning('Daemon interrupted, requests in flight cancelled')
+
+        queue.join()
+        worker_factory.shutdown()
+        summary.close()
+        scheduler.close()
 
-    asyncio.run(connector.handle_requests(container.reports_list))
+        if profiler:
+            profiler.dump()
+
+        metrics.stop()
+
+        logger_main.info('SFR daemon finished after %s', time.strftime(
+            "%H:%M:%S", time.gmtime(time.time() - t0)))
+
+        return None
+
+    reports = container.pending_reports(manifest) if config.resume else container.reports_list
+
+    metrics.start()
+    with profiler.profile('event_loop') if profiler else nullcontext():
+        asyncio.run(connector.handle_requests(reports))
 
     queue.join()
+    worker_factory.shutdown()
+    summary.close()
+
+    if profiler:
+        profiler.dump()
 
     t1 = time.time()
 
+    logger_main.info('Queue stats: %s', queue.stats())
+
     container.create_summary_report()
+    container.create_profile_report()
+    container.update_history()
+    container.update_metrics(metrics)
+    metrics.stop()
+
+    if config.adaptive:
+        container.create_concurrency_report(connector.window_adjustments)
 
     logger_main.info('SFR finished in %s', time.strftime(
         "%H:%M:%S", time.gmtime(t1 - t0)))
 
 
+def dry_run(reports: list, interval: float) -> None:
+    """Lists reports which would be requested, with number of date windows, interval in daemon mode, expected duration,
+    timeout and save location. Nothing is requested and nothing is saved.
+
+    :param reports: Collection of ReportProtocol objects.
+    :type reports: list[ReportProtocol]
+    :param interval: Default interval in minutes between runs of reports in daemon mode.
+    :type interval: float
+    """
+
+    from components.processors import report_file_path
+    from components.shards import shard_export_params
+
+    click.echo(f'{"name":<40} | {"id":<18} | {"format":<7} | {"shards":>6} | {"interval_m":>10} | {"expected_s":>10} | {"timeout_s":>9} | file')
+
+    for report in reports:
+        try:
+            shards = len(shard_export_params(report.export_params, report.shards)) if report.shards > 1 else 1
+        except ValueError:
+            shards = 1
+
+        click.echo(f'{report.name:<40} | {report.id:<18} | {report.output_format:<7} | {shards:>6} | {report.interval or interval:>10g} | '
+                   f'{report.expected_duration:>10.2f} | {report.timeout:>9.2f} | {report_file_path(report)}')
+
+    click.echo(f'{len(reports)} reports, dry run -> nothing requested')
+
+    return None
+
+
 if __name__ == '__main__':
     main()